@@ -0,0 +1,32 @@
+import argparse
+import fnmatch
+import sys
+
+from .suite import BENCHMARKS, DEFAULT_REPEAT, DEFAULT_MIN_DURATION, DEFAULT_THRESHOLD, run, compare, save, load, \
+    report
+
+parser = argparse.ArgumentParser(prog="python -m benchmarks")
+parser.description = "Benchmark the parser and the evaluation hot paths of cronee."
+parser.add_argument('-k', '--filter', type=str, default='*', metavar="PATTERN",
+                    help="Only run the benchmarks whose name matches the glob pattern.")
+parser.add_argument('-r', '--repeat', type=int, default=DEFAULT_REPEAT, help="Number of timed rounds.")
+parser.add_argument('--min-duration', type=float, default=DEFAULT_MIN_DURATION,
+                    help="Minimal duration of a round, in seconds.")
+parser.add_argument('--save', type=str, default=None, metavar="PATH", help="Save the results as a baseline.")
+parser.add_argument('--compare', type=str, default=None, metavar="PATH",
+                    help="Compare the results to a baseline and exit with 1 if a benchmark regressed.")
+parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                    help="Slowdown, relative to the baseline, above which a benchmark regressed (0.2 for 20%%).")
+
+args = parser.parse_args()
+
+names = [name for name in BENCHMARKS if fnmatch.fnmatch(name, args.filter)]
+results = run(names, args.repeat, args.min_duration)
+comparisons = [] if args.compare is None else compare(load(args.compare), results)
+report(results, comparisons, args.threshold)
+
+if args.save is not None:
+    save(args.save, results)
+
+if any(comparison.is_regression(args.threshold) for comparison in comparisons):
+    sys.exit(1)
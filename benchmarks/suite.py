@@ -0,0 +1,234 @@
+"""
+Benchmarks of the parser and of the evaluation hot paths.
+
+Each benchmark is a function building its fixtures and returning the callable to time. The suite keeps, for each
+benchmark, the best time per call over several repeats, which is the least noisy estimator on a shared machine.
+"""
+import json
+import platform
+import sys
+import timeit
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from itertools import islice
+from typing import Callable, Iterable, Optional
+
+from cronee import parse_expression, ParseCache, CroneeIndex, DateSet, to_bytes, from_bytes
+from cronee.compiler import compile_field
+
+Benchmark = Callable[[], Callable[[], object]]
+
+BENCHMARKS: dict[str, Benchmark] = {}
+
+DEFAULT_REPEAT = 5
+DEFAULT_MIN_DURATION = 0.2
+DEFAULT_THRESHOLD = 0.2
+
+START = datetime(2023, 5, 5, 18, 59)
+EXPRESSIONS = [
+    '* * * * *',
+    '*/15 * * * *',
+    '0 8 * * *',
+    '*/7 8..18 * * MON..FRI',
+    '0 0 1 * *',
+    '0 0 29 FEB *',
+    '0 8 * * FRI#3',
+    '0..5 8 * * FRI#3,SUN#4',
+    '!0..30/5,45 5,15..23/3 15,1-1 !JAN,MAR,JUN,OCT *',
+    '5-1 3+5 2+3 * 2+3',
+]
+NEXT_OCCURRENCE_CASES = {
+    'near': '* * * * *',
+    'workdays': '*/7 8..18 * * MON..FRI',
+    'sparse': '0 0 29 FEB *',
+    'dow_index': '0 8 * * FRI#3',
+    'modifiers': '5-1 3+5 2+3 * 2+3',
+}
+
+
+def benchmark(name: str) -> Callable[[Benchmark], Benchmark]:
+    """Register a benchmark under a name."""
+    def register(function: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = function
+        return function
+    return register
+
+
+@benchmark('parse.expression')
+def parse_expressions():
+    return lambda: [parse_expression(expression) for expression in EXPRESSIONS]
+
+
+@benchmark('parse.compile')
+def compile_expressions():
+    def parse():
+        compile_field.cache_clear()
+        return [parse_expression(expression) for expression in EXPRESSIONS]
+    return parse
+
+
+@benchmark('parse.load_binary')
+def load_binary_expressions():
+    data = to_bytes(parse_expression(expression) for expression in EXPRESSIONS)
+    return lambda: from_bytes(data)
+
+
+@benchmark('parse.cached')
+def parse_cached_expressions():
+    cache = ParseCache()
+    return lambda: [cache.parse(expression) for expression in EXPRESSIONS]
+
+
+@benchmark('validate')
+def validate():
+    cronees = [parse_expression(expression) for expression in EXPRESSIONS]
+    return lambda: [cronee.validate(START) for cronee in cronees]
+
+
+@benchmark('validate.ts')
+def validate_ts():
+    cronees = [parse_expression(expression) for expression in EXPRESSIONS]
+    timestamp = (START - datetime(1970, 1, 1)) // timedelta(seconds=1)
+    return lambda: [cronee.validate_ts(timestamp) for cronee in cronees]
+
+
+def _next_occurrence(expression: str) -> Benchmark:
+    def build():
+        cronee = parse_expression(expression)
+        return lambda: cronee.next_occurrence(START)
+    return build
+
+
+for _case, _expression in NEXT_OCCURRENCE_CASES.items():
+    benchmark(f'next_occurrence.{_case}')(_next_occurrence(_expression))
+
+
+@benchmark('next_occurrence.holidays')
+def next_occurrence_holidays():
+    closing = DateSet.from_dates(START.date() + timedelta(days=day) for day in range(120))
+    cronee = parse_expression('*/7 8..18 * * MON..FRI', excluded_dates=closing)
+    return lambda: cronee.next_occurrence(START)
+
+
+@benchmark('iter_occurrences.1000')
+def iter_occurrences():
+    cronee = parse_expression('*/7 8..18 * * MON..FRI')
+    return lambda: list(islice(cronee.iter_occurrences(START), 1000))
+
+
+@benchmark('bulk.next_occurrence')
+def bulk_next_occurrence():
+    cronees = [parse_expression(f'{minute} {hour} * * *') for minute in range(0, 60, 3) for hour in range(24)]
+    return lambda: [cronee.next_occurrence(START) for cronee in cronees]
+
+
+@benchmark('bulk.index_match')
+def bulk_index_match():
+    index = CroneeIndex()
+    for minute in range(60):
+        for hour in range(24):
+            index.add((minute, hour), parse_expression(f'{minute} {hour} * * *'))
+    return lambda: index.match(START)
+
+
+@benchmark('bulk.next_occurrence_many')
+def bulk_next_occurrence_many():
+    import numpy
+    cronee = parse_expression('*/7 8..18 * * MON..FRI')
+    starts = numpy.random.default_rng(0).integers(1_600_000_000, 1_700_000_000, 100_000)
+    return lambda: cronee.next_occurrence_many(starts)
+
+
+def time_benchmark(build: Benchmark, repeat: int = DEFAULT_REPEAT,
+                   min_duration: float = DEFAULT_MIN_DURATION) -> float:
+    """
+    Time a benchmark.
+
+    :param build: function building the fixtures and returning the callable to time
+    :param repeat: number of timed rounds
+    :param min_duration: minimal duration of a round, in seconds, used to pick the number of calls per round
+    :return: the best time of a call over the rounds, in seconds
+    """
+    timer = timeit.Timer(build())
+    number = 1
+    while timer.timeit(number) < min_duration:
+        number *= 2
+    return min(timer.repeat(repeat, number)) / number
+
+
+def run(names: Optional[Iterable[str]] = None, repeat: int = DEFAULT_REPEAT,
+        min_duration: float = DEFAULT_MIN_DURATION) -> dict[str, float]:
+    """
+    Run benchmarks. Those whose optional dependencies are missing are skipped.
+
+    :param names: (optional) names of the benchmarks to run. Defaults to all of them.
+    :param repeat: number of timed rounds of each benchmark
+    :param min_duration: minimal duration of a round, in seconds
+    :return: the best time per call of each benchmark, in seconds
+    """
+    results = {}
+    for name in BENCHMARKS if names is None else names:
+        try:
+            results[name] = time_benchmark(BENCHMARKS[name], repeat, min_duration)
+        except ImportError:
+            continue
+    return results
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """Change of the time of a benchmark against the baseline"""
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+    def is_regression(self, threshold: float) -> bool:
+        """True if the benchmark got slower than the baseline by more than the threshold (0.2 for 20%)."""
+        return self.ratio > 1 + threshold
+
+
+def compare(baseline: dict[str, float], results: dict[str, float]) -> list[Comparison]:
+    """
+    Compare results to a baseline. The benchmarks missing from either side are ignored.
+
+    :param baseline: the best time per call of each benchmark of the baseline
+    :param results: the best time per call of each benchmark of the current run
+    :return: the comparisons, ordered as the results
+    """
+    return [Comparison(name, baseline[name], current) for name, current in results.items() if name in baseline]
+
+
+def save(path: str, results: dict[str, float]):
+    """Save results as a baseline, along with the interpreter they were measured with."""
+    document = {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'machine': platform.machine(),
+        'results': results,
+    }
+    with open(path, 'w') as file:
+        json.dump(document, file, indent=2, sort_keys=True)
+
+
+def load(path: str) -> dict[str, float]:
+    """Load the results of a baseline."""
+    with open(path) as file:
+        return json.load(file)['results']
+
+
+def report(results: dict[str, float], comparisons: list[Comparison], threshold: float, output=sys.stdout):
+    """Print the results, and their change against the baseline if any."""
+    changes = {comparison.name: comparison for comparison in comparisons}
+    for name, current in results.items():
+        line = f'{name:<32} {current * 1e6:>12.2f} us'
+        comparison = changes.get(name)
+        if comparison is not None:
+            line += f' {comparison.ratio - 1:>+8.1%}'
+            if comparison.is_regression(threshold):
+                line += '  REGRESSION'
+        print(line, file=output)
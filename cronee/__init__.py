@@ -1,4 +1,15 @@
 from .cronee import Cronee
 from .parser import parse_expression
-from .exceptions import CroneeValueError, CroneeAliasError, CroneeOutOfBoundError, CroneeSyntaxError, \
-    CroneeRangeOrderError, CroneeEmptyValuesError
+from .cache import ParseCache, CacheStatistics, parse_expression_cached
+from .bulk import parse_expressions, BulkParseResult, ParseFailure
+from .algebra import CompositeCronee, union, intersection, difference
+from .canonical import canonical_expression, canonical_form, content_hash
+from .serialization import to_bytes, from_bytes, to_json, from_json
+from .date_sets import DateSet, load_csv, load_ical
+from .index import CroneeIndex
+from .scheduler import CroneeScheduler
+from .aio import AsyncCroneeRunner
+from .timeline import Timeline, write_timeline
+from .analysis import Satisfiability, analyze
+from .exceptions import CroneeParseError, CroneeValueError, CroneeAliasError, CroneeOutOfBoundError, \
+    CroneeSyntaxError, CroneeRangeOrderError, CroneeEmptyValuesError, CroneeSearchBudgetError, CroneeUnsatisfiableError
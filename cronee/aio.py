@@ -0,0 +1,180 @@
+"""
+asyncio integration: awaitable occurrences, asynchronous occurrence streams and a runner dispatching coroutines.
+"""
+import asyncio
+from concurrent.futures import Executor
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Hashable, Optional
+
+from .cronee import Cronee, SimpleCronee, resolution_of
+from .helpers import utc_instant
+from .scheduler import CroneeScheduler, Clock, default_start
+
+Job = Callable[[datetime], Awaitable]
+
+
+def is_expensive(cronee: Cronee) -> bool:
+    """
+    Check if the search of the occurrences of the cronee may be too long to run on the event loop. The field-skipping
+    search of a SimpleCronee only steps when dynamic validators are involved; other implementations are unknown.
+
+    :param cronee: the cronee to check
+    :return: True if the search should be offloaded to an executor
+    """
+    return not isinstance(cronee, SimpleCronee) or any(cronee.other_validators)
+
+
+async def next_occurrence(cronee: Cronee, start: datetime, executor: Executor = None,
+                          offload: Optional[bool] = None) -> datetime:
+    """
+    Compute the next occurrence of the cronee without blocking the event loop on expensive searches.
+
+    :param cronee: the cronee to search the occurrence of
+    :param start: datetime from which the search starts
+    :param executor: (optional) executor running the offloaded searches. Defaults to the executor of the loop.
+    :param offload: (optional) force or prevent the offloading. By default, only expensive searches are offloaded.
+    :return: the next valid datetime
+    """
+    if offload is None:
+        offload = is_expensive(cronee)
+    if not offload:
+        return cronee.next_occurrence(start)
+    return await asyncio.get_running_loop().run_in_executor(executor, cronee.next_occurrence, start)
+
+
+async def sleep_until(dtime: datetime, clock: Clock = datetime.now):
+    """Sleep until the clock reaches the datetime."""
+    delay = (utc_instant(dtime) - utc_instant(clock())).total_seconds()
+    await asyncio.sleep(max(delay, 0))
+
+
+async def sleep_until_next(cronee: Cronee, clock: Clock = datetime.now, executor: Executor = None) -> datetime:
+    """
+    Sleep until the next occurrence of the cronee, starting at the next minute, or at the next second for a cronee
+    with a seconds field.
+
+    :param cronee: the cronee to wait for
+    :param clock: (optional) function returning the current datetime. Defaults to datetime.now.
+    :param executor: (optional) executor running the offloaded searches
+    :return: the datetime of the occurrence
+    """
+    fire_time = await next_occurrence(cronee, default_start(cronee, clock()), executor)
+    await sleep_until(fire_time, clock)
+    return fire_time
+
+
+async def aiter_occurrences(cronee: Cronee, start: datetime = None, clock: Clock = datetime.now,
+                            executor: Executor = None) -> AsyncIterator[datetime]:
+    """
+    Asynchronously iterate over the occurrences of the cronee, each one being yielded when it is due.
+
+    :param cronee: the cronee to iterate the occurrences of
+    :param start: (optional) datetime from which the occurrences are computed. Defaults to the next minute, or to
+        the next second for a cronee with a seconds field.
+    :param clock: (optional) function returning the current datetime. Defaults to datetime.now.
+    :param executor: (optional) executor running the offloaded searches
+    :return: an asynchronous iterator over the occurrences
+    """
+    if start is None:
+        start = default_start(cronee, clock())
+    while True:
+        fire_time = await next_occurrence(cronee, start, executor)
+        await sleep_until(fire_time, clock)
+        yield fire_time
+        start = fire_time + resolution_of(cronee)
+
+
+class AsyncCroneeRunner:
+    """
+    Run coroutines when their cronee fires. The occurrences are merged by a CroneeScheduler, and the runner sleeps on
+    the event loop until the earliest one. Each firing is dispatched as a new task so slow jobs do not delay the others.
+
+    The methods of the runner must be called from the thread running the event loop.
+    """
+
+    def __init__(self, clock: Clock = datetime.now, executor: Executor = None):
+        """
+        :param clock: (optional) function returning the current datetime. Defaults to datetime.now.
+        :param executor: (optional) executor running the expensive searches. Defaults to the executor of the loop.
+        """
+        self._clock = clock
+        self._executor = executor
+        self._scheduler = CroneeScheduler(clock)
+        self._jobs: dict[Hashable, tuple[Cronee, Job]] = {}
+        self._expensive: set[Hashable] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._wakeup = asyncio.Event()
+        self._stopped = False
+
+    def add(self, key: Hashable, cronee: Cronee, job: Job, start: datetime = None):
+        """
+        Schedule a coroutine function, replacing the job already scheduled under the same key.
+
+        :param key: hashable identifier of the job
+        :param cronee: the cronee deciding when the job runs
+        :param job: coroutine function called with the fire time of each occurrence
+        :param start: (optional) datetime from which the occurrences are computed. Defaults to the next minute, or to
+            the next second for a cronee with a seconds field.
+        """
+        self._scheduler.add(key, cronee, start)
+        self._jobs[key] = cronee, job
+        if is_expensive(cronee):
+            self._expensive.add(key)
+        else:
+            self._expensive.discard(key)
+        self._wakeup.set()
+
+    def remove(self, key: Hashable):
+        """
+        Unschedule the job registered under the key. Running tasks of the job are not cancelled.
+
+        :raises: KeyError, if no job is scheduled under the key
+        """
+        self._scheduler.remove(key)
+        del self._jobs[key]
+        self._expensive.discard(key)
+        self._wakeup.set()
+
+    async def run(self):
+        """Dispatch the jobs when they are due, until stop is called."""
+        self._stopped = False
+        while not self._stopped:
+            fire_time = self._scheduler.next_fire_time()
+            delay = None if fire_time is None else (utc_instant(fire_time) - utc_instant(self._clock())).total_seconds()
+            if delay is None or delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            for key, fire_time, cronee in await self._pop_due():
+                registered = self._jobs.get(key)
+                if registered is None or registered[0] is not cronee:
+                    # The job was removed or replaced while the due cronees were popped.
+                    continue
+                job = registered[1]
+                if key not in self._scheduler:
+                    self._jobs.pop(key)
+                    self._expensive.discard(key)
+                task = asyncio.create_task(job(fire_time))
+                self._tasks.add(task)
+                task.add_done_callback(self._tasks.discard)
+
+    def stop(self):
+        """Make run return as soon as possible."""
+        self._stopped = True
+        self._wakeup.set()
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._jobs
+
+    async def _pop_due(self) -> list[tuple[Hashable, datetime, Cronee]]:
+        """ Re-arming the due cronees runs a search for each one, so it is offloaded if one of them is expensive """
+        if not self._expensive:
+            return self._scheduler.pop_due_entries()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, self._scheduler.pop_due_entries)
+
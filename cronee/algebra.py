@@ -0,0 +1,494 @@
+"""
+Set algebra of the cronees: union (`a | b`), intersection (`a & b`) and difference (`a - b`).
+
+A cronee is the product of the sets of valid values of its fields, so combinations of cronees sharing their offset and
+timezone are often cronees themselves: the intersection of two cronees intersects their fields, and the union or the
+difference of two cronees which only differ by one field combines that field. Those combinations are compiled into a
+single SimpleCronee, evaluated with its bitmasks in one pass.
+
+The other combinations are kept as a CompositeCronee. It evaluates its operands once per candidate: the union merges
+their occurrence streams, the intersection leapfrogs from the occurrence of an operand to the next occurrence of the
+others until they agree, and the difference filters the occurrences of the first operand.
+"""
+import heapq
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Callable, Iterable, Iterator, Optional, TypeVar, TYPE_CHECKING
+
+from .cronee import Cronee, SimpleCronee, build_cronee, resolution_of
+from .exceptions import CroneeSearchBudgetError
+from .helpers import DEFAULT_MAX_CANDIDATES
+from .parser import FIELD_SPECS
+
+if TYPE_CHECKING:
+    import numpy
+
+UNION = 'union'
+INTERSECTION = 'intersection'
+DIFFERENCE = 'difference'
+
+FIELDS = ('minutes', 'hours', 'doms', 'months', 'dows')
+FIELD_RANGES = tuple(spec.valid_range for spec in FIELD_SPECS)
+
+ONE_SECOND = timedelta(seconds=1)
+
+Field = tuple[frozenset[int], tuple]
+Instant = TypeVar('Instant', datetime, int)
+
+
+@dataclass(frozen=True)
+class CompositeCronee:
+    """
+    Union, intersection or difference of cronees which cannot be compiled into a single SimpleCronee.
+
+    Instances are immutable and hashable. They are built by the operators of the cronees (`a | b`, `a & b`, `a - b`)
+    or by `union`, `intersection` and `difference`, which compile what can be compiled. The operands of a difference
+    are the minuend and the subtrahend. The occurrences of the operands are compared as instants, so the operands must
+    be all naive or all zoned.
+    """
+
+    operator: str
+    operands: tuple[Cronee, ...]
+
+    @property
+    def resolution(self) -> timedelta:
+        """The finest resolution of the operands: a second if one of them has a seconds field, a minute otherwise."""
+        return min(resolution_of(operand) for operand in self.operands)
+
+    def validate(self, dtime: datetime) -> bool:
+        """ Check if the datetime is valid """
+        if self.operator == UNION:
+            return any(operand.validate(dtime) for operand in self.operands)
+        if self.operator == INTERSECTION:
+            return all(operand.validate(dtime) for operand in self.operands)
+        minuend, subtrahend = self.operands
+        return minuend.validate(dtime) and not subtrahend.validate(dtime)
+
+    def validate_ts(self, epoch_seconds: int) -> bool:
+        """
+        Check if an epoch timestamp is valid.
+
+        :param epoch_seconds: number of seconds since 1970-01-01 00:00 UTC
+        :return: True if the timestamp validates the cronee
+        """
+        if self.operator == UNION:
+            return any(operand.validate_ts(epoch_seconds) for operand in self.operands)
+        if self.operator == INTERSECTION:
+            return all(operand.validate_ts(epoch_seconds) for operand in self.operands)
+        minuend, subtrahend = self.operands
+        return minuend.validate_ts(epoch_seconds) and not subtrahend.validate_ts(epoch_seconds)
+
+    def validate_many(self, timestamps) -> 'numpy.ndarray':
+        """
+        Check which timestamps of an array validate the cronee. Requires numpy.
+
+        :param timestamps: array of numpy.datetime64 or array of epoch seconds
+        :return: a boolean numpy array, True where the timestamp validates the cronee
+        """
+        results = [operand.validate_many(timestamps) for operand in self.operands]
+        if self.operator == UNION:
+            return _reduce(lambda left, right: left | right, results)
+        if self.operator == INTERSECTION:
+            return _reduce(lambda left, right: left & right, results)
+        return results[0] & ~results[1]
+
+    def next_ts(self, epoch_seconds: int, horizon: int = None, max_candidates: int = DEFAULT_MAX_CANDIDATES) -> int:
+        """
+        Compute the first epoch timestamp, epoch_seconds included, that validates the cronee.
+
+        :param epoch_seconds: number of seconds since 1970-01-01 00:00 UTC from which the search starts
+        :param horizon: (optional) number of seconds after epoch_seconds beyond which the search gives up
+        :param max_candidates: maximum number of candidates examined by the search
+        :return: the next valid timestamp, with the same seconds within the minute as epoch_seconds
+        :raises: CroneeSearchBudgetError, if no occurrence is found within the horizon or the budget of candidates.
+        """
+        end = None if horizon is None else epoch_seconds + horizon
+        occurrence = next(self.iter_ts(epoch_seconds, end, max_candidates), None)
+        if occurrence is None:
+            raise CroneeSearchBudgetError(f"No occurrence within {horizon} seconds after {epoch_seconds}")
+        return occurrence
+
+    def iter_ts(self, epoch_seconds: int, end: int = None,
+                max_candidates: int = DEFAULT_MAX_CANDIDATES) -> Iterator[int]:
+        """
+        Lazily iterate over the epoch timestamps validating the cronee, from epoch_seconds included to end excluded.
+
+        :param epoch_seconds: number of seconds since 1970-01-01 00:00 UTC from which the search starts
+        :param end: (optional) epoch timestamp at which the iteration stops. If not provided, it never stops.
+        :param max_candidates: maximum number of candidates examined by the search of each occurrence
+        :return: an iterator over the valid timestamps, with the same seconds within the minute as epoch_seconds
+        :raises: CroneeSearchBudgetError, while iterating, if the search of an occurrence exhausts its budget.
+        """
+        return self._iterate(lambda operand, start: operand.iter_ts(start, end, max_candidates),
+                             lambda operand: operand.validate_ts, epoch_seconds, self.resolution // ONE_SECOND, False,
+                             max_candidates)
+
+    def next_occurrence_many(self, starts) -> 'numpy.ndarray':
+        """
+        Compute the next occurrence of each timestamp of an array. Requires numpy.
+
+        :param starts: array, sorted or not, of numpy.datetime64 or of epoch seconds
+        :return: a numpy array of the same kind as starts, holding the next valid timestamp of each start
+        """
+        from .vectorized import next_occurrence_many
+        return next_occurrence_many(self, starts)
+
+    def next_occurrence(self, dtime: datetime, horizon: timedelta = None,
+                        max_candidates: int = DEFAULT_MAX_CANDIDATES) -> datetime:
+        """
+        Compute the first datetime, starting at dtime included, that validates the cronee.
+
+        :param dtime: datetime from which the search starts
+        :param horizon: (optional) duration after dtime beyond which the search gives up
+        :param max_candidates: maximum number of candidates examined by the search
+        :return: the next valid datetime, with the same seconds and microseconds as dtime
+        :raises: CroneeSearchBudgetError, if no occurrence is found within the horizon or the budget of candidates.
+        """
+        end = None if horizon is None else dtime + horizon
+        occurrence = next(self.iter_occurrences(dtime, end, max_candidates), None)
+        if occurrence is None:
+            raise CroneeSearchBudgetError(f"No occurrence within {horizon} after {dtime}")
+        return occurrence
+
+    def next_occurrences(self, dtime: datetime, count: int = 10) -> list[datetime]:
+        return [occurrence for occurrence, _ in zip(self.iter_occurrences(dtime), range(count))]
+
+    def iter_occurrences(self, start: datetime, end: datetime = None,
+                         max_candidates: int = DEFAULT_MAX_CANDIDATES) -> Iterator[datetime]:
+        """
+        Lazily iterate over the datetimes validating the cronee, from start included to end excluded.
+
+        :param start: datetime from which the search starts
+        :param end: (optional) datetime at which the iteration stops. If not provided, the iteration never stops.
+        :param max_candidates: maximum number of candidates examined by the search of each occurrence
+        :return: an iterator over the valid datetimes, with the same seconds and microseconds as start
+        :raises: CroneeSearchBudgetError, while iterating, if the search of an occurrence exhausts its budget.
+        """
+        return self._iterate(lambda operand, first: operand.iter_occurrences(first, end, max_candidates),
+                             lambda operand: operand.validate, start, self.resolution, False, max_candidates)
+
+    def between(self, start: datetime, end: datetime) -> Iterator[datetime]:
+        """
+        Lazily iterate over the datetimes validating the cronee, from start included to end excluded.
+
+        :param start: datetime from which the search starts
+        :param end: datetime at which the iteration stops
+        :return: an iterator over the valid datetimes
+        """
+        return self.iter_occurrences(start, end)
+
+    def previous_occurrence(self, dtime: datetime, horizon: timedelta = None,
+                            max_candidates: int = DEFAULT_MAX_CANDIDATES) -> datetime:
+        """
+        Compute the last datetime, before dtime or equal to it, that validates the cronee.
+
+        :param dtime: datetime from which the search starts, backwards
+        :param horizon: (optional) duration before dtime beyond which the search gives up
+        :param max_candidates: maximum number of candidates examined by the search
+        :return: the previous valid datetime, with the same seconds and microseconds as dtime
+        :raises: CroneeSearchBudgetError, if no occurrence is found within the horizon or the budget of candidates.
+        """
+        end = None if horizon is None else dtime - horizon
+        occurrence = next(self.iter_previous_occurrences(dtime, end, max_candidates), None)
+        if occurrence is None:
+            raise CroneeSearchBudgetError(f"No occurrence within {horizon} before {dtime}")
+        return occurrence
+
+    def previous_occurrences(self, dtime: datetime, count: int = 10) -> list[datetime]:
+        return [occurrence for occurrence, _ in zip(self.iter_previous_occurrences(dtime), range(count))]
+
+    def iter_previous_occurrences(self, start: datetime, end: datetime = None,
+                                  max_candidates: int = DEFAULT_MAX_CANDIDATES) -> Iterator[datetime]:
+        """
+        Lazily iterate backwards over the datetimes validating the cronee, from start included to end excluded.
+
+        :param start: datetime from which the search starts, backwards
+        :param end: (optional) datetime, before start, at which the iteration stops. If not provided, the iteration
+            never stops.
+        :param max_candidates: maximum number of candidates examined by the search of each occurrence
+        :return: an iterator over the valid datetimes, latest first, with the same seconds and microseconds as start
+        :raises: CroneeSearchBudgetError, while iterating, if the search of an occurrence exhausts its budget.
+        """
+        return self._iterate(lambda operand, first: operand.iter_previous_occurrences(first, end, max_candidates),
+                             lambda operand: operand.validate, start, -self.resolution, True, max_candidates)
+
+    async def sleep_until_next(self, clock: Callable[[], datetime] = datetime.now) -> datetime:
+        """
+        Sleep, without blocking the event loop, until the next occurrence starting at the next step of the resolution.
+
+        :param clock: (optional) function returning the current datetime. Defaults to datetime.now.
+        :return: the datetime of the occurrence
+        """
+        from .aio import sleep_until_next
+        return await sleep_until_next(self, clock)
+
+    def aiter_occurrences(self, start: datetime = None,
+                          clock: Callable[[], datetime] = datetime.now) -> AsyncIterator[datetime]:
+        """
+        Asynchronously iterate over the occurrences, each one being yielded when it is due.
+
+        :param start: (optional) datetime from which the occurrences are computed. Defaults to the next step of the
+            resolution.
+        :param clock: (optional) function returning the current datetime. Defaults to datetime.now.
+        :return: an asynchronous iterator over the occurrences
+        """
+        from .aio import aiter_occurrences
+        return aiter_occurrences(self, start, clock)
+
+    def _iterate(self, iterate: Callable[[Cronee, Instant], Iterator[Instant]],
+                 validator: Callable[[Cronee], Callable[[Instant], bool]],
+                 start: Instant, step, reverse: bool, max_candidates: int) -> Iterator[Instant]:
+        """ Iterate over the occurrences, forwards or backwards, with the search of the operator """
+        if self.operator == UNION:
+            return _merge([iterate(operand, start) for operand in self.operands], reverse)
+        if self.operator == INTERSECTION:
+            return _leapfrog(lambda operand, first: next(iterate(operand, first), None), self.operands, start, step,
+                             max_candidates)
+        minuend, subtrahend = self.operands
+        return _exclude(iterate(minuend, start), validator(subtrahend), max_candidates)
+
+    def __or__(self, other: Cronee) -> Cronee:
+        return union(self, other) if is_cronee(other) else NotImplemented
+
+    def __and__(self, other: Cronee) -> Cronee:
+        return intersection(self, other) if is_cronee(other) else NotImplemented
+
+    def __sub__(self, other: Cronee) -> Cronee:
+        return difference(self, other) if is_cronee(other) else NotImplemented
+
+
+def is_cronee(value) -> bool:
+    """ True if the value can be combined with a cronee """
+    return all(callable(getattr(value, name, None)) for name in ('validate', 'validate_ts', 'iter_occurrences'))
+
+
+def _reduce(function, values: list):
+    result = values[0]
+    for value in values[1:]:
+        result = function(result, value)
+    return result
+
+
+def _instant(occurrence: Instant) -> Instant:
+    """ Aware datetimes sharing a tzinfo are compared by wall time, so they are compared in UTC """
+    if isinstance(occurrence, datetime) and occurrence.tzinfo is not None:
+        return occurrence.astimezone(timezone.utc)
+    return occurrence
+
+
+def _merge(streams: list[Iterator[Instant]], reverse: bool) -> Iterator[Instant]:
+    """ k-way merge of sorted occurrence streams, without duplicates """
+    previous = None
+    for occurrence in heapq.merge(*streams, key=_instant, reverse=reverse):
+        instant = _instant(occurrence)
+        if instant != previous:
+            previous = instant
+            yield occurrence
+
+
+def _leapfrog(search: Callable[[Cronee, Instant], Optional[Instant]], operands: tuple[Cronee, ...], start: Instant,
+              step, max_candidates: int) -> Iterator[Instant]:
+    """ Occurrences common to every operand: each operand searches from the last candidate until they all agree """
+    candidate = start
+    while True:
+        agreed = 0
+        index = 0
+        candidates = 0
+        while agreed < len(operands):
+            candidates += 1
+            if candidates > max_candidates:
+                raise CroneeSearchBudgetError(f"No occurrence found within {max_candidates} candidates from {start}")
+            occurrence = search(operands[index], candidate)
+            if occurrence is None:
+                return
+            if _instant(occurrence) == _instant(candidate):
+                agreed += 1
+            else:
+                candidate, agreed = occurrence, 1
+            index = (index + 1) % len(operands)
+        yield candidate
+        candidate = candidate + step
+
+
+def _exclude(stream: Iterator[Instant], excluded: Callable[[Instant], bool],
+             max_candidates: int) -> Iterator[Instant]:
+    """ Occurrences of a stream which are not excluded """
+    rejected = 0
+    for occurrence in stream:
+        if not excluded(occurrence):
+            rejected = 0
+            yield occurrence
+            continue
+        rejected += 1
+        if rejected > max_candidates:
+            raise CroneeSearchBudgetError(f"No occurrence found within {max_candidates} candidates")
+
+
+def _field(cronee: SimpleCronee, index: int) -> Field:
+    return getattr(cronee, FIELDS[index]), cronee.other_validators[index]
+
+
+def _is_full(field: Field, index: int) -> bool:
+    return field[0] == FIELD_RANGES[index]
+
+
+def _field_is_subset(field: Field, other: Field, index: int) -> bool:
+    """ True if every value accepted by the field is accepted by the other one """
+    return field == other or _is_full(other, index) or (not field[1] and field[0] <= other[0])
+
+
+def _is_subset(cronee: SimpleCronee, other: SimpleCronee) -> bool:
+    return all(_field_is_subset(_field(cronee, index), _field(other, index), index) for index in range(len(FIELDS)))
+
+
+def _are_compatible(cronee: Cronee, other: Cronee) -> bool:
+    """ True if the cronees match the same shifted wall time and dates, so their fields can be combined """
+    return isinstance(cronee, SimpleCronee) and isinstance(other, SimpleCronee) and \
+        (cronee.offset, cronee.timezone, cronee.nonexistent, cronee.ambiguous, cronee.excluded_dates,
+         cronee.included_dates, cronee.seconds, cronee.years) == \
+        (other.offset, other.timezone, other.nonexistent, other.ambiguous, other.excluded_dates, other.included_dates,
+         other.seconds, other.years)
+
+
+def _never_fires(cronee: Cronee) -> bool:
+    return isinstance(cronee, SimpleCronee) and cronee.satisfiability.satisfiable is False
+
+
+def _build(model: SimpleCronee, fields: list[Field]) -> SimpleCronee:
+    """ Cronee with the offset and timezone of the model, and the given fields """
+    return build_cronee(
+        *(values for values, _ in fields),
+        offset=model.offset,
+        other_validators=[validators for _, validators in fields],
+        timezone=model.timezone,
+        nonexistent=model.nonexistent,
+        ambiguous=model.ambiguous,
+        excluded_dates=model.excluded_dates,
+        included_dates=model.included_dates,
+        seconds=model.seconds,
+        years=model.years
+    )
+
+
+def _compile_union(cronee: SimpleCronee, other: SimpleCronee) -> Optional[SimpleCronee]:
+    if _is_subset(other, cronee):
+        return cronee
+    if _is_subset(cronee, other):
+        return other
+    fields = [_field(cronee, index) for index in range(len(FIELDS))]
+    different = [index for index in range(len(FIELDS)) if fields[index] != _field(other, index)]
+    if len(different) != 1:
+        return None
+    index = different[0]
+    values, validators = _field(other, index)
+    fields[index] = (fields[index][0] | values, tuple(dict.fromkeys(fields[index][1] + validators)))
+    return _build(cronee, fields)
+
+
+def _compile_intersection(cronee: SimpleCronee, other: SimpleCronee) -> Optional[SimpleCronee]:
+    fields = []
+    for index in range(len(FIELDS)):
+        field, other_field = _field(cronee, index), _field(other, index)
+        if field == other_field or _is_full(other_field, index):
+            fields.append(field)
+        elif _is_full(field, index):
+            fields.append(other_field)
+        elif not field[1] and not other_field[1]:
+            fields.append((field[0] & other_field[0], ()))
+        else:
+            return None
+    return _build(cronee, fields)
+
+
+def _compile_difference(cronee: SimpleCronee, other: SimpleCronee) -> Optional[SimpleCronee]:
+    fields = [_field(cronee, index) for index in range(len(FIELDS))]
+    for index, field in enumerate(fields):
+        other_field = _field(other, index)
+        if not field[1] and not other_field[1] and not field[0] & other_field[0]:
+            return cronee
+    different = [index for index in range(len(FIELDS))
+                 if not _field_is_subset(fields[index], _field(other, index), index)]
+    if not different:
+        return _build(cronee, [(frozenset(), ())] + fields[1:])
+    if len(different) != 1:
+        return None
+    index = different[0]
+    values, validators = _field(other, index)
+    if fields[index][1] or validators:
+        return None
+    fields[index] = (fields[index][0] - values, ())
+    return _build(cronee, fields)
+
+
+def _combine(operator: str, cronees: Iterable[Cronee],
+             compile_pair: Callable[[SimpleCronee, SimpleCronee], Optional[SimpleCronee]]) -> list[Cronee]:
+    """ Flatten the operands of an associative operator, compiling the pairs of compatible cronees """
+    operands = []
+    pending = list(cronees)
+    while pending:
+        cronee = pending.pop(0)
+        if isinstance(cronee, CompositeCronee) and cronee.operator == operator:
+            pending[:0] = cronee.operands
+            continue
+        for position, operand in enumerate(operands):
+            if _are_compatible(operand, cronee):
+                compiled = compile_pair(operand, cronee)
+                if compiled is not None:
+                    del operands[position]
+                    pending.insert(0, compiled)
+                    break
+        else:
+            operands.append(cronee)
+    return operands
+
+
+def union(*cronees: Cronee) -> Cronee:
+    """
+    Combine cronees into a cronee firing when any of them fires.
+
+    :param cronees: the cronees
+    :return: a SimpleCronee if the union can be compiled into one, a CompositeCronee otherwise
+    """
+    firing = [cronee for cronee in cronees if not _never_fires(cronee)]
+    if not firing:
+        return cronees[0]
+    operands = _combine(UNION, firing, _compile_union)
+    return operands[0] if len(operands) == 1 else CompositeCronee(UNION, tuple(operands))
+
+
+def intersection(*cronees: Cronee) -> Cronee:
+    """
+    Combine cronees into a cronee firing when all of them fire.
+
+    :param cronees: the cronees
+    :return: a SimpleCronee if the intersection can be compiled into one, a CompositeCronee otherwise
+    """
+    operands = _combine(INTERSECTION, cronees, _compile_intersection)
+    return operands[0] if len(operands) == 1 else CompositeCronee(INTERSECTION, tuple(operands))
+
+
+def difference(minuend: Cronee, subtrahend: Cronee) -> Cronee:
+    """
+    Combine two cronees into a cronee firing when the first one fires but not the second one.
+
+    :param minuend: the cronee whose occurrences are kept
+    :param subtrahend: the cronee whose occurrences are removed
+    :return: a SimpleCronee if the difference can be compiled into one, a CompositeCronee otherwise
+    """
+    if isinstance(minuend, CompositeCronee) and minuend.operator == DIFFERENCE:
+        minuend, removed = minuend.operands
+        subtrahend = union(removed, subtrahend)
+    remaining = []
+    removed = subtrahend.operands if isinstance(subtrahend, CompositeCronee) and subtrahend.operator == UNION \
+        else (subtrahend,)
+    for cronee in removed:
+        if _never_fires(cronee):
+            continue
+        compiled = _compile_difference(minuend, cronee) if _are_compatible(minuend, cronee) else None
+        if compiled is None:
+            remaining.append(cronee)
+        else:
+            minuend = compiled
+    if not remaining or _never_fires(minuend):
+        return minuend
+    return CompositeCronee(DIFFERENCE, (minuend, union(*remaining)))
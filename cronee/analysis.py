@@ -0,0 +1,143 @@
+"""
+Static analysis of the cronees.
+
+The day-level constraints only depend on the date, and the gregorian calendar repeats every 400 years, a cycle in which
+every date of the year falls on every day of the week. So whether a cronee can ever fire is decided from its fields
+alone, without searching. The dynamic validators other than the `#` index ones are opaque: they can only add valid
+values, so they do not prevent a proof of satisfiability, but they prevent a proof of unsatisfiability. A cronee
+restricted to included dates is checked date by date, and one restricted to a few years is checked year by year: both
+fire a finite number of times, so they have no period.
+"""
+from datetime import datetime, timedelta
+from functools import lru_cache
+from typing import NamedTuple, Optional, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .cronee import SimpleCronee
+
+MAX_DAYS_IN_MONTH = (0, 31, 29, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+ALL_DOMS = sum(1 << day for day in range(1, 32))
+ALL_MONTHS = sum(1 << month for month in range(1, 13))
+ALL_DOWS = sum(1 << dow for dow in range(1, 8))
+MINUTES_PER_DAY = 1440
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+GREGORIAN_CYCLE = timedelta(days=146097)
+SECONDS_PER_MINUTE = 60
+ONE_MINUTE = timedelta(minutes=1)
+MAX_ANALYZED_YEARS = 400
+
+
+class Satisfiability(NamedTuple):
+    """Result of the static analysis of a cronee."""
+
+    satisfiable: Optional[bool]
+    """True if the cronee fires, False if it never fires, None if its dynamic validators prevent a proof"""
+    period: Optional[timedelta]
+    """
+    Duration by which the occurrences repeat: the smallest one for the daily and weekly patterns, the 400 years cycle
+    otherwise. None if the cronee never fires or if it is unknown.
+    """
+
+
+def analyze(cronee: 'SimpleCronee') -> Satisfiability:
+    """
+    Prove whether a cronee can ever fire, and compute the period of its occurrences.
+
+    :param cronee: the cronee
+    :return: the satisfiability of the cronee and its period
+    """
+    index_validators, opaque = _split_validators(cronee)
+    if cronee.seconds is not None and not cronee.second_mask:
+        return Satisfiability(False, None)
+    if cronee.included_dates is not None:
+        if _included_dates_are_satisfiable(cronee, index_validators):
+            return Satisfiability(True, None)
+        return Satisfiability(None if opaque else False, None)
+    if not _fields_are_satisfiable(cronee, index_validators):
+        return Satisfiability(None if opaque else False, None)
+    if cronee.years is not None:
+        if opaque or len(cronee.years) > MAX_ANALYZED_YEARS:
+            return Satisfiability(None, None)
+        return Satisfiability(any(cronee._year_table(year).days for year in cronee.years), None)
+    if opaque or cronee.excluded_dates is not None:
+        # The excluded dates are finite: they remove some occurrences, but the others repeat without a period.
+        return Satisfiability(True, None)
+    period = _period(cronee, index_validators)
+    if cronee.seconds is not None and period == ONE_MINUTE:
+        period = timedelta(seconds=_rotation_period(cronee.second_mask, SECONDS_PER_MINUTE))
+    return Satisfiability(True, period)
+
+
+def _split_validators(cronee: 'SimpleCronee') -> tuple[list, bool]:
+    """ Separate the `#` index validators from the opaque ones """
+    from .cronee import BoundIndexValidator, dow_index_validator
+    index_validators = []
+    opaque = False
+    for field_validators in cronee.other_validators:
+        for validator in field_validators:
+            if isinstance(validator, BoundIndexValidator) and validator.function is dow_index_validator:
+                index_validators.append(validator)
+            else:
+                opaque = True
+    return index_validators, opaque
+
+
+def _fields_are_satisfiable(cronee: 'SimpleCronee', index_validators: list) -> bool:
+    """ Check, from the masks and the `#` index validators only, that at least one datetime is valid """
+    if not cronee.minute_mask or not cronee.hour_mask:
+        return False
+    indexes = {validator.index for validator in index_validators if validator.values}
+    for month in range(1, 13):
+        if not cronee.month_mask >> month & 1:
+            continue
+        for day in range(1, MAX_DAYS_IN_MONTH[month] + 1):
+            if cronee.dom_mask >> day & 1 and (cronee.dow_mask or (day + 6) // 7 in indexes):
+                return True
+    return False
+
+
+def _included_dates_are_satisfiable(cronee: 'SimpleCronee', index_validators: list) -> bool:
+    """ Check, from the masks and the `#` index validators only, that one of the included dates is valid """
+    if not cronee.minute_mask or not cronee.hour_mask:
+        return False
+    for dtime in cronee.included_dates:
+        if cronee.excluded_dates is not None and dtime in cronee.excluded_dates:
+            continue
+        if cronee.years is not None and dtime.year not in cronee.years:
+            continue
+        if cronee.dom_mask >> dtime.day & cronee.month_mask >> dtime.month & 1 and \
+                (cronee.dow_mask >> dtime.isoweekday() & 1 or
+                 any(validator(datetime(dtime.year, dtime.month, dtime.day)) for validator in index_validators)):
+            return True
+    return False
+
+
+def _period(cronee: 'SimpleCronee', index_validators: list) -> timedelta:
+    """ Period of the occurrences of a satisfiable cronee without opaque validators """
+    if index_validators or cronee.dom_mask & ALL_DOMS != ALL_DOMS or cronee.month_mask & ALL_MONTHS != ALL_MONTHS:
+        return GREGORIAN_CYCLE
+    times = 0
+    for hour in range(24):
+        if cronee.hour_mask >> hour & 1:
+            times |= (cronee.minute_mask & (1 << 60) - 1) << hour * 60
+    if cronee.dow_mask & ALL_DOWS == ALL_DOWS:
+        return timedelta(minutes=_rotation_period(times, MINUTES_PER_DAY))
+    week = 0
+    for dow in range(1, 8):
+        if cronee.dow_mask >> dow & 1:
+            week |= times << (dow - 1) * MINUTES_PER_DAY
+    return timedelta(minutes=_rotation_period(week, MINUTES_PER_WEEK))
+
+
+def _rotation_period(bits: int, size: int) -> int:
+    """ Smallest divisor p of size such that the circular bitmap is unchanged when rotated by p """
+    full = (1 << size) - 1
+    for period in _divisors(size):
+        if ((bits << period | bits >> (size - period)) & full) == bits:
+            return period
+    return size
+
+
+@lru_cache(maxsize=None)
+def _divisors(size: int) -> tuple[int, ...]:
+    return tuple(period for period in range(1, size + 1) if size % period == 0)
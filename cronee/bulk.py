@@ -0,0 +1,108 @@
+"""
+Bulk parsing of expressions.
+
+Loading a large configuration parses many expressions, often with duplicates. `parse_expressions` parses each distinct
+string once, optionally in a pool of processes, and collects the invalid expressions instead of stopping at the first.
+"""
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional, Union
+
+from .cronee import Cronee
+from .exceptions import CroneeParseError
+from .parser import parse_expression
+
+DEFAULT_CHUNK_SIZE = 5000
+
+
+@dataclass(frozen=True)
+class ParseFailure:
+    """An expression which could not be parsed"""
+
+    index: int
+    """Position of the expression in the parsed iterable"""
+    expression: str
+    error: CroneeParseError
+    """Error raised by the parser, with the position of the error in the expression"""
+
+
+@dataclass(frozen=True)
+class BulkParseResult:
+    """Result of the parsing of many expressions"""
+
+    cronees: list[Optional[Cronee]]
+    """The cronee of each expression, in the order of the iterable, or None if the expression is invalid"""
+    failures: list[ParseFailure]
+    """The invalid expressions, in the order of the iterable"""
+
+    @property
+    def succeeded(self) -> bool:
+        """True if every expression was parsed."""
+        return not self.failures
+
+    def raise_for_failures(self):
+        """
+        Raise the error of the first invalid expression, if any.
+
+        :raises: CroneeParseError, if an expression is invalid.
+        """
+        if self.failures:
+            raise self.failures[0].error
+
+
+def _parse_chunk(parser: Callable[[str], Cronee],
+                 expressions: list[str]) -> list[Union[Cronee, CroneeParseError]]:
+    """ Parse a chunk of expressions, returning the errors instead of raising them """
+    results = []
+    for expression in expressions:
+        try:
+            results.append(parser(expression))
+        except CroneeParseError as error:
+            results.append(error)
+    return results
+
+
+def parse_expressions(expressions: Iterable[str],
+                      parser: Callable[[str], Cronee] = parse_expression,
+                      processes: int = 1,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> BulkParseResult:
+    """
+    Parse many cron-like expressions at once. Identical expressions are parsed once and share the same cronee.
+
+    :param expressions: the expressions to parse
+    :param parser: (optional) function used to parse the expressions, for instance to parse them in a timezone. It must
+        be picklable, such as a module function or a functools.partial of one, to be run in a pool of processes.
+    :param processes: (optional) number of processes parsing the distinct expressions. The pool is only started when
+        there are more distinct expressions than the size of a chunk. Defaults to parsing in the current process.
+    :param chunk_size: (optional) number of expressions sent at once to a process of the pool
+    :return: the cronee of each expression and the invalid expressions with their errors
+    :raises: ValueError, if the `processes` or `chunk_size` argument is not strictly positive.
+    """
+    if processes <= 0:
+        raise ValueError(f"The number of processes must be strictly positive, got {processes}")
+    if chunk_size <= 0:
+        raise ValueError(f"The size of a chunk must be strictly positive, got {chunk_size}")
+
+    expressions = list(expressions)
+    distinct = list(dict.fromkeys(expressions))
+    if processes == 1 or len(distinct) <= chunk_size:
+        results = _parse_chunk(parser, distinct)
+    else:
+        chunks = [distinct[start:start + chunk_size] for start in range(0, len(distinct), chunk_size)]
+        # The cronees parsed by the other processes are restored from the masks of their fields and interned when
+        # they are unpickled, so equal cronees are shared as when parsing in the current process.
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = [result for chunk in executor.map(_parse_chunk, [parser] * len(chunks), chunks)
+                       for result in chunk]
+
+    parsed = dict(zip(distinct, results))
+    cronees = []
+    failures = []
+    for index, expression in enumerate(expressions):
+        result = parsed[expression]
+        if isinstance(result, CroneeParseError):
+            cronees.append(None)
+            failures.append(ParseFailure(index, expression, result))
+        else:
+            cronees.append(result)
+    return BulkParseResult(cronees, failures)
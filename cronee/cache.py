@@ -0,0 +1,117 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+from threading import Lock
+from typing import Callable
+
+from .cronee import Cronee
+from .parser import parse_expression
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class CacheStatistics:
+    """Snapshot of the usage of a parse cache"""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+
+def normalize_expression(expression: str) -> str:
+    """
+    Normalize the text of an expression so equivalent spellings share the same cache key.
+
+    :param expression: A string representing the cron-like expression.
+    :return: the expression with its fields separated by a single space.
+    """
+    return ' '.join(expression.split())
+
+
+class ParseCache:
+    """Bounded, thread-safe LRU cache of parsed cronees keyed by the normalized expression text."""
+
+    def __init__(self, maxsize: int = DEFAULT_CACHE_SIZE, parser: Callable[[str], Cronee] = parse_expression):
+        """
+        :param maxsize: maximum number of cronees kept in the cache.
+        :param parser: function used to parse the expressions missing from the cache.
+        :raises: ValueError, if the `maxsize` argument is not strictly positive.
+        """
+        if maxsize <= 0:
+            raise ValueError(f"The size of the cache must be strictly positive, got {maxsize}")
+        self._maxsize = maxsize
+        self._parser = parser
+        self._entries: OrderedDict[str, Cronee] = OrderedDict()
+        self._lock = Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def parse(self, expression: str) -> Cronee:
+        """
+        Return the cronee of the expression, parsing it only if it is not in the cache yet. Errors are not cached.
+
+        :param expression: A string representing the cron-like expression to be parsed.
+        :return: An immutable instance of Cronee, shared with every caller of the same expression.
+        """
+        key = normalize_expression(expression)
+        with self._lock:
+            cronee = self._entries.get(key)
+            if cronee is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return cronee
+            self._misses += 1
+
+        cronee = self._parser(key)
+
+        with self._lock:
+            cached = self._entries.setdefault(key, cronee)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._maxsize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+        return cached
+
+    def statistics(self) -> CacheStatistics:
+        """Return a snapshot of the hits, misses and evictions of the cache."""
+        with self._lock:
+            return CacheStatistics(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                maxsize=self._maxsize
+            )
+
+    def clear(self):
+        """Remove every cronee from the cache and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, expression: str) -> bool:
+        key = normalize_expression(expression)
+        with self._lock:
+            return key in self._entries
+
+
+default_cache = ParseCache()
+
+
+def parse_expression_cached(expression: str) -> Cronee:
+    """
+    Parse a cron-like expression through the default parse cache.
+
+    :param expression: A string representing the cron-like expression to be parsed.
+    :return: An immutable instance of Cronee, shared with every caller of the same expression.
+    """
+    return default_cache.parse(expression)
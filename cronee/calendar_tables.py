@@ -0,0 +1,123 @@
+"""
+Precomputed per-year calendar tables.
+
+The day-level constraints of a cronee (days of the month, months, days of the week, `#` indexes and the other day
+level validators) are compiled, once per year, into a bitmap of the valid days of the year: the bit n is set if the
+(n + 1)th day of the year is valid. Searching for a valid day is then a bit scan instead of a validator call per day.
+"""
+from datetime import datetime
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from . import instrumentation
+from .helpers import month_fields, values_to_mask, DOM_VALIDATORS, MONTH_VALIDATORS, DOW_VALIDATORS
+
+
+class YearTable(NamedTuple):
+    """Valid days of a year, with the position of the first day of each month in the bitmap."""
+
+    year: int
+    days: int
+    """Bitmap of the valid days of the year, the bit 0 being the 1st of January"""
+    month_starts: tuple[int, ...]
+    """Day of the year, starting at 0, of the first day of each month, followed by the number of days of the year.
+    The index 0 is unused."""
+
+    def first_valid_day(self, month: int, day: int) -> Optional[int]:
+        """
+        Find the first valid day of the month, day included.
+
+        :param month: the month
+        :param day: the day of the month from which the search starts
+        :return: the valid day of the month, or None if there is none
+        """
+        start = self.month_starts[month]
+        window = self.days >> (start + day - 1) & ((1 << (self.month_starts[month + 1] - start - day + 1)) - 1)
+        if not window:
+            return None
+        return day + (window & -window).bit_length() - 1
+
+    def last_valid_day(self, month: int, day: int) -> Optional[int]:
+        """
+        Find the last valid day of the month, day included.
+
+        :param month: the month
+        :param day: the day of the month from which the search starts, backwards. It may exceed the number of days.
+        :return: the valid day of the month, or None if there is none
+        """
+        start = self.month_starts[month]
+        day = min(day, self.month_starts[month + 1] - start)
+        window = self.days >> start & ((1 << day) - 1)
+        return window.bit_length() or None
+
+
+@lru_cache(maxsize=4096)
+def year_table(dom_mask: int, month_mask: int, dow_mask: int, dom_validators: tuple, month_validators: tuple,
+               dow_validators: tuple, year: int) -> YearTable:
+    """
+    Build the table of the valid days of a year for the day-level constraints of a cronee.
+
+    The tables are cached, so that the cronees sharing their day-level constraints share their tables.
+
+    :param dom_mask: bitmask of the valid days of the month
+    :param month_mask: bitmask of the valid months
+    :param dow_mask: bitmask of the valid iso weekdays
+    :param dom_validators: dynamic validators of the days of the month
+    :param month_validators: dynamic validators of the months
+    :param dow_validators: dynamic validators of the days of the week
+    :param year: the year
+    :return: the table of the year
+    """
+    index_validators, dow_validators = _split_dow_index_validators(dow_validators)
+    days = 0
+    month_starts = [0, 0]
+    for month in range(1, 13):
+        _, first_weekday, number_of_days = month_fields(year, month)
+        start = month_starts[-1]
+        month_starts.append(start + number_of_days)
+        if not (month_mask >> month & 1 or _any_valid(month_validators, MONTH_VALIDATORS, year, month, 1)):
+            continue
+        dom_days = dom_mask >> 1 & ((1 << number_of_days) - 1)
+        dow_days = _weekday_days(dow_mask, first_weekday, number_of_days)
+        for weekdays_mask, index in index_validators:
+            dow_days |= _weekday_days(weekdays_mask, first_weekday, number_of_days) & 0x7F << (index - 1) * 7
+        for day in range(1, number_of_days + 1):
+            bit = 1 << (day - 1)
+            if not dom_days & bit and _any_valid(dom_validators, DOM_VALIDATORS, year, month, day):
+                dom_days |= bit
+            if not dow_days & bit and _any_valid(dow_validators, DOW_VALIDATORS, year, month, day):
+                dow_days |= bit
+        days |= (dom_days & dow_days) << start
+    return YearTable(year, days, tuple(month_starts))
+
+
+def _weekday_days(dow_mask: int, first_weekday: int, number_of_days: int) -> int:
+    """ Bitmap of the days of the month whose iso weekday is in the mask """
+    week = 0
+    for day in range(7):
+        week |= (dow_mask >> ((first_weekday + day) % 7 + 1) & 1) << day
+    days = 0
+    for start in range(0, number_of_days, 7):
+        days |= week << start
+    return days & ((1 << number_of_days) - 1)
+
+
+def _split_dow_index_validators(validators: tuple) -> tuple[list[tuple[int, int]], list]:
+    """ Separate the `#` index validators, compiled to bitmaps, from the validators evaluated day by day """
+    from .cronee import BoundIndexValidator, dow_index_validator
+    index_validators, others = [], []
+    for validator in validators:
+        if isinstance(validator, BoundIndexValidator) and validator.function is dow_index_validator:
+            index_validators.append((values_to_mask(validator.values), validator.index))
+        else:
+            others.append(validator)
+    return index_validators, others
+
+
+def _any_valid(validators, index: int, year: int, month: int, day: int) -> bool:
+    for validator in validators:
+        if instrumentation.collector is not None:
+            instrumentation.count_validator_call(index)
+        if validator(datetime(year, month, day)):
+            return True
+    return False
@@ -0,0 +1,190 @@
+"""
+Canonical form of the cronees.
+
+Many spellings compile to the same fields: `*/15 * * * *`, `0,15,30,45 * * * *` and `0..45/15 * * * *` are one
+schedule. The canonical expression is rendered back from the compiled fields, so every spelling of a schedule has the
+same one, and parsing it gives the same schedule again:
+
+- a field holding every valid value is `*`, and the values are written as numbers, without aliases
+- the values are split into runs: arithmetic progressions are written as ranges, with a step when it is not 1, or as
+  `*/step` when they cover the valid range, and the other values are listed. A field is inverted with `!` when its
+  complement is shorter to write.
+- the `#` index validators are sorted, and the ones already implied by the values of the field are dropped
+- the offset is written as a modifier of each field, from the days down to the seconds, with a single sign
+
+The canonical form appends to the expression the attributes which cannot be written in it: the timezone, the daylight
+saving policies and a digest of the date sets. Its content hash is a digest of the canonical form, stable across
+processes and versions of python, unlike `hash`, so caches and indexes can be keyed by schedule rather than by text.
+
+The content hash is coarser than the equality of the cronees: equal cronees have the same hash, but cronees whose `#`
+index validators only differ by the ones implied by their values, such as `0 8 * * MON` and `0 8 * * MON,MON#2`, have
+the same hash and fire at the same times while being different objects, which compare unequal.
+"""
+import hashlib
+from datetime import timedelta
+
+from .cronee import SimpleCronee, BoundIndexValidator
+from .compiler import FieldSpec, OPERATOR_JOKER, OPERATOR_RANGE, OPERATOR_STEP, OPERATOR_LIST, OPERATOR_INVERSION, \
+    OPERATOR_NEGATIVE_MODIFIER, OPERATOR_POSITIVE_MODIFIER, OPERATOR_INDEX
+from .date_sets import DateSet
+from .exceptions import CroneeValueError
+from .parser import FIELD_SPECS, SECOND_SPEC, YEAR_SPEC, MODIFIERS_RANGE
+from .timezones import NONEXISTENT_SHIFT, AMBIGUOUS_EARLIEST
+
+HASH_SIZE = 16
+ATTRIBUTE_SEPARATOR = '; '
+SECONDS_PER_DAY = 86400
+SECONDS_PER_HOUR = 3600
+SECONDS_PER_MINUTE = 60
+MAX_MODIFIER = max(MODIFIERS_RANGE)
+
+
+def canonical_expression(cronee: SimpleCronee) -> str:
+    """
+    Render the canonical expression of a cronee: the expression, in the normal form of this module, which compiles to
+    the fields, offset and index validators of the cronee.
+
+    :param cronee: the cronee
+    :return: the canonical expression, with 5 fields, 6 with a seconds field, or 7 with a years field
+    :raises: CroneeValueError, if the cronee has validators other than the `#` index ones, or fields or an offset which
+        no expression can hold.
+    """
+    if cronee.years is not None and cronee.seconds is None:
+        raise CroneeValueError("A cronee with a years field and without a seconds field has no expression")
+    days, hours, minutes, seconds = _split_offset(cronee.offset)
+    if seconds and cronee.seconds is None:
+        raise CroneeValueError(f"The offset {cronee.offset} of a cronee without a seconds field has no expression")
+    dom_days = min(abs(days), MAX_MODIFIER) * (1 if days >= 0 else -1)
+    modifiers = (minutes, hours, dom_days, 0, days - dom_days)
+    values = (cronee.minutes, cronee.hours, cronee.doms, cronee.months, cronee.dows)
+    fields = [_render_field(field_values, validators, spec) + _render_modifier(modifier)
+              for field_values, validators, spec, modifier in zip(values, cronee.other_validators, FIELD_SPECS,
+                                                                   modifiers)]
+    if cronee.seconds is not None:
+        fields.insert(0, _render_field(cronee.seconds, (), SECOND_SPEC) + _render_modifier(seconds))
+    if cronee.years is not None:
+        fields.append(_render_field(cronee.years, (), YEAR_SPEC))
+    return ' '.join(fields)
+
+
+def canonical_form(cronee: SimpleCronee) -> str:
+    """
+    Render the canonical form of a cronee: its canonical expression, followed by its timezone, its daylight saving
+    policies and a digest of its date sets, when they are set.
+
+    :param cronee: the cronee
+    :return: the canonical form. Two equal cronees have the same canonical form.
+    :raises: CroneeValueError, if the cronee has no canonical expression.
+    """
+    parts = [canonical_expression(cronee)]
+    if cronee.timezone is not None:
+        parts.append(f'timezone={getattr(cronee.timezone, "key", None) or cronee.timezone}')
+    if cronee.nonexistent != NONEXISTENT_SHIFT:
+        parts.append(f'nonexistent={cronee.nonexistent}')
+    if cronee.ambiguous != AMBIGUOUS_EARLIEST:
+        parts.append(f'ambiguous={cronee.ambiguous}')
+    if cronee.excluded_dates is not None:
+        parts.append(f'excluded_dates={_date_set_digest(cronee.excluded_dates)}')
+    if cronee.included_dates is not None:
+        parts.append(f'included_dates={_date_set_digest(cronee.included_dates)}')
+    return ATTRIBUTE_SEPARATOR.join(parts)
+
+
+def content_hash(cronee: SimpleCronee) -> str:
+    """
+    Compute a digest of the canonical form of a cronee, stable across processes. The canonical form is computed once
+    per cronee.
+
+    :param cronee: the cronee
+    :return: the digest, as 32 hexadecimal digits. Equal cronees have the same digest, but not conversely.
+    :raises: CroneeValueError, if the cronee has no canonical expression.
+    """
+    return _digest(cronee.canonical_form.encode())
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=HASH_SIZE).hexdigest()
+
+
+def _date_set_digest(dates: DateSet) -> str:
+    return _digest(','.join(map(str, dates.ordinals)).encode())
+
+
+def _split_offset(offset: timedelta) -> tuple[int, int, int, int]:
+    """ Days, hours, minutes and seconds of an offset, all with its sign """
+    total = offset // timedelta(seconds=1)
+    if total * timedelta(seconds=1) != offset:
+        raise CroneeValueError(f"The offset {offset} is not a whole number of seconds")
+    sign = 1 if total >= 0 else -1
+    days, rest = divmod(abs(total), SECONDS_PER_DAY)
+    if days > 2 * MAX_MODIFIER:
+        raise CroneeValueError(f"The offset {offset} exceeds the modifiers of the day fields")
+    hours, rest = divmod(rest, SECONDS_PER_HOUR)
+    minutes, seconds = divmod(rest, SECONDS_PER_MINUTE)
+    return sign * days, sign * hours, sign * minutes, sign * seconds
+
+
+def _render_modifier(modifier: int) -> str:
+    """ A positive offset is written with the negative modifier, which shifts the matched time forwards """
+    if modifier == 0:
+        return ''
+    return f'{OPERATOR_NEGATIVE_MODIFIER if modifier > 0 else OPERATOR_POSITIVE_MODIFIER}{abs(modifier)}'
+
+
+def _render_field(values: frozenset[int], validators: tuple, spec: FieldSpec) -> str:
+    if values == spec.valid_range:
+        return OPERATOR_JOKER
+    indexes = _render_indexes(values, validators, spec)
+    if not values:
+        return OPERATOR_LIST.join(indexes) if indexes else OPERATOR_INVERSION + OPERATOR_JOKER
+    plain = OPERATOR_LIST.join(_render_values(values, spec.valid_range) + indexes)
+    inverted = OPERATOR_INVERSION + OPERATOR_LIST.join(_render_values(spec.valid_range - values, spec.valid_range)
+                                                       + indexes)
+    return inverted if len(inverted) < len(plain) else plain
+
+
+def _render_indexes(values: frozenset[int], validators: tuple, spec: FieldSpec) -> list[str]:
+    """ Sorted `value#index` elements of the index validators, without the ones implied by the values """
+    elements = set()
+    for validator in validators:
+        if not isinstance(validator, BoundIndexValidator) or validator.function is not spec.index_validator:
+            raise CroneeValueError(f"The validator {validator!r} of the {spec.name} field has no expression")
+        if validator.values == spec.valid_range:
+            elements.add((validator.index, -1))
+        else:
+            elements.update((validator.index, value) for value in validator.values - values)
+    return [f'{OPERATOR_JOKER if value < 0 else value}{OPERATOR_INDEX}{index}'
+            for index, value in sorted(elements, key=lambda element: (element[1], element[0]))]
+
+
+def _render_values(values: frozenset[int], valid_range: frozenset[int]) -> list[str]:
+    """
+    Split sorted values into runs, from the first one: the longest arithmetic progression starting at a value is
+    written as a range when that is shorter than listing it, otherwise the value is listed alone.
+    """
+    ordered = sorted(values)
+    lowest, highest = min(valid_range), max(valid_range)
+    elements = []
+    start = 0
+    while start < len(ordered):
+        stop = start + 1
+        if stop < len(ordered):
+            step = ordered[stop] - ordered[start]
+            while stop + 1 < len(ordered) and ordered[stop + 1] - ordered[stop] == step:
+                stop += 1
+            run = _render_run(ordered[start], ordered[stop], step, lowest, highest)
+            listed = OPERATOR_LIST.join(map(str, ordered[start:stop + 1]))
+            if len(run) < len(listed):
+                elements.append(run)
+                start = stop + 1
+                continue
+        elements.append(str(ordered[start]))
+        start += 1
+    return elements
+
+
+def _render_run(first: int, last: int, step: int, lowest: int, highest: int) -> str:
+    if step > 1 and first == lowest and last + step > highest:
+        return f'{OPERATOR_JOKER}{OPERATOR_STEP}{step}'
+    run = f'{first}{OPERATOR_RANGE}{last}'
+    return run if step == 1 else f'{run}{OPERATOR_STEP}{step}'
@@ -0,0 +1,288 @@
+"""
+Single-pass compiler of the fields of the expressions.
+
+A field is read once by a lexer producing positioned tokens, parsed into a small syntax tree, then compiled into the
+values, validators and modifier of the field. The errors carry the position of the offending token, relative to the
+field. The compiled fields are cached by text, so a field shared by many expressions, such as `*`, is compiled once.
+
+Grammar of a field::
+
+    field    := ['!'] element (',' element)* [('+' | '-') value]
+    element  := value ['..' value] ['/' value]
+              | value '#' value
+    value    := number | name | '*'
+"""
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+from .cronee import IndexValidator, Validator, BoundIndexValidator
+from .exceptions import CroneeSyntaxError, CroneeValueError, CroneeAliasError, CroneeOutOfBoundError, \
+    CroneeRangeOrderError, CroneeEmptyValuesError
+
+Aliases = dict[str, set[int]]
+
+TOKEN_NUMBER = 'number'
+TOKEN_NAME = 'name'
+TOKEN_OPERATOR = 'operator'
+TOKEN_END = 'end'
+TOKEN_INVALID = 'invalid'
+
+OPERATOR_JOKER = '*'
+OPERATOR_RANGE = '..'
+OPERATOR_STEP = '/'
+OPERATOR_LIST = ','
+OPERATOR_INVERSION = '!'
+OPERATOR_NEGATIVE_MODIFIER = '-'
+OPERATOR_POSITIVE_MODIFIER = '+'
+OPERATOR_INDEX = '#'
+
+TOKEN_PATTERN = re.compile(r'(?P<number>[0-9]+)|(?P<name>[A-Za-z][A-Za-z0-9]*)|(?P<operator>\.\.|[*/,!#+-])'
+                           r'|(?P<invalid>.)', re.DOTALL)
+
+FIELD_CACHE_SIZE = 4096
+
+
+class Token(NamedTuple):
+    """A number, a name or an operator, with its position in the field"""
+
+    kind: str
+    text: str
+    position: int
+
+
+class Element(NamedTuple):
+    """An element of the list of a field: a value or a range, with a step, or a value at an index"""
+
+    start: Token
+    stop: Optional[Token] = None
+    step: Optional[Token] = None
+    index: Optional[Token] = None
+
+
+class Modifier(NamedTuple):
+    sign: str
+    value: Token
+
+
+class Field(NamedTuple):
+    """Syntax tree of a field"""
+
+    inversion: bool
+    elements: tuple[Element, ...]
+    modifier: Optional[Modifier]
+
+
+@dataclass(frozen=True, eq=False)
+class FieldSpec:
+    """Valid values, aliases and allowed constructs of a field. Specs are compared and hashed by identity."""
+
+    name: str
+    valid_range: frozenset[int]
+    aliases: Aliases
+    modifier_range: frozenset[int]
+    index_range: Optional[frozenset[int]] = None
+    index_validator: Optional[IndexValidator] = None
+    allow_empty: bool = False
+
+
+class CompiledField(NamedTuple):
+    modifier: int
+    """Offset of the field, in units of the field, to add to a datetime before matching it"""
+    validators: tuple[Validator, ...]
+    values: frozenset[int]
+
+
+def tokenize(text: str) -> list[Token]:
+    """
+    Split a field into tokens, in a single pass.
+
+    :param text: text of the field
+    :return: the tokens, followed by an end token
+    :raises: CroneeSyntaxError, at the first character which does not start a token.
+    """
+    tokens = []
+    for found in TOKEN_PATTERN.finditer(text):
+        if found.lastgroup == TOKEN_INVALID:
+            raise CroneeSyntaxError(f"Unexpected character '{found.group()}'", found.start())
+        tokens.append(Token(found.lastgroup, found.group(), found.start()))
+    tokens.append(Token(TOKEN_END, '', len(text)))
+    return tokens
+
+
+class _FieldParser:
+    """ Recursive descent parser of the tokens of a field """
+
+    def __init__(self, tokens: list[Token], spec: FieldSpec):
+        self.tokens = tokens
+        self.spec = spec
+        self.current = 0
+
+    def peek(self) -> Token:
+        return self.tokens[self.current]
+
+    def accept(self, operator: str) -> bool:
+        token = self.tokens[self.current]
+        if token.kind == TOKEN_OPERATOR and token.text == operator:
+            self.current += 1
+            return True
+        return False
+
+    def field(self) -> Field:
+        inversion = self.accept(OPERATOR_INVERSION)
+        elements = [self.element()]
+        while self.accept(OPERATOR_LIST):
+            elements.append(self.element())
+        modifier = None
+        for sign in (OPERATOR_POSITIVE_MODIFIER, OPERATOR_NEGATIVE_MODIFIER):
+            if self.accept(sign):
+                modifier = Modifier(sign, self.value())
+                break
+        token = self.peek()
+        if token.kind != TOKEN_END:
+            raise CroneeSyntaxError(f"Unexpected '{token.text}' in the {self.spec.name} field", token.position)
+        return Field(inversion, tuple(elements), modifier)
+
+    def element(self) -> Element:
+        start = self.value()
+        if self.accept(OPERATOR_INDEX):
+            if self.spec.index_range is None:
+                raise CroneeSyntaxError(f"Index is not allowed in the {self.spec.name} field",
+                                        self.tokens[self.current - 1].position)
+            return Element(start, index=self.value())
+        stop = self.value() if self.accept(OPERATOR_RANGE) else None
+        step = self.value() if self.accept(OPERATOR_STEP) else None
+        return Element(start, stop, step)
+
+    def value(self) -> Token:
+        token = self.peek()
+        if token.kind in (TOKEN_NUMBER, TOKEN_NAME) or token.text == OPERATOR_JOKER:
+            self.current += 1
+            return token
+        if token.kind == TOKEN_END:
+            raise CroneeSyntaxError(f"Missing value at the end of the {self.spec.name} field", token.position)
+        raise CroneeSyntaxError(f"Expected a value instead of '{token.text}'", token.position)
+
+
+def parse_field_tree(text: str, spec: FieldSpec) -> Field:
+    """
+    Parse a field into its syntax tree.
+
+    :param text: text of the field
+    :param spec: spec of the field
+    :return: the syntax tree of the field
+    :raises: CroneeSyntaxError, if the field does not follow the grammar.
+    """
+    return _FieldParser(tokenize(text), spec).field()
+
+
+def resolve_value(token: Token, valid_range: frozenset[int], aliases: Aliases) -> frozenset[int]:
+    """
+    Values designated by a number, an alias or the joker.
+
+    :param token: the value token
+    :param valid_range: valid values of the field
+    :param aliases: aliases of the field
+    :return: the designated values
+    :raises: CroneeOutOfBoundError, if the number is out of the valid range.
+    :raises: CroneeAliasError, if the name is not an alias.
+    """
+    if token.kind == TOKEN_NUMBER:
+        number = int(token.text)
+        if number not in valid_range:
+            raise CroneeOutOfBoundError(f"Value {token.text} is out of the valid range {min(valid_range)}.."
+                                        f"{max(valid_range)}", token.position)
+        return frozenset((number,))
+    if token.kind == TOKEN_NAME:
+        values = aliases.get(token.text)
+        if values is None:
+            raise CroneeAliasError(f"Invalid alias {token.text}", token.position)
+        return frozenset(values)
+    return valid_range
+
+
+def resolve_single(value: Token, valid_range: frozenset[int], aliases: Aliases, role: str) -> int:
+    """
+    Single value designated by a number or an alias.
+
+    :param value: the value token
+    :param valid_range: valid values of the field
+    :param aliases: aliases of the field
+    :param role: role of the value in the field, for the error message
+    :return: the designated value
+    :raises: CroneeValueError, if the token designates several values.
+    """
+    values = resolve_value(value, valid_range, aliases)
+    if len(values) != 1:
+        raise CroneeValueError(f"Invalid {role} value '{value.text}'", value.position)
+    return next(iter(values))
+
+
+def _compile_element(element: Element, spec: FieldSpec) -> tuple[Optional[Validator], frozenset[int]]:
+    valid_range, aliases = spec.valid_range, spec.aliases
+    if element.index is not None:
+        index = resolve_single(element.index, spec.index_range, {}, 'index')
+        values = resolve_value(element.start, valid_range, aliases)
+        return BoundIndexValidator(spec.index_validator, index, values), frozenset()
+
+    if element.stop is None:
+        values = resolve_value(element.start, valid_range, aliases)
+    else:
+        start = resolve_single(element.start, valid_range, aliases, 'range start')
+        stop = resolve_single(element.stop, valid_range, aliases, 'range stop')
+        if start >= stop:
+            raise CroneeRangeOrderError("The first value of a range must be less than the second one",
+                                        element.start.position)
+        values = frozenset(value for value in valid_range if start <= value <= stop)
+
+    if element.step is not None:
+        step = resolve_single(element.step, valid_range, aliases, 'step')
+        if step == 0:
+            raise CroneeValueError("The step must be strictly positive", element.step.position)
+        first = min(values)
+        values = frozenset(value for value in values if value % step == first % step)
+    return None, values
+
+
+def compile_tree(tree: Field, spec: FieldSpec) -> CompiledField:
+    """
+    Compile the syntax tree of a field into its runtime representation.
+
+    :param tree: the syntax tree of the field
+    :param spec: spec of the field
+    :return: the modifier, the dynamic validators and the values of the field
+    :raises: CroneeValueError, CroneeOutOfBoundError, CroneeAliasError or CroneeRangeOrderError, if a value is invalid.
+    :raises: CroneeEmptyValuesError, if the field has no valid value and its spec does not allow it.
+    """
+    validators = []
+    values = set()
+    for element in tree.elements:
+        validator, element_values = _compile_element(element, spec)
+        values.update(element_values)
+        if validator is not None:
+            validators.append(validator)
+    if tree.inversion:
+        values = spec.valid_range.difference(values)
+    if not values and not spec.allow_empty:
+        raise CroneeEmptyValuesError(f"No valid values for the {spec.name} field", 0)
+
+    modifier = 0
+    if tree.modifier is not None:
+        modifier = resolve_single(tree.modifier.value, spec.modifier_range, {}, 'modifier')
+        if tree.modifier.sign == OPERATOR_POSITIVE_MODIFIER:
+            modifier = -modifier
+    return CompiledField(modifier, tuple(validators), frozenset(values))
+
+
+@lru_cache(maxsize=FIELD_CACHE_SIZE)
+def compile_field(text: str, spec: FieldSpec) -> CompiledField:
+    """
+    Compile the text of a field into its runtime representation. The results are cached.
+
+    :param text: text of the field
+    :param spec: spec of the field
+    :return: the modifier, the dynamic validators and the values of the field
+    :raises: CroneeParseError, with the position of the error relative to the field, if the field is invalid.
+    """
+    return compile_tree(parse_field_tree(text, spec), spec)
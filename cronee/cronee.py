@@ -1,10 +1,37 @@
-import math
-from dataclasses import dataclass
-from datetime import timedelta, datetime
-from typing import Protocol, Callable
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from functools import lru_cache
+from datetime import timedelta, datetime, tzinfo, timezone, MINYEAR, MAXYEAR
+from weakref import WeakValueDictionary
+from itertools import islice
+from typing import Protocol, Callable, Optional, Iterator, AsyncIterator, Iterable, TYPE_CHECKING
+
+from . import instrumentation
+from .analysis import Satisfiability, analyze
+from .exceptions import CroneeValueError, CroneeSearchBudgetError, CroneeUnsatisfiableError
+from .helpers import next_month, previous_month, values_to_mask, mask_to_values, next_value_table, \
+    previous_value_table, SECONDS_PER_DAY, days_from_civil, day_fields, month_fields, ceil_minute, sub_resolution, \
+    DEFAULT_MAX_CANDIDATES, MINUTE_VALIDATORS, HOUR_VALIDATORS, DOM_VALIDATORS, MONTH_VALIDATORS, DOW_VALIDATORS
+from .calendar_tables import YearTable, year_table
+from .date_sets import DateSet
+from .timezones import NONEXISTENT_SHIFT, NONEXISTENT_POLICIES, AMBIGUOUS_EARLIEST, AMBIGUOUS_POLICIES, \
+    validate_zoned, iter_zoned_occurrences, iter_previous_zoned_occurrences
+
+if TYPE_CHECKING:
+    import numpy
 
 Validator = Callable[[datetime], bool]
 IndexValidator = Callable[[datetime, int, set[int]], bool]
+DateFields = tuple[int, int, int, int, int]
+
+EPOCH = datetime(1970, 1, 1)
+UTC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+EPOCH_ORDINAL = EPOCH.toordinal()
+ONE_SECOND = timedelta(seconds=1)
+ONE_MINUTE = timedelta(minutes=1)
+ONE_DAY = timedelta(days=1)
+MAX_YEAR_TABLES = 64
+INTERNED_VALUES_SIZE = 4096
 
 
 class Cronee(Protocol):
@@ -13,52 +40,971 @@ class Cronee(Protocol):
     def validate(self, dtime: datetime) -> bool:
         """Check if the given datetime validates the cronee"""
 
-    def next_occurrence(self, start: datetime = None) -> datetime:
+    def validate_many(self, timestamps) -> 'numpy.ndarray':
+        """Check which timestamps of a numpy array validate the cronee"""
+
+    def validate_ts(self, epoch_seconds: int) -> bool:
+        """Check if the given epoch timestamp validates the cronee"""
+
+    def next_ts(self, epoch_seconds: int, horizon: int = None) -> int:
+        """Compute the next epoch timestamp when the expression is validated, epoch_seconds included."""
+
+    def iter_ts(self, epoch_seconds: int, end: int = None) -> Iterator[int]:
+        """Lazily iterate over the epoch timestamps of the occurrences from epoch_seconds included to end excluded."""
+
+    def next_occurrence_many(self, starts) -> 'numpy.ndarray':
+        """Compute the next occurrence of each timestamp of a numpy array"""
+
+    def next_occurrence(self, start: datetime = None, horizon: timedelta = None) -> datetime:
         """Compute the next datetime when the expression is validated starting at the start parameter"""
 
     def next_occurrences(self, dtime: datetime, count: int = 10) -> list[datetime]:
         """Compute the next occurrences."""
 
+    def iter_occurrences(self, start: datetime, end: datetime = None) -> Iterator[datetime]:
+        """Lazily iterate over the occurrences from start included to end excluded."""
 
-@dataclass
+    def previous_occurrence(self, dtime: datetime, horizon: timedelta = None) -> datetime:
+        """Compute the last datetime when the expression is validated, dtime included."""
+
+    def iter_previous_occurrences(self, start: datetime, end: datetime = None) -> Iterator[datetime]:
+        """Lazily iterate backwards over the occurrences from start included to end excluded."""
+
+    def between(self, start: datetime, end: datetime) -> Iterator[datetime]:
+        """Lazily iterate over the occurrences from start included to end excluded."""
+
+    async def sleep_until_next(self) -> datetime:
+        """Sleep until the next occurrence and return it."""
+
+    def aiter_occurrences(self, start: datetime = None) -> AsyncIterator[datetime]:
+        """Asynchronously iterate over the occurrences, each one being yielded when it is due."""
+
+
+@dataclass(frozen=True, slots=True, weakref_slot=True)
 class SimpleCronee:
-    """Manage a simple cronee"""
+    """
+    Manage a simple cronee.
+
+    Instances are immutable and hashable. Two cronees are equal when their compiled fields, offset and dynamic
+    validators are equal, whatever the expressions they were parsed from.
 
-    minutes: set[int]
-    hours: set[int]
-    doms: set[int]
-    months: set[int]
-    dows: set[int]
+    Without timezone, the cronee works on naive wall times. With a timezone, it matches the wall time of the timezone
+    and returns aware datetimes: `nonexistent` tells what happens to the wall times skipped by a daylight saving
+    transition ('shift' fires at the end of the gap, 'skip' drops them), and `ambiguous` which instance of the wall
+    times repeated by a transition fires ('earliest', 'latest' or 'both').
+
+    The dates of `excluded_dates`, such as holidays, never fire, and when `included_dates` is set, only its dates fire.
+    Like the other day-level constraints, they apply to the wall time shifted by the offset.
+
+    Without `seconds`, the cronee has a resolution of one minute, and its occurrences keep the seconds of the start of
+    the search. With `seconds`, it fires at these seconds of the valid minutes. `years` restricts the valid years.
+    """
+
+    minutes: frozenset[int] = field(compare=False)
+    hours: frozenset[int] = field(compare=False)
+    doms: frozenset[int] = field(compare=False)
+    months: frozenset[int] = field(compare=False)
+    dows: frozenset[int] = field(compare=False)
     offset: timedelta
-    other_validators: list[list[Validator]]
+    other_validators: tuple[tuple[Validator, ...], ...]
+    timezone: Optional[tzinfo] = None
+    nonexistent: str = NONEXISTENT_SHIFT
+    ambiguous: str = AMBIGUOUS_EARLIEST
+    excluded_dates: Optional[DateSet] = None
+    included_dates: Optional[DateSet] = None
+    seconds: Optional[frozenset[int]] = None
+    years: Optional[frozenset[int]] = None
+
+    minute_mask: int = field(init=False, repr=False)
+    hour_mask: int = field(init=False, repr=False)
+    dom_mask: int = field(init=False, repr=False)
+    month_mask: int = field(init=False, repr=False)
+    dow_mask: int = field(init=False, repr=False)
+    second_mask: int = field(init=False, repr=False, compare=False)
+    resolution: timedelta = field(init=False, repr=False, compare=False)
+    """Smallest duration between two occurrences: one second with a seconds field, one minute otherwise"""
+    _next_minutes: tuple[Optional[int], ...] = field(init=False, repr=False, compare=False)
+    _next_hours: tuple[Optional[int], ...] = field(init=False, repr=False, compare=False)
+    _next_doms: tuple[Optional[int], ...] = field(init=False, repr=False, compare=False)
+    _next_months: tuple[Optional[int], ...] = field(init=False, repr=False, compare=False)
+    _previous_minutes: tuple[Optional[int], ...] = field(init=False, repr=False, compare=False)
+    _previous_hours: tuple[Optional[int], ...] = field(init=False, repr=False, compare=False)
+    _previous_doms: tuple[Optional[int], ...] = field(init=False, repr=False, compare=False)
+    _previous_months: tuple[Optional[int], ...] = field(init=False, repr=False, compare=False)
+    _has_validators: bool = field(init=False, repr=False, compare=False)
+    _next_seconds: tuple[Optional[int], ...] = field(init=False, repr=False, compare=False)
+    _previous_seconds: tuple[Optional[int], ...] = field(init=False, repr=False, compare=False)
+    _sorted_years: tuple[int, ...] = field(init=False, repr=False, compare=False)
+    _has_dates: bool = field(init=False, repr=False, compare=False)
+    _has_constraints: bool = field(init=False, repr=False, compare=False)
+    _date_limits: Optional[tuple[DateFields, DateFields]] = field(init=False, repr=False, compare=False)
+    _offset_seconds: int = field(init=False, repr=False, compare=False)
+    _year_tables: dict[int, YearTable] = field(init=False, repr=False, compare=False)
+    _canonical_form: Optional[str] = field(init=False, repr=False, compare=False)
+    _satisfiability: Optional[Satisfiability] = field(init=False, repr=False, compare=False)
+    wall_cronee: Optional['SimpleCronee'] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        for name in ('minutes', 'hours', 'doms', 'months', 'dows'):
+            object.__setattr__(self, name, _intern(frozenset(getattr(self, name))))
+        object.__setattr__(self, 'other_validators',
+                           _intern(tuple(tuple(validators) for validators in self.other_validators)))
+        for name in ('seconds', 'years'):
+            if getattr(self, name) is not None:
+                object.__setattr__(self, name, _intern(frozenset(getattr(self, name))))
+        object.__setattr__(self, 'minute_mask', values_to_mask(self.minutes))
+        object.__setattr__(self, 'hour_mask', values_to_mask(self.hours))
+        object.__setattr__(self, 'dom_mask', values_to_mask(self.doms))
+        object.__setattr__(self, 'month_mask', values_to_mask(self.months))
+        object.__setattr__(self, 'dow_mask', values_to_mask(self.dows))
+        object.__setattr__(self, 'second_mask', values_to_mask(self.seconds or ()))
+        object.__setattr__(self, '_satisfiability', None)
+        self._compile()
+
+    @classmethod
+    def from_masks(cls, minute_mask: int, hour_mask: int, dom_mask: int, month_mask: int, dow_mask: int,
+                   offset: timedelta, other_validators: Iterable[Iterable[Validator]],
+                   timezone: Optional[tzinfo] = None, nonexistent: str = NONEXISTENT_SHIFT,
+                   ambiguous: str = AMBIGUOUS_EARLIEST, excluded_dates: Optional[DateSet] = None,
+                   included_dates: Optional[DateSet] = None, second_mask: Optional[int] = None,
+                   years: Optional[Iterable[int]] = None,
+                   satisfiability: Optional[Satisfiability] = None) -> 'SimpleCronee':
+        """
+        Build a cronee from the bitmasks of its fields, as it is serialized and pickled. The values of the fields are
+        read from the masks instead of the masks being compiled from the values.
+
+        :param second_mask: (optional) bitmask of the seconds field, None for a cronee without seconds field
+        :param satisfiability: (optional) the static analysis of the cronee, when it is already known
+        :return: a cronee equal to the one built from the values of the masks
+        :raises: CroneeValueError, if a policy is invalid.
+        """
+        cronee = object.__new__(cls)
+        for name, mask in (('minutes', minute_mask), ('hours', hour_mask), ('doms', dom_mask), ('months', month_mask),
+                           ('dows', dow_mask)):
+            object.__setattr__(cronee, name, _intern(mask_to_values(mask)))
+            object.__setattr__(cronee, name[:-1] + '_mask', mask)
+        object.__setattr__(cronee, 'offset', offset)
+        object.__setattr__(cronee, 'other_validators',
+                           _intern(tuple(tuple(validators) for validators in other_validators)))
+        object.__setattr__(cronee, 'timezone', timezone)
+        object.__setattr__(cronee, 'nonexistent', nonexistent)
+        object.__setattr__(cronee, 'ambiguous', ambiguous)
+        object.__setattr__(cronee, 'excluded_dates', excluded_dates)
+        object.__setattr__(cronee, 'included_dates', included_dates)
+        object.__setattr__(cronee, 'seconds', None if second_mask is None else _intern(mask_to_values(second_mask)))
+        object.__setattr__(cronee, 'years', None if years is None else _intern(frozenset(years)))
+        object.__setattr__(cronee, 'second_mask', second_mask or 0)
+        object.__setattr__(cronee, '_satisfiability', satisfiability)
+        cronee._compile()
+        return cronee
+
+    def _compile(self):
+        """ Check the policies and build the tables of the search from the masks of the fields """
+        if self.nonexistent not in NONEXISTENT_POLICIES:
+            raise CroneeValueError(f"Invalid policy for nonexistent times '{self.nonexistent}'")
+        if self.ambiguous not in AMBIGUOUS_POLICIES:
+            raise CroneeValueError(f"Invalid policy for ambiguous times '{self.ambiguous}'")
+        object.__setattr__(self, 'resolution', ONE_MINUTE if self.seconds is None else ONE_SECOND)
+        # Without a seconds field, the search runs on the second 0 of the time shifted by the seconds of the start.
+        seconds_mask = 1 if self.seconds is None else self.second_mask
+        object.__setattr__(self, '_next_seconds', next_value_table(seconds_mask, 60))
+        object.__setattr__(self, '_previous_seconds', previous_value_table(seconds_mask, 60))
+        object.__setattr__(self, '_sorted_years', () if self.years is None else tuple(sorted(self.years)))
+        object.__setattr__(self, '_next_minutes', next_value_table(self.minute_mask, 60))
+        object.__setattr__(self, '_next_hours', next_value_table(self.hour_mask, 24))
+        object.__setattr__(self, '_next_doms', next_value_table(self.dom_mask, 32))
+        object.__setattr__(self, '_next_months', next_value_table(self.month_mask, 13))
+        object.__setattr__(self, '_previous_minutes', previous_value_table(self.minute_mask, 60))
+        object.__setattr__(self, '_previous_hours', previous_value_table(self.hour_mask, 24))
+        object.__setattr__(self, '_previous_doms', previous_value_table(self.dom_mask, 32))
+        object.__setattr__(self, '_previous_months', previous_value_table(self.month_mask, 13))
+        object.__setattr__(self, '_has_validators', any(self.other_validators))
+        object.__setattr__(self, '_has_dates', self.excluded_dates is not None or self.included_dates is not None)
+        object.__setattr__(self, '_has_constraints',
+                           self._has_dates or self.seconds is not None or self.years is not None)
+        object.__setattr__(self, '_date_limits', _date_limits(self.included_dates))
+        object.__setattr__(self, '_offset_seconds', self.offset // ONE_SECOND)
+        object.__setattr__(self, '_year_tables', {})
+        object.__setattr__(self, '_canonical_form', None)
+        object.__setattr__(self, 'wall_cronee', None if self.timezone is None else restore_cronee(
+            self.minute_mask, self.hour_mask, self.dom_mask, self.month_mask, self.dow_mask, self.offset,
+            self.other_validators, excluded_dates=self.excluded_dates, included_dates=self.included_dates,
+            second_mask=None if self.seconds is None else self.second_mask, years=self.years))
 
     def validate(self, dtime: datetime) -> bool:
         """ Check if the datetime is valid """
+        if instrumentation.collector is not None and not instrumentation.is_measuring():
+            return instrumentation.measure(self, 'validate', self.validate, dtime)
+        if self.wall_cronee is not None:
+            return validate_zoned(self, dtime)
         dtime = dtime + self.offset
-        minute_is_valid = dtime.minute in self.minutes or self._dynamic_validation(0, dtime)
-        hour_is_valid = dtime.hour in self.hours or self._dynamic_validation(1, dtime)
-        dom_is_valid = dtime.day in self.doms or self._dynamic_validation(2, dtime)
-        month_is_valid = dtime.month in self.months or self._dynamic_validation(3, dtime)
-        dow_is_valid = dtime.isoweekday() in self.dows or self._dynamic_validation(4, dtime)
-        return minute_is_valid and hour_is_valid and dom_is_valid and month_is_valid and dow_is_valid
+        if self._has_constraints and not self._constraints_are_valid(dtime.toordinal(), dtime.year, dtime.second):
+            return False
+        if not self._has_validators:
+            return bool(self.minute_mask >> dtime.minute
+                        & self.hour_mask >> dtime.hour
+                        & self.dom_mask >> dtime.day
+                        & self.month_mask >> dtime.month
+                        & self.dow_mask >> dtime.isoweekday()
+                        & 1)
+        minute_is_valid = self.minute_mask >> dtime.minute & 1 or self._dynamic_validation(MINUTE_VALIDATORS, dtime)
+        hour_is_valid = self.hour_mask >> dtime.hour & 1 or self._dynamic_validation(HOUR_VALIDATORS, dtime)
+        dom_is_valid = self.dom_mask >> dtime.day & 1 or self._dynamic_validation(DOM_VALIDATORS, dtime)
+        month_is_valid = self.month_mask >> dtime.month & 1 or self._dynamic_validation(MONTH_VALIDATORS, dtime)
+        dow_is_valid = self.dow_mask >> dtime.isoweekday() & 1 or self._dynamic_validation(DOW_VALIDATORS, dtime)
+        return bool(minute_is_valid and hour_is_valid and dom_is_valid and month_is_valid and dow_is_valid)
+
+    def validate_many(self, timestamps) -> 'numpy.ndarray':
+        """
+        Check which timestamps of an array validate the cronee. Requires numpy.
+
+        :param timestamps: array of numpy.datetime64 or array of epoch seconds
+        :return: a boolean numpy array, True where the timestamp validates the cronee
+        """
+        from .vectorized import validate_many
+        return validate_many(self, timestamps)
+
+    def validate_ts(self, epoch_seconds: int) -> bool:
+        """
+        Check if an epoch timestamp is valid, decomposing it with integer arithmetic instead of building a datetime.
+
+        A naive cronee reads the timestamp as a UTC wall time. Zoned cronees and cronees with dynamic validators, which
+        need datetimes, fall back to validate.
+
+        :param epoch_seconds: number of seconds since 1970-01-01 00:00 UTC
+        :return: True if the timestamp validates the cronee
+        """
+        if instrumentation.collector is not None and not instrumentation.is_measuring():
+            return instrumentation.measure(self, 'validate_ts', self.validate_ts, epoch_seconds)
+        if self.wall_cronee is not None:
+            return self.validate(UTC_EPOCH + timedelta(seconds=epoch_seconds))
+        if self._has_validators:
+            return self.validate(EPOCH + timedelta(seconds=epoch_seconds))
+        days, seconds = divmod(epoch_seconds + self._offset_seconds, SECONDS_PER_DAY)
+        year, month, day, isoweekday = day_fields(days)
+        if self._has_constraints and not self._constraints_are_valid(days + EPOCH_ORDINAL, year, seconds % 60):
+            return False
+        return bool(self.minute_mask >> (seconds // 60 % 60)
+                    & self.hour_mask >> (seconds // 3600)
+                    & self.dom_mask >> day
+                    & self.month_mask >> month
+                    & self.dow_mask >> isoweekday
+                    & 1)
+
+    def next_ts(self, epoch_seconds: int, horizon: int = None, max_candidates: int = DEFAULT_MAX_CANDIDATES) -> int:
+        """
+        Compute the first epoch timestamp, epoch_seconds included, that validates the cronee.
+
+        The field-skipping search runs on the integer fields of the timestamp, so no datetime is built unless a dynamic
+        validator needs one. A naive cronee reads the timestamp as a UTC wall time.
+
+        :param epoch_seconds: number of seconds since 1970-01-01 00:00 UTC from which the search starts
+        :param horizon: (optional) number of seconds after epoch_seconds beyond which the search gives up
+        :param max_candidates: maximum number of candidates examined by the search
+        :return: the next valid timestamp, with the same seconds within the minute as epoch_seconds
+        :raises: CroneeSearchBudgetError, if no occurrence is found within the horizon or the budget of candidates.
+        :raises: CroneeUnsatisfiableError, if the cronee is proven to never fire.
+        """
+        end = None if horizon is None else epoch_seconds + horizon
+        occurrence = next(self.iter_ts(epoch_seconds, end, max_candidates), None)
+        if occurrence is None:
+            raise CroneeSearchBudgetError(f"No occurrence within {horizon} seconds after {epoch_seconds}")
+        return occurrence
+
+    def iter_ts(self, epoch_seconds: int, end: int = None,
+                max_candidates: int = DEFAULT_MAX_CANDIDATES) -> Iterator[int]:
+        """
+        Lazily iterate over the epoch timestamps validating the cronee, from epoch_seconds included to end excluded.
+
+        :param epoch_seconds: number of seconds since 1970-01-01 00:00 UTC from which the search starts
+        :param end: (optional) epoch timestamp at which the iteration stops. If not provided, it never stops.
+        :param max_candidates: maximum number of candidates examined by the search of each occurrence
+        :return: an iterator over the valid timestamps, with the same seconds within the minute as epoch_seconds
+        :raises: CroneeSearchBudgetError, while iterating, if the search of an occurrence exhausts its budget.
+        :raises: CroneeUnsatisfiableError, if the cronee is proven to never fire and no end is provided.
+        """
+        if self._never_fires(end):
+            return iter(())
+        if self.wall_cronee is not None:
+            return self._iter_zoned_ts(epoch_seconds, end, max_candidates)
+        return self._iter_wall_ts(epoch_seconds, end, max_candidates)
+
+    def _iter_wall_ts(self, epoch_seconds: int, end: Optional[int], max_candidates: int) -> Iterator[int]:
+        days, seconds = divmod(epoch_seconds + self._offset_seconds, SECONDS_PER_DAY)
+        second = seconds % 60
+        if self.seconds is None:
+            shift, second = second - self._offset_seconds, 0
+        else:
+            shift = -self._offset_seconds
+        year, month, day, _ = day_fields(days)
+        fields = (year, month, day, seconds // 3600, seconds // 60 % 60)
+        limit = None
+        if end is not None:
+            limit_days, limit_seconds = divmod(-((shift - end) // 60) * 60, SECONDS_PER_DAY)
+            limit = day_fields(limit_days)[:3] + (limit_seconds // 3600, limit_seconds // 60 % 60)
+        while True:
+            if instrumentation.collector is None:
+                found = self._next_fields(fields, limit, max_candidates)
+            else:
+                found = instrumentation.measure(self, 'next', self._next_fields, fields, limit, max_candidates)
+            if found is None:
+                return
+            if found != fields:
+                fields, second = found, 0
+            year, month, day, hour, minute = fields
+            minute_start = days_from_civil(year, month, day) * SECONDS_PER_DAY + hour * 3600 + minute * 60 + shift
+            second = self._next_seconds[second]
+            while second is not None:
+                occurrence = minute_start + second
+                if end is not None and occurrence >= end:
+                    return
+                yield occurrence
+                second = self._next_seconds[second + 1]
+            fields, second = self._next_minute(fields), 0
+
+    def _iter_zoned_ts(self, epoch_seconds: int, end: Optional[int], max_candidates: int) -> Iterator[int]:
+        start = UTC_EPOCH + timedelta(seconds=epoch_seconds)
+        end = None if end is None else UTC_EPOCH + timedelta(seconds=end)
+        for occurrence in self.iter_occurrences(start, end, max_candidates):
+            yield (occurrence - UTC_EPOCH) // ONE_SECOND
+
+    def next_occurrence_many(self, starts) -> 'numpy.ndarray':
+        """
+        Compute the next occurrence of each timestamp of an array. Requires numpy.
+
+        :param starts: array, sorted or not, of numpy.datetime64 or of epoch seconds
+        :return: a numpy array of the same kind as starts, holding the next valid timestamp of each start
+        """
+        from .vectorized import next_occurrence_many
+        return next_occurrence_many(self, starts)
 
     def _dynamic_validation(self, index: int, dtime: datetime) -> bool:
-        return any(map(lambda v: v(dtime), self.other_validators[index]))
+        for validator in self.other_validators[index]:
+            if instrumentation.collector is not None:
+                instrumentation.count_validator_call(index)
+            if validator(dtime):
+                return True
+        return False
+
+    def next_occurrence(self, dtime: datetime, horizon: timedelta = None,
+                        max_candidates: int = DEFAULT_MAX_CANDIDATES) -> datetime:
+        """
+        Compute the first datetime, starting at dtime included, that validates the cronee.
 
-    def next_occurrence(self, dtime: datetime) -> datetime:
-        delta = timedelta(minutes=1)
-        while not self.validate(dtime):
-            dtime += delta
-        return dtime
+        The search jumps to the next valid month, then day, hour and minute instead of walking minute by minute. The
+        dynamic validators of a field are only evaluated at the granularity of that field.
+
+        :param dtime: datetime from which the search starts
+        :param horizon: (optional) duration after dtime beyond which the search gives up
+        :param max_candidates: maximum number of candidates examined by the search
+        :return: the next valid datetime, with the same seconds and microseconds as dtime
+        :raises: CroneeSearchBudgetError, if no occurrence is found within the horizon or the budget of candidates.
+        :raises: CroneeUnsatisfiableError, if the cronee is proven to never fire.
+        """
+        end = None if horizon is None else dtime + horizon
+        occurrence = next(self.iter_occurrences(dtime, end, max_candidates), None)
+        if occurrence is None:
+            raise CroneeSearchBudgetError(f"No occurrence within {horizon} after {dtime}")
+        return occurrence
 
     def next_occurrences(self, dtime: datetime, count: int = 10) -> list[datetime]:
-        delta = timedelta(minutes=1)
-        occurrences = []
-        for i in range(count):
-            dtime = self.next_occurrence(dtime)
-            occurrences.append(dtime)
-            dtime = dtime + delta
-        return occurrences
+        return list(islice(self.iter_occurrences(dtime), count))
+
+    def iter_occurrences(self, start: datetime, end: datetime = None,
+                         max_candidates: int = DEFAULT_MAX_CANDIDATES) -> Iterator[datetime]:
+        """
+        Lazily iterate over the datetimes validating the cronee, from start included to end excluded.
+
+        The iterator keeps the fields of the last occurrence as a cursor and resumes the search from the following
+        minute, so each occurrence costs a single field-skipping search. The search stops at end even when no
+        occurrence is found before it.
+
+        :param start: datetime from which the search starts
+        :param end: (optional) datetime at which the iteration stops. If not provided, the iteration never stops.
+        :param max_candidates: maximum number of candidates examined by the search of each occurrence
+        :return: an iterator over the valid datetimes, with the same seconds and microseconds as start
+        :raises: CroneeSearchBudgetError, while iterating, if the search of an occurrence exhausts its budget.
+        :raises: CroneeUnsatisfiableError, if the cronee is proven to never fire and no end is provided.
+        """
+        if self._never_fires(end):
+            return iter(())
+        if self.wall_cronee is not None:
+            return iter_zoned_occurrences(self, start, end, max_candidates)
+        return self._iter_wall_occurrences(start, end, max_candidates)
+
+    def _iter_wall_occurrences(self, start: datetime, end: Optional[datetime],
+                               max_candidates: int) -> Iterator[datetime]:
+        remainder = sub_resolution(start, self.resolution)
+        shifted = start + self.offset - remainder
+        shift = remainder - self.offset
+        fields = (shifted.year, shifted.month, shifted.day, shifted.hour, shifted.minute)
+        second = shifted.second
+        limit = None
+        if end is not None:
+            limit_time = ceil_minute(end - shift)
+            limit = (limit_time.year, limit_time.month, limit_time.day, limit_time.hour, limit_time.minute)
+        while True:
+            if instrumentation.collector is None:
+                found = self._next_fields(fields, limit, max_candidates)
+            else:
+                found = instrumentation.measure(self, 'next', self._next_fields, fields, limit, max_candidates)
+            if found is None:
+                return
+            if found != fields:
+                fields, second = found, 0
+            year, month, day, hour, minute = fields
+            second = self._next_seconds[second]
+            while second is not None:
+                occurrence = shifted.replace(year=year, month=month, day=day, hour=hour, minute=minute,
+                                             second=second) + shift
+                if end is not None and occurrence >= end:
+                    return
+                yield occurrence
+                second = self._next_seconds[second + 1]
+            fields, second = self._next_minute(fields), 0
+
+    def between(self, start: datetime, end: datetime) -> Iterator[datetime]:
+        """
+        Lazily iterate over the datetimes validating the cronee, from start included to end excluded.
+
+        :param start: datetime from which the search starts
+        :param end: datetime at which the iteration stops
+        :return: an iterator over the valid datetimes
+        """
+        return self.iter_occurrences(start, end)
+
+    def previous_occurrence(self, dtime: datetime, horizon: timedelta = None,
+                            max_candidates: int = DEFAULT_MAX_CANDIDATES) -> datetime:
+        """
+        Compute the last datetime, before dtime or equal to it, that validates the cronee.
+
+        :param dtime: datetime from which the search starts, backwards
+        :param horizon: (optional) duration before dtime beyond which the search gives up
+        :param max_candidates: maximum number of candidates examined by the search
+        :return: the previous valid datetime, with the same seconds and microseconds as dtime
+        :raises: CroneeSearchBudgetError, if no occurrence is found within the horizon or the budget of candidates.
+        :raises: CroneeUnsatisfiableError, if the cronee is proven to never fire.
+        """
+        end = None if horizon is None else dtime - horizon
+        occurrence = next(self.iter_previous_occurrences(dtime, end, max_candidates), None)
+        if occurrence is None:
+            raise CroneeSearchBudgetError(f"No occurrence within {horizon} before {dtime}")
+        return occurrence
+
+    def previous_occurrences(self, dtime: datetime, count: int = 10) -> list[datetime]:
+        return list(islice(self.iter_previous_occurrences(dtime), count))
+
+    def iter_previous_occurrences(self, start: datetime, end: datetime = None,
+                                  max_candidates: int = DEFAULT_MAX_CANDIDATES) -> Iterator[datetime]:
+        """
+        Lazily iterate backwards over the datetimes validating the cronee, from start included to end excluded.
+
+        :param start: datetime from which the search starts, backwards
+        :param end: (optional) datetime, before start, at which the iteration stops. If not provided, the iteration
+            never stops.
+        :param max_candidates: maximum number of candidates examined by the search of each occurrence
+        :return: an iterator over the valid datetimes, latest first, with the same seconds and microseconds as start
+        :raises: CroneeSearchBudgetError, while iterating, if the search of an occurrence exhausts its budget.
+        :raises: CroneeUnsatisfiableError, if the cronee is proven to never fire and no end is provided.
+        """
+        if self._never_fires(end):
+            return iter(())
+        if self.wall_cronee is not None:
+            return iter_previous_zoned_occurrences(self, start, end, max_candidates)
+        return self._iter_previous_wall_occurrences(start, end, max_candidates)
+
+    def _iter_previous_wall_occurrences(self, start: datetime, end: Optional[datetime],
+                                        max_candidates: int) -> Iterator[datetime]:
+        remainder = sub_resolution(start, self.resolution)
+        shifted = start + self.offset - remainder
+        shift = remainder - self.offset
+        fields = (shifted.year, shifted.month, shifted.day, shifted.hour, shifted.minute)
+        second = shifted.second
+        limit = None
+        if end is not None:
+            limit_time = end - shift - ONE_MINUTE if self.seconds is not None else end - shift
+            limit = (limit_time.year, limit_time.month, limit_time.day, limit_time.hour, limit_time.minute)
+        while True:
+            if instrumentation.collector is None:
+                found = self._previous_fields(fields, limit, max_candidates)
+            else:
+                found = instrumentation.measure(self, 'previous', self._previous_fields, fields, limit,
+                                                max_candidates)
+            if found is None:
+                return
+            if found != fields:
+                fields, second = found, 59
+            year, month, day, hour, minute = fields
+            second = self._previous_seconds[second]
+            while second is not None:
+                occurrence = shifted.replace(year=year, month=month, day=day, hour=hour, minute=minute,
+                                             second=second) + shift
+                if end is not None and occurrence <= end:
+                    return
+                yield occurrence
+                second = self._previous_seconds[second - 1] if second else None
+            fields, second = self._previous_minute(fields), 59
+
+    async def sleep_until_next(self, clock: Callable[[], datetime] = datetime.now) -> datetime:
+        """
+        Sleep, without blocking the event loop, until the next occurrence starting at the next step of the resolution.
+
+        :param clock: (optional) function returning the current datetime. Defaults to datetime.now.
+        :return: the datetime of the occurrence
+        """
+        from .aio import sleep_until_next
+        return await sleep_until_next(self, clock)
+
+    def aiter_occurrences(self, start: datetime = None,
+                          clock: Callable[[], datetime] = datetime.now) -> AsyncIterator[datetime]:
+        """
+        Asynchronously iterate over the occurrences, each one being yielded when it is due.
+
+        :param start: (optional) datetime from which the occurrences are computed. Defaults to the next step of the
+            resolution.
+        :param clock: (optional) function returning the current datetime. Defaults to datetime.now.
+        :return: an asynchronous iterator over the occurrences
+        """
+        from .aio import aiter_occurrences
+        return aiter_occurrences(self, start, clock)
+
+    def __or__(self, other: Cronee) -> Cronee:
+        """ Cronee firing when this cronee or the other one fires """
+        from .algebra import is_cronee, union
+        return union(self, other) if is_cronee(other) else NotImplemented
+
+    def __and__(self, other: Cronee) -> Cronee:
+        """ Cronee firing when both this cronee and the other one fire """
+        from .algebra import is_cronee, intersection
+        return intersection(self, other) if is_cronee(other) else NotImplemented
+
+    def __sub__(self, other: Cronee) -> Cronee:
+        """ Cronee firing when this cronee fires but not the other one """
+        from .algebra import is_cronee, difference
+        return difference(self, other) if is_cronee(other) else NotImplemented
+
+    @property
+    def satisfiability(self) -> Satisfiability:
+        """ Static analysis of the cronee, computed on first use: whether it can fire, and its period """
+        if self._satisfiability is None:
+            object.__setattr__(self, '_satisfiability', analyze(self))
+        return self._satisfiability
+
+    @property
+    def canonical_expression(self) -> str:
+        """
+        The canonical expression of the cronee, shared by every spelling of its fields and offset. See cronee.canonical.
+
+        :raises: CroneeValueError, if the cronee has dynamic validators other than the `#` index ones.
+        """
+        from .canonical import canonical_expression
+        return canonical_expression(self)
+
+    @property
+    def canonical_form(self) -> str:
+        """
+        The canonical expression followed by the timezone, the policies and a digest of the date sets, computed once.
+
+        :raises: CroneeValueError, if the cronee has dynamic validators other than the `#` index ones.
+        """
+        if self._canonical_form is None:
+            from .canonical import canonical_form
+            object.__setattr__(self, '_canonical_form', canonical_form(self))
+        return self._canonical_form
+
+    @property
+    def content_hash(self) -> str:
+        """
+        Digest of the canonical form, stable across processes, to key caches and indexes by schedule. Equal cronees
+        have the same digest, but cronees with redundant `#` index validators share the digest of the cronee without
+        them while comparing unequal to it.
+
+        :raises: CroneeValueError, if the cronee has dynamic validators other than the `#` index ones.
+        """
+        from .canonical import content_hash
+        return content_hash(self)
+
+    def __reduce__(self):
+        """
+        Pickle the masks of the fields and the analysis when it is known, without the tables and caches, which are
+        restored from cached lookups. The cronee is interned when it is unpickled.
+        """
+        return restore_cronee, (self.minute_mask, self.hour_mask, self.dom_mask, self.month_mask, self.dow_mask,
+                                self.offset, self.other_validators, self.timezone, self.nonexistent, self.ambiguous,
+                                self.excluded_dates, self.included_dates,
+                                None if self.seconds is None else self.second_mask, self.years, self._satisfiability)
+
+    def _constraints_are_valid(self, ordinal: int, year: int, second: int) -> bool:
+        """ Check the seconds, the years, and the date against the excluded and included dates with binary searches """
+        if self.seconds is not None and not self.second_mask >> second & 1:
+            return False
+        if self.years is not None and year not in self.years:
+            return False
+        if self.excluded_dates is not None and self.excluded_dates.contains_ordinal(ordinal):
+            return False
+        return self.included_dates is None or self.included_dates.contains_ordinal(ordinal)
+
+    def _never_fires(self, end) -> bool:
+        """ Check the static analysis before a search: True if the search is pointless and can stop at once """
+        if self.satisfiability.satisfiable is not False:
+            return False
+        if end is None:
+            raise CroneeUnsatisfiableError(f"{self!r} never fires")
+        return True
+
+    def _next_fields(self, start: DateFields, limit: Optional[DateFields] = None,
+                     max_candidates: int = DEFAULT_MAX_CANDIDATES) -> Optional[DateFields]:
+        """
+        Find the first valid fields, start included, in the shifted time (offset already applied). Return None when the
+        search reaches the limit, excluded.
+        """
+        year, month, day, hour, minute = start
+        if self._date_limits is not None and (limit is None or limit > self._date_limits[0]):
+            limit = self._date_limits[0]
+        candidates = 0
+        while True:
+            candidates += 1
+            if limit is not None and (year, month, day, hour, minute) >= limit:
+                if instrumentation.collector is not None:
+                    instrumentation.count_candidates(candidates)
+                return None
+            if candidates > max_candidates:
+                raise CroneeSearchBudgetError(f"No occurrence found within {max_candidates} candidates from {start}")
+            if self.years is not None and year not in self.years:
+                index = bisect_right(self._sorted_years, year)
+                if index == len(self._sorted_years):
+                    if instrumentation.collector is not None:
+                        instrumentation.count_candidates(candidates)
+                    return None
+                year, month, day, hour, minute = self._sorted_years[index], 1, 1, 0, 0
+                continue
+            if not self._month_is_valid(year, month):
+                year, month = self._next_valid_month(year, month)
+                day, hour, minute = 1, 0, 0
+                continue
+
+            valid_day = self._first_valid_day(year, month, day)
+            if valid_day is None:
+                year, month = next_month(year, month)
+                day, hour, minute = 1, 0, 0
+                continue
+            if valid_day != day:
+                day, hour, minute = valid_day, 0, 0
+
+            valid_hour = self._first_valid_hour(year, month, day, hour)
+            if valid_hour is None:
+                year, month, day = self._next_day(year, month, day)
+                hour, minute = 0, 0
+                continue
+            if valid_hour != hour:
+                hour, minute = valid_hour, 0
+
+            valid_minute = self._first_valid_minute(year, month, day, hour, minute)
+            if valid_minute is None:
+                if hour == 23:
+                    year, month, day = self._next_day(year, month, day)
+                    hour, minute = 0, 0
+                else:
+                    hour, minute = hour + 1, 0
+                continue
+            if instrumentation.collector is not None:
+                instrumentation.count_candidates(candidates)
+            return year, month, day, hour, valid_minute
+
+    def _previous_fields(self, start: DateFields, limit: Optional[DateFields] = None,
+                         max_candidates: int = DEFAULT_MAX_CANDIDATES) -> Optional[DateFields]:
+        """
+        Find the last valid fields, start included, in the shifted time (offset already applied). Return None when the
+        search reaches the limit, excluded.
+        """
+        year, month, day, hour, minute = start
+        if self._date_limits is not None and (limit is None or limit < self._date_limits[1]):
+            limit = self._date_limits[1]
+        candidates = 0
+        while True:
+            candidates += 1
+            if limit is not None and (year, month, day, hour, minute) <= limit:
+                if instrumentation.collector is not None:
+                    instrumentation.count_candidates(candidates)
+                return None
+            if candidates > max_candidates:
+                raise CroneeSearchBudgetError(f"No occurrence found within {max_candidates} candidates from {start}")
+            if self.years is not None and year not in self.years:
+                index = bisect_left(self._sorted_years, year)
+                if index == 0:
+                    if instrumentation.collector is not None:
+                        instrumentation.count_candidates(candidates)
+                    return None
+                year, month, day, hour, minute = self._sorted_years[index - 1], 12, 31, 23, 59
+                continue
+            if not self._month_is_valid(year, month):
+                year, month = self._previous_valid_month(year, month)
+                day, hour, minute = month_fields(year, month)[2], 23, 59
+                continue
+
+            valid_day = self._last_valid_day(year, month, day)
+            if valid_day is None:
+                year, month = previous_month(year, month)
+                day, hour, minute = month_fields(year, month)[2], 23, 59
+                continue
+            if valid_day != day:
+                day, hour, minute = valid_day, 23, 59
+
+            valid_hour = self._last_valid_hour(year, month, day, hour)
+            if valid_hour is None:
+                year, month, day = self._previous_day(year, month, day)
+                hour, minute = 23, 59
+                continue
+            if valid_hour != hour:
+                hour, minute = valid_hour, 59
+
+            valid_minute = self._last_valid_minute(year, month, day, hour, minute)
+            if valid_minute is None:
+                if hour == 0:
+                    year, month, day = self._previous_day(year, month, day)
+                    hour, minute = 23, 59
+                else:
+                    hour, minute = hour - 1, 59
+                continue
+            if instrumentation.collector is not None:
+                instrumentation.count_candidates(candidates)
+            return year, month, day, hour, valid_minute
+
+    @classmethod
+    def _next_minute(cls, fields: DateFields) -> DateFields:
+        year, month, day, hour, minute = fields
+        if minute < 59:
+            return year, month, day, hour, minute + 1
+        if hour < 23:
+            return year, month, day, hour + 1, 0
+        return cls._next_day(year, month, day) + (0, 0)
+
+    @staticmethod
+    def _next_day(year: int, month: int, day: int) -> tuple[int, int, int]:
+        if day < month_fields(year, month)[2]:
+            return year, month, day + 1
+        year, month = next_month(year, month)
+        return year, month, 1
+
+    @classmethod
+    def _previous_minute(cls, fields: DateFields) -> DateFields:
+        year, month, day, hour, minute = fields
+        if minute > 0:
+            return year, month, day, hour, minute - 1
+        if hour > 0:
+            return year, month, day, hour - 1, 59
+        return cls._previous_day(year, month, day) + (23, 59)
+
+    @staticmethod
+    def _previous_day(year: int, month: int, day: int) -> tuple[int, int, int]:
+        if day > 1:
+            return year, month, day - 1
+        year, month = previous_month(year, month)
+        return year, month, month_fields(year, month)[2]
+
+    def _month_is_valid(self, year: int, month: int) -> bool:
+        if self.month_mask >> month & 1:
+            return True
+        return bool(self.other_validators[MONTH_VALIDATORS]) and \
+            self._dynamic_validation(MONTH_VALIDATORS, datetime(year, month, 1))
+
+    def _next_valid_month(self, year: int, month: int) -> tuple[int, int]:
+        if not self.other_validators[MONTH_VALIDATORS]:
+            valid_month = self._next_months[month + 1]
+            if valid_month is not None:
+                return year, valid_month
+            return year + 1, self._next_months[1]
+        return next_month(year, month)
+
+    def _previous_valid_month(self, year: int, month: int) -> tuple[int, int]:
+        if not self.other_validators[MONTH_VALIDATORS]:
+            valid_month = self._previous_months[month - 1]
+            if valid_month is not None:
+                return year, valid_month
+            return year - 1, self._previous_months[12]
+        return previous_month(year, month)
+
+    def _year_table(self, year: int) -> YearTable:
+        """ Table of the valid days of the year, shared by the cronees with the same day-level constraints """
+        table = self._year_tables.get(year)
+        if table is None:
+            if len(self._year_tables) >= MAX_YEAR_TABLES:
+                self._year_tables.clear()
+            table = self._year_tables[year] = year_table(
+                self.dom_mask, self.month_mask, self.dow_mask, self.other_validators[DOM_VALIDATORS],
+                self.other_validators[MONTH_VALIDATORS], self.other_validators[DOW_VALIDATORS], year)
+            if self._has_dates:
+                table = self._year_tables[year] = table._replace(days=self._date_mask(year, table.days))
+        return table
+
+    def _date_mask(self, year: int, days: int) -> int:
+        """ Apply the excluded and included dates to the bitmap of the valid days of a year """
+        if self.excluded_dates is not None:
+            days &= ~self.excluded_dates.year_mask(year)
+        if self.included_dates is not None:
+            days &= self.included_dates.year_mask(year)
+        return days
+
+    def _first_valid_day(self, year: int, month: int, day: int) -> Optional[int]:
+        table = self._year_tables.get(year) or self._year_table(year)
+        return table.first_valid_day(month, day)
+
+    def _last_valid_day(self, year: int, month: int, day: int) -> Optional[int]:
+        table = self._year_tables.get(year) or self._year_table(year)
+        return table.last_valid_day(month, day)
+
+    def _first_valid_hour(self, year: int, month: int, day: int, hour: int) -> Optional[int]:
+        if not self.other_validators[HOUR_VALIDATORS]:
+            return self._next_hours[hour]
+        for candidate in range(hour, 24):
+            if self.hour_mask >> candidate & 1 or \
+                    self._dynamic_validation(HOUR_VALIDATORS, datetime(year, month, day, candidate)):
+                return candidate
+        return None
+
+    def _first_valid_minute(self, year: int, month: int, day: int, hour: int, minute: int) -> Optional[int]:
+        if not self.other_validators[MINUTE_VALIDATORS]:
+            return self._next_minutes[minute]
+        for candidate in range(minute, 60):
+            if self.minute_mask >> candidate & 1 or \
+                    self._dynamic_validation(MINUTE_VALIDATORS, datetime(year, month, day, hour, candidate)):
+                return candidate
+        return None
+
+    def _last_valid_hour(self, year: int, month: int, day: int, hour: int) -> Optional[int]:
+        if not self.other_validators[HOUR_VALIDATORS]:
+            return self._previous_hours[hour]
+        for candidate in range(hour, -1, -1):
+            if self.hour_mask >> candidate & 1 or \
+                    self._dynamic_validation(HOUR_VALIDATORS, datetime(year, month, day, candidate)):
+                return candidate
+        return None
+
+    def _last_valid_minute(self, year: int, month: int, day: int, hour: int, minute: int) -> Optional[int]:
+        if not self.other_validators[MINUTE_VALIDATORS]:
+            return self._previous_minutes[minute]
+        for candidate in range(minute, -1, -1):
+            if self.minute_mask >> candidate & 1 or \
+                    self._dynamic_validation(MINUTE_VALIDATORS, datetime(year, month, day, hour, candidate)):
+                return candidate
+        return None
+
+
+def _date_limits(included_dates: Optional[DateSet]) -> Optional[tuple[DateFields, DateFields]]:
+    """ Fields beyond which a cronee restricted to the included dates never fires, forwards and backwards """
+    if included_dates is None:
+        return None
+    if not included_dates:
+        return (MINYEAR, 1, 1, 0, 0), (MAXYEAR, 12, 31, 23, 59)
+    after, before = included_dates.last + ONE_DAY, included_dates.first - ONE_DAY
+    return (after.year, after.month, after.day, 0, 0), (before.year, before.month, before.day, 23, 59)
+
+
+def resolution_of(cronee: Cronee) -> timedelta:
+    """
+    Smallest duration between two occurrences of a cronee.
+
+    :param cronee: the cronee
+    :return: the resolution of the cronee, one minute for the implementations which do not tell theirs
+    """
+    return getattr(cronee, 'resolution', ONE_MINUTE)
+
+
+_interned_cronees: WeakValueDictionary = WeakValueDictionary()
+_interned_fields: WeakValueDictionary = WeakValueDictionary()
+
+
+@lru_cache(maxsize=INTERNED_VALUES_SIZE)
+def _intern(value):
+    """
+    Share the field values between the cronees to keep the memory footprint of each instance small. The cache returns
+    the first value equal to the given one, and only keeps the most recently used values.
+    """
+    return value
+
+
+def intern_cronee(cronee: SimpleCronee) -> SimpleCronee:
+    """
+    Return the canonical instance of a cronee, so that identical schedules share one object. The table of the
+    interned cronees only references them weakly: a cronee is dropped from it once it is no longer used.
+
+    :param cronee: the cronee to intern
+    :return: an instance equal to the given cronee, shared with every previous call for an equal cronee still alive
+    """
+    return _interned_cronees.setdefault(_identity(cronee), cronee)
+
+
+def _identity(cronee: SimpleCronee) -> tuple:
+    """ Key of the interned cronees, made of the compared fields, so the table does not keep the cronees alive """
+    return (cronee.offset, cronee.other_validators, cronee.timezone, cronee.nonexistent, cronee.ambiguous,
+            cronee.excluded_dates, cronee.included_dates, cronee.seconds, cronee.years, cronee.minute_mask,
+            cronee.hour_mask, cronee.dom_mask, cronee.month_mask, cronee.dow_mask)
+
+
+def build_cronee(minutes: Iterable[int], hours: Iterable[int], doms: Iterable[int], months: Iterable[int],
+                 dows: Iterable[int], offset: timedelta, other_validators: Iterable[Iterable[Validator]],
+                 timezone: Optional[tzinfo] = None, nonexistent: str = NONEXISTENT_SHIFT,
+                 ambiguous: str = AMBIGUOUS_EARLIEST, excluded_dates: Optional[DateSet] = None,
+                 included_dates: Optional[DateSet] = None, seconds: Optional[Iterable[int]] = None,
+                 years: Optional[Iterable[int]] = None) -> SimpleCronee:
+    """
+    Return the interned cronee of the fields. The interned cronees are looked up by their fields first, so the masks
+    and tables of a cronee are only built when no cronee with the same fields is alive.
+
+    :return: an instance equal to SimpleCronee called with the same arguments, shared with every previous call for an
+        equal cronee
+    :raises: CroneeValueError, if a policy is invalid.
+    """
+    key = (frozenset(minutes), frozenset(hours), frozenset(doms), frozenset(months), frozenset(dows), offset,
+           tuple(tuple(validators) for validators in other_validators), timezone, nonexistent, ambiguous,
+           excluded_dates, included_dates, None if seconds is None else frozenset(seconds),
+           None if years is None else frozenset(years))
+    cronee = _interned_fields.get(key)
+    if cronee is None:
+        cronee = intern_cronee(SimpleCronee(*key))
+        _interned_fields[key] = cronee
+    return cronee
+
+
+def restore_cronee(minute_mask: int, hour_mask: int, dom_mask: int, month_mask: int, dow_mask: int, offset: timedelta,
+                   other_validators: Iterable[Iterable[Validator]], timezone: Optional[tzinfo] = None,
+                   nonexistent: str = NONEXISTENT_SHIFT, ambiguous: str = AMBIGUOUS_EARLIEST,
+                   excluded_dates: Optional[DateSet] = None, included_dates: Optional[DateSet] = None,
+                   second_mask: Optional[int] = None, years: Optional[Iterable[int]] = None,
+                   satisfiability: Optional[Satisfiability] = None) -> SimpleCronee:
+    """
+    Return the interned cronee of the masks of its fields, like build_cronee. A cronee which is not alive is built
+    with SimpleCronee.from_masks.
+
+    :return: an instance equal to SimpleCronee.from_masks called with the same arguments, shared with every previous
+        call for an equal cronee still alive
+    :raises: CroneeValueError, if a policy is invalid.
+    """
+    other_validators = tuple(tuple(validators) for validators in other_validators)
+    years = None if years is None else frozenset(years)
+    key = (mask_to_values(minute_mask), mask_to_values(hour_mask), mask_to_values(dom_mask),
+           mask_to_values(month_mask), mask_to_values(dow_mask), offset, other_validators, timezone, nonexistent,
+           ambiguous, excluded_dates, included_dates, None if second_mask is None else mask_to_values(second_mask),
+           years)
+    cronee = _interned_fields.get(key)
+    if cronee is None:
+        cronee = intern_cronee(SimpleCronee.from_masks(
+            minute_mask, hour_mask, dom_mask, month_mask, dow_mask, offset, other_validators, timezone, nonexistent,
+            ambiguous, excluded_dates, included_dates, second_mask, years, satisfiability))
+        _interned_fields[key] = cronee
+    return cronee
+
+
+@dataclass(frozen=True, slots=True)
+class BoundIndexValidator:
+    """Validator binding an index validator to its index and values. Unlike a partial, it compares by value."""
+
+    function: IndexValidator
+    index: int
+    values: frozenset[int]
+
+    def __call__(self, dtime: datetime) -> bool:
+        return self.function(dtime, self.index, self.values)
 
 
 def dow_index_validator(dtime: datetime, index: int, values: set[int]) -> bool:
@@ -69,4 +1015,4 @@ def dow_index_validator(dtime: datetime, index: int, values: set[int]) -> bool:
     :param values: set of integers representing the valid days of the week
     :return: a boolean indicating if the day of the week and the index of the week match the values passed
     """
-    return dtime.isoweekday() in values and math.ceil(dtime.day / 7) == index
+    return dtime.isoweekday() in values and (dtime.day + 6) // 7 == index
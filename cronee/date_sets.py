@@ -0,0 +1,184 @@
+"""
+Sets of dates, such as holidays, attached to a cronee to exclude them from its occurrences or to restrict its
+occurrences to them.
+
+The dates are stored as a sorted array of proleptic gregorian ordinals, so the membership of a date is a binary search.
+The set is also compiled, once per year, into a bitmap of the days of the year, which the search applies to the table
+of the valid days of the cronee: excluded days are then skipped by the same bit scan as the other day constraints,
+whatever the length of a holiday period.
+"""
+import csv
+import os
+import re
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, Optional, TextIO, Union
+
+from .exceptions import CroneeValueError
+
+Source = Union[str, os.PathLike, TextIO]
+
+ICAL_DATE_PATTERN = re.compile(r'^(DTSTART|DTEND)(?:;[^:]*)?:(\d{8})', re.IGNORECASE)
+ICAL_EVENT_BEGIN = 'BEGIN:VEVENT'
+ICAL_EVENT_END = 'END:VEVENT'
+ICAL_DATE_FORMAT = '%Y%m%d'
+DEFAULT_DATE_FORMAT = '%Y-%m-%d'
+
+
+@dataclass(frozen=True)
+class DateSet:
+    """
+    Immutable set of dates.
+
+    Instances are hashable and compare by their dates, so the cronees sharing a set of dates are equal.
+    """
+
+    ordinals: tuple[int, ...]
+    """Sorted proleptic gregorian ordinals of the dates, without duplicates"""
+    _hash: int = field(init=False, repr=False, compare=False)
+    _year_masks: dict[int, int] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, 'ordinals', tuple(sorted(set(self.ordinals))))
+        object.__setattr__(self, '_hash', hash(self.ordinals))
+        object.__setattr__(self, '_year_masks', {})
+
+    @classmethod
+    def from_dates(cls, dates: Iterable[date]) -> 'DateSet':
+        """
+        Build a set of dates.
+
+        :param dates: the dates. The date of a datetime is used.
+        :return: the set of the dates
+        """
+        return cls(tuple(dtime.toordinal() for dtime in dates))
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __len__(self) -> int:
+        return len(self.ordinals)
+
+    def __iter__(self) -> Iterator[date]:
+        return (date.fromordinal(ordinal) for ordinal in self.ordinals)
+
+    def __contains__(self, dtime: date) -> bool:
+        return self.contains_ordinal(dtime.toordinal())
+
+    def contains_ordinal(self, ordinal: int) -> bool:
+        """
+        Check if a date belongs to the set, with a binary search.
+
+        :param ordinal: proleptic gregorian ordinal of the date
+        :return: True if the date belongs to the set
+        """
+        index = bisect_left(self.ordinals, ordinal)
+        return index < len(self.ordinals) and self.ordinals[index] == ordinal
+
+    @property
+    def first(self) -> Optional[date]:
+        """The earliest date of the set, None if the set is empty."""
+        return date.fromordinal(self.ordinals[0]) if self.ordinals else None
+
+    @property
+    def last(self) -> Optional[date]:
+        """The latest date of the set, None if the set is empty."""
+        return date.fromordinal(self.ordinals[-1]) if self.ordinals else None
+
+    def year_mask(self, year: int) -> int:
+        """
+        Bitmap of the dates of a year which belong to the set: the bit n is set if the (n + 1)th day of the year does.
+
+        :param year: the year
+        :return: the bitmap of the year, cached
+        """
+        mask = self._year_masks.get(year)
+        if mask is None:
+            first = date(year, 1, 1).toordinal()
+            start = bisect_left(self.ordinals, first)
+            stop = bisect_left(self.ordinals, date(year + 1, 1, 1).toordinal(), start)
+            mask = 0
+            for ordinal in self.ordinals[start:stop]:
+                mask |= 1 << (ordinal - first)
+            self._year_masks[year] = mask
+        return mask
+
+
+def _open(source: Source) -> TextIO:
+    if isinstance(source, (str, os.PathLike)):
+        return open(source, newline='', encoding='utf-8')
+    return source
+
+
+def load_csv(source: Source, column: int = 0, date_format: str = DEFAULT_DATE_FORMAT, delimiter: str = ',',
+             header: bool = False) -> DateSet:
+    """
+    Load a set of dates from a CSV file, such as a list of holidays.
+
+    :param source: path of the file, or an open text file
+    :param column: (optional) index of the column holding the dates. Defaults to the first column.
+    :param date_format: (optional) strptime format of the dates. Defaults to the ISO format YYYY-MM-DD.
+    :param delimiter: (optional) delimiter of the columns. Defaults to a comma.
+    :param header: (optional) True if the first row is a header to skip
+    :return: the set of the dates
+    :raises: CroneeValueError, if a date is missing or does not match the format.
+    """
+    file = _open(source)
+    try:
+        rows = csv.reader(file, delimiter=delimiter)
+        if header:
+            next(rows, None)
+        dates = []
+        for row in rows:
+            if not row or not any(cell.strip() for cell in row):
+                continue
+            if column >= len(row):
+                raise CroneeValueError(f"Missing date column {column} at line {rows.line_num}")
+            try:
+                dates.append(datetime.strptime(row[column].strip(), date_format).date())
+            except ValueError:
+                raise CroneeValueError(f"Invalid date '{row[column]}' at line {rows.line_num}") from None
+    finally:
+        if file is not source:
+            file.close()
+    return DateSet.from_dates(dates)
+
+
+def load_ical(source: Source) -> DateSet:
+    """
+    Load a set of dates from the events of an iCalendar file, such as a holiday calendar.
+
+    Each event covers the days from its DTSTART included to its DTEND excluded, or the day of its DTSTART alone. Only
+    the date part of the properties is read, and recurrence rules are not expanded.
+
+    :param source: path of the file, or an open text file
+    :return: the set of the days covered by the events
+    :raises: CroneeValueError, if an event has no start date.
+    """
+    file = _open(source)
+    try:
+        dates = []
+        event = None
+        for number, line in enumerate(file, 1):
+            line = line.strip()
+            if line.upper() == ICAL_EVENT_BEGIN:
+                event = {}
+            elif line.upper() == ICAL_EVENT_END and event is not None:
+                if 'DTSTART' not in event:
+                    raise CroneeValueError(f"Event without DTSTART ending at line {number}")
+                start = event['DTSTART']
+                end = event.get('DTEND', start + timedelta(days=1))
+                dates.extend(start + timedelta(days=day) for day in range(max((end - start).days, 1)))
+                event = None
+            elif event is not None:
+                match = ICAL_DATE_PATTERN.match(line)
+                if match is not None:
+                    try:
+                        event[match.group(1).upper()] = datetime.strptime(match.group(2), ICAL_DATE_FORMAT).date()
+                    except ValueError:
+                        raise CroneeValueError(f"Invalid date '{match.group(2)}' at line {number}") from None
+    finally:
+        if file is not source:
+            file.close()
+    return DateSet.from_dates(dates)
@@ -1,22 +1,58 @@
-class CroneeValueError(Exception):
+from typing import Optional
+
+
+class CroneeParseError(Exception):
+    """Base class of the exceptions raised when an expression is invalid, with the position of the error if known."""
+
+    def __init__(self, message: str, position: Optional[int] = None, expression: Optional[str] = None):
+        """
+        :param message: description of the error
+        :param position: (optional) index, in the expression, of the character at which the error was detected
+        :param expression: (optional) the invalid expression
+        """
+        super().__init__(message)
+        self.message = message
+        self.position = position
+        self.expression = expression
+
+    def __reduce__(self):
+        return type(self), (self.message, self.position, self.expression)
+
+    def __str__(self) -> str:
+        if self.position is None:
+            return self.message
+        if self.expression is None:
+            return f"{self.message} (at position {self.position})"
+        return f"{self.message} (at position {self.position} of '{self.expression}')"
+
+
+class CroneeValueError(CroneeParseError):
     """Exception raised when a syntax error is detected."""
 
 
-class CroneeAliasError(Exception):
+class CroneeAliasError(CroneeParseError):
     """Exception raised when an alias is unknown."""
 
 
-class CroneeOutOfBoundError(Exception):
+class CroneeOutOfBoundError(CroneeParseError):
     """Exception raised when a value is out of the valid values accepted for the field."""
 
 
-class CroneeSyntaxError(Exception):
+class CroneeSyntaxError(CroneeParseError):
     """Exception raised when the syntax is invalid."""
 
 
-class CroneeRangeOrderError(Exception):
+class CroneeRangeOrderError(CroneeParseError):
     """Exception raised when the range has invalid start and stop values."""
 
 
-class CroneeEmptyValuesError(Exception):
+class CroneeEmptyValuesError(CroneeParseError):
     """Exception raised when an expression leads to an empty set of valid values."""
+
+
+class CroneeSearchBudgetError(Exception):
+    """Exception raised when the search of an occurrence exhausts its horizon or its budget of candidates."""
+
+
+class CroneeUnsatisfiableError(CroneeSearchBudgetError):
+    """Exception raised when an occurrence is searched for a cronee which is proven to never fire."""
@@ -1,14 +1,205 @@
-from datetime import datetime, timedelta
-from calendar import monthrange
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Optional, Iterable
 
+MINUTE_VALIDATORS = 0
+HOUR_VALIDATORS = 1
+DOM_VALIDATORS = 2
+MONTH_VALIDATORS = 3
+DOW_VALIDATORS = 4
+
+DEFAULT_MAX_CANDIDATES = 100_000
+"""Default number of candidates examined by the search of an occurrence before it gives up"""
+
+ONE_SECOND = timedelta(seconds=1)
+ONE_MINUTE = timedelta(minutes=1)
 
 
 def dom_delta(field_values: set[int], start: datetime) -> int:
-    number_of_days = monthrange(start.year, start.month)[1]
-    next_valid_value = min(filter(lambda v: start.day <= v <= number_of_days, field_values), default=None)
-    if next_valid_value is not None:
-        return next_valid_value - start.day
-
-    delta_to_end_of_month = number_of_days - start.day
-    start += timedelta(days=delta_to_end_of_month)
-    return dom_delta(field_values, start)
+    """
+    Count the days from start to the next day, start included, whose day of the month is in the field values.
+
+    :param field_values: the valid days of the month
+    :param start: datetime from which the days are counted
+    :return: the number of days to the next valid day of the month
+    """
+    table = next_value_table(values_to_mask(field_values), 32)
+    year, month, day = start.year, start.month, start.day
+    delta = 0
+    for _ in range(13):
+        number_of_days = month_fields(year, month)[2]
+        next_valid_value = table[day]
+        if next_valid_value is not None and next_valid_value <= number_of_days:
+            return delta + next_valid_value - day
+        delta += number_of_days - day + 1
+        year, month = next_month(year, month)
+        day = 1
+    raise ValueError(f"No valid day of the month in {sorted(field_values)}")
+
+
+def values_to_mask(values: Iterable[int]) -> int:
+    """
+    Compile a set of field values into an integer bitmask where the bit n is set if n is a valid value.
+
+    :param values: iterable of non-negative integers representing the valid values of the field
+    :return: the bitmask of the values
+    """
+    mask = 0
+    for value in values:
+        mask |= 1 << value
+    return mask
+
+
+@lru_cache(maxsize=4096)
+def mask_to_values(mask: int) -> frozenset[int]:
+    """
+    Decompile an integer bitmask into the set of the field values whose bit is set. The results are cached.
+
+    :param mask: bitmask of the values
+    :return: the values of the mask
+    """
+    return frozenset(value for value in range(mask.bit_length()) if mask >> value & 1)
+
+
+@lru_cache(maxsize=4096)
+def next_value_table(mask: int, size: int) -> tuple[Optional[int], ...]:
+    """
+    Precompute, for each value v in [0, size], the smallest value of the mask greater or equal to v.
+
+    :param mask: bitmask of the valid values of the field
+    :param size: upper bound (excluded) of the values of the field
+    :return: a tuple of size + 1 items, each one being the next valid value or None if there is none
+    """
+    table = [None] * (size + 1)
+    next_value = None
+    for value in range(size - 1, -1, -1):
+        if mask >> value & 1:
+            next_value = value
+        table[value] = next_value
+    return tuple(table)
+
+
+@lru_cache(maxsize=4096)
+def previous_value_table(mask: int, size: int) -> tuple[Optional[int], ...]:
+    """
+    Precompute, for each value v in [0, size), the greatest value of the mask less or equal to v.
+
+    :param mask: bitmask of the valid values of the field
+    :param size: upper bound (excluded) of the values of the field
+    :return: a tuple of size items, each one being the previous valid value or None if there is none
+    """
+    table = [None] * size
+    previous_value = None
+    for value in range(size):
+        if mask >> value & 1:
+            previous_value = value
+        table[value] = previous_value
+    return tuple(table)
+
+
+def next_month(year: int, month: int) -> tuple[int, int]:
+    """Return the year and the month following the given month."""
+    if month == 12:
+        return year + 1, 1
+    return year, month + 1
+
+
+def previous_month(year: int, month: int) -> tuple[int, int]:
+    """Return the year and the month preceding the given month."""
+    if month == 1:
+        return year - 1, 12
+    return year, month - 1
+
+
+def ceil_minute(dtime: datetime) -> datetime:
+    """Round the datetime up to the minute."""
+    truncated = dtime.replace(second=0, microsecond=0)
+    return truncated if truncated == dtime else truncated + ONE_MINUTE
+
+
+def ceil_second(dtime: datetime) -> datetime:
+    """Round the datetime up to the second."""
+    truncated = dtime.replace(microsecond=0)
+    return truncated if truncated == dtime else truncated + ONE_SECOND
+
+
+def ceil_resolution(dtime: datetime, resolution: timedelta) -> datetime:
+    """Round the datetime up to the resolution of a cronee, the second or the minute."""
+    return ceil_second(dtime) if resolution < ONE_MINUTE else ceil_minute(dtime)
+
+
+def utc_instant(dtime: datetime) -> datetime:
+    """Convert the datetime to an aware UTC datetime. A naive datetime is a local time, as returned by datetime.now."""
+    return dtime.astimezone(timezone.utc)
+
+
+def sub_resolution(dtime: datetime, resolution: timedelta) -> timedelta:
+    """Part of the datetime below the resolution of a cronee, the second or the minute, kept by its occurrences."""
+    if resolution < ONE_MINUTE:
+        return timedelta(microseconds=dtime.microsecond)
+    return timedelta(seconds=dtime.second, microseconds=dtime.microsecond)
+
+
+SECONDS_PER_DAY = 86400
+
+
+def days_from_civil(year: int, month: int, day: int) -> int:
+    """
+    Count the days from 1970-01-01 to a date of the proleptic gregorian calendar, with integer arithmetic only.
+
+    :param year: year of the date
+    :param month: month of the date, from 1 to 12
+    :param day: day of the month
+    :return: the number of days since the unix epoch, negative before it
+    """
+    year -= month <= 2
+    era = year // 400
+    year_of_era = year - era * 400
+    day_of_year = (153 * (month + (-3 if month > 2 else 9)) + 2) // 5 + day - 1
+    day_of_era = year_of_era * 365 + year_of_era // 4 - year_of_era // 100 + day_of_year
+    return era * 146097 + day_of_era - 719468
+
+
+def civil_from_days(days: int) -> tuple[int, int, int]:
+    """
+    Convert a number of days since 1970-01-01 to a date of the proleptic gregorian calendar, with integer arithmetic
+    only.
+
+    :param days: the number of days since the unix epoch, negative before it
+    :return: the year, the month and the day of the date
+    """
+    days += 719468
+    era = days // 146097
+    day_of_era = days - era * 146097
+    year_of_era = (day_of_era - day_of_era // 1460 + day_of_era // 36524 - day_of_era // 146096) // 365
+    day_of_year = day_of_era - (365 * year_of_era + year_of_era // 4 - year_of_era // 100)
+    shifted_month = (5 * day_of_year + 2) // 153
+    day = day_of_year - (153 * shifted_month + 2) // 5 + 1
+    month = shifted_month + (3 if shifted_month < 10 else -9)
+    return year_of_era + era * 400 + (month <= 2), month, day
+
+
+@lru_cache(maxsize=65536)
+def day_fields(days: int) -> tuple[int, int, int, int]:
+    """
+    Cached decomposition of a day since 1970-01-01.
+
+    :param days: the number of days since the unix epoch
+    :return: the year, the month, the day and the iso weekday (1 for monday) of the date
+    """
+    return civil_from_days(days) + ((days + 3) % 7 + 1,)
+
+
+@lru_cache(maxsize=4096)
+def month_fields(year: int, month: int) -> tuple[int, int, int]:
+    """
+    Cached description of a month, replacing calendar.monthrange on the search paths.
+
+    :param year: year of the month
+    :param month: month, from 1 to 12
+    :return: the number of days since the unix epoch of its first day, the weekday of its first day (0 for monday)
+        and its number of days
+    """
+    first_day = days_from_civil(year, month, 1)
+    following_year, following_month = next_month(year, month)
+    return first_day, (first_day + 3) % 7, days_from_civil(following_year, following_month, 1) - first_day
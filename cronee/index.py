@@ -0,0 +1,134 @@
+from datetime import datetime, timedelta
+from typing import Hashable, Iterator
+
+from .cronee import Cronee, SimpleCronee
+
+MINUTE_SIZE = 60
+HOUR_SIZE = 24
+DOM_SIZE = 32
+MONTH_SIZE = 13
+DOW_SIZE = 8
+
+
+class CroneeIndex:
+    """
+    Inverted index over many cronees answering "which cronees match this datetime".
+
+    Each value of each field maps to a bitmap of the cronees accepting it, so a lookup is the intersection of five
+    bitmaps. Cronees that cannot be represented by their field values alone (offset, dynamic validators, timezone
+    or other implementations of Cronee) are kept in a residual set and validated one by one.
+    """
+
+    def __init__(self):
+        self._slots: dict[Hashable, int] = {}
+        self._keys: list[Hashable] = []
+        self._cronees: list[Cronee] = []
+        self._free_slots: list[int] = []
+        self._minutes = [0] * MINUTE_SIZE
+        self._hours = [0] * HOUR_SIZE
+        self._doms = [0] * DOM_SIZE
+        self._months = [0] * MONTH_SIZE
+        self._dows = [0] * DOW_SIZE
+        self._residual: dict[Hashable, Cronee] = {}
+
+    def add(self, key: Hashable, cronee: Cronee):
+        """
+        Add a cronee to the index, replacing the cronee already registered under the same key.
+
+        :param key: hashable identifier of the cronee, returned by the lookups
+        :param cronee: the cronee to index
+        """
+        if key in self:
+            self.remove(key)
+        if not _is_indexable(cronee):
+            self._residual[key] = cronee
+            return
+
+        if self._free_slots:
+            slot = self._free_slots.pop()
+            self._keys[slot] = key
+            self._cronees[slot] = cronee
+        else:
+            slot = len(self._keys)
+            self._keys.append(key)
+            self._cronees.append(cronee)
+        self._slots[key] = slot
+        self._update_bitmaps(cronee, 1 << slot)
+
+    def remove(self, key: Hashable):
+        """
+        Remove the cronee registered under the key.
+
+        :param key: identifier of the cronee
+        :raises: KeyError, if no cronee is registered under the key
+        """
+        if key in self._residual:
+            del self._residual[key]
+            return
+        slot = self._slots.pop(key)
+        self._update_bitmaps(self._cronees[slot], 1 << slot, clear=True)
+        self._keys[slot] = None
+        self._cronees[slot] = None
+        self._free_slots.append(slot)
+
+    def get(self, key: Hashable) -> Cronee:
+        """
+        Return the cronee registered under the key.
+
+        :raises: KeyError, if no cronee is registered under the key
+        """
+        if key in self._residual:
+            return self._residual[key]
+        return self._cronees[self._slots[key]]
+
+    def match(self, dtime: datetime) -> list[Hashable]:
+        """
+        Find the cronees validated by the datetime.
+
+        :param dtime: the datetime to check
+        :return: the keys of the cronees validated by the datetime
+        """
+        return list(self.iter_match(dtime))
+
+    def iter_match(self, dtime: datetime) -> Iterator[Hashable]:
+        """
+        Lazily find the cronees validated by the datetime.
+
+        :param dtime: the datetime to check
+        :return: an iterator over the keys of the cronees validated by the datetime
+        """
+        candidates = self._minutes[dtime.minute] & self._hours[dtime.hour] & self._doms[dtime.day] \
+            & self._months[dtime.month] & self._dows[dtime.isoweekday()]
+        keys = self._keys
+        while candidates:
+            lowest_bit = candidates & -candidates
+            yield keys[lowest_bit.bit_length() - 1]
+            candidates ^= lowest_bit
+        for key, cronee in self._residual.items():
+            if cronee.validate(dtime):
+                yield key
+
+    def __len__(self) -> int:
+        return len(self._slots) + len(self._residual)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._slots or key in self._residual
+
+    def _update_bitmaps(self, cronee: SimpleCronee, bit: int, clear: bool = False):
+        for bitmaps, values in ((self._minutes, cronee.minutes),
+                                (self._hours, cronee.hours),
+                                (self._doms, cronee.doms),
+                                (self._months, cronee.months),
+                                (self._dows, cronee.dows)):
+            for value in values:
+                if clear:
+                    bitmaps[value] &= ~bit
+                else:
+                    bitmaps[value] |= bit
+
+
+def _is_indexable(cronee: Cronee) -> bool:
+    """ Check if the cronee is fully described by its field values """
+    return isinstance(cronee, SimpleCronee) and cronee.offset == timedelta() and not any(cronee.other_validators) \
+        and cronee.timezone is None and cronee.excluded_dates is None and cronee.included_dates is None \
+        and cronee.seconds is None and cronee.years is None
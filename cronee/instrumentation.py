@@ -0,0 +1,198 @@
+"""
+Optional instrumentation of the evaluation of the cronees.
+
+When a collector is enabled, each evaluation (a validation, or the search of one occurrence) is measured and reported
+to it: the number of candidates examined by the field-skipping search, the number of dynamic validator calls per field,
+the time spent, and whether the evaluation stayed on the fast path (bitmasks and skip tables only) or fell back to
+stepping through candidates with the dynamic validators.
+
+When no collector is enabled, the cost for the cronees is a module attribute check per evaluation.
+"""
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Protocol, Callable, Optional, Iterator, Hashable, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from .cronee import SimpleCronee
+
+FIELDS = ('minute', 'hour', 'dom', 'month', 'dow')
+
+
+@dataclass(frozen=True)
+class EvaluationStatistics:
+    """Cost of a single evaluation of a cronee"""
+
+    operation: str
+    """Name of the evaluation: 'validate', 'validate_ts', 'next' or 'previous'"""
+    candidates: int
+    """Number of candidates examined by the search"""
+    validator_calls: tuple[int, ...]
+    """Number of dynamic validator calls per field (minute, hour, day of month, month, day of week)"""
+    duration: float
+    """Time spent, in seconds"""
+
+    @property
+    def fast_path(self) -> bool:
+        """True if the evaluation only used the bitmasks and the skip tables, without calling a dynamic validator."""
+        return not any(self.validator_calls)
+
+
+class StatsCollector(Protocol):
+    """Receiver of the statistics of the evaluations. It may be called from several threads."""
+
+    def record(self, cronee: 'SimpleCronee', statistics: EvaluationStatistics):
+        """Record the statistics of an evaluation of the cronee."""
+
+
+@dataclass
+class CroneeStatistics:
+    """Statistics of the evaluations of a cronee, summed"""
+
+    evaluations: int = 0
+    candidates: int = 0
+    validator_calls: list[int] = field(default_factory=lambda: [0] * len(FIELDS))
+    duration: float = 0.0
+    fallback_evaluations: int = 0
+    """Number of evaluations which called dynamic validators"""
+
+    def add(self, statistics: EvaluationStatistics):
+        self.evaluations += 1
+        self.candidates += statistics.candidates
+        for index, calls in enumerate(statistics.validator_calls):
+            self.validator_calls[index] += calls
+        self.duration += statistics.duration
+        self.fallback_evaluations += not statistics.fast_path
+
+
+class StatsAggregator:
+    """Thread-safe collector summing the statistics of the evaluations per cronee, to find the pathological ones."""
+
+    def __init__(self):
+        self._statistics: defaultdict[Hashable, CroneeStatistics] = defaultdict(CroneeStatistics)
+        self._lock = threading.Lock()
+
+    def record(self, cronee: 'SimpleCronee', statistics: EvaluationStatistics):
+        with self._lock:
+            self._statistics[cronee].add(statistics)
+
+    def statistics(self, cronee: 'SimpleCronee') -> CroneeStatistics:
+        """
+        Get the summed statistics of a cronee.
+
+        :param cronee: the cronee
+        :return: a copy of the statistics of the cronee, empty if it was not evaluated
+        """
+        with self._lock:
+            statistics = self._statistics.get(cronee, CroneeStatistics())
+            return CroneeStatistics(statistics.evaluations, statistics.candidates, list(statistics.validator_calls),
+                                    statistics.duration, statistics.fallback_evaluations)
+
+    def slowest(self, count: int = 10) -> list[tuple['SimpleCronee', CroneeStatistics]]:
+        """
+        Get the cronees which spent the most time being evaluated.
+
+        :param count: maximum number of cronees returned
+        :return: the cronees and their statistics, slowest first
+        """
+        with self._lock:
+            ranking = sorted(self._statistics.items(), key=lambda item: item[1].duration, reverse=True)
+        return [(cronee, self.statistics(cronee)) for cronee, _ in ranking[:count]]
+
+    def clear(self):
+        """Forget the statistics collected so far."""
+        with self._lock:
+            self._statistics.clear()
+
+    def __len__(self) -> int:
+        return len(self._statistics)
+
+
+collector: Optional[StatsCollector] = None
+"""Collector receiving the statistics of the evaluations. None disables the instrumentation."""
+
+_state = threading.local()
+
+
+class _Measure:
+    """ Counters of the evaluation running on the current thread """
+
+    __slots__ = ('candidates', 'validator_calls')
+
+    def __init__(self):
+        self.candidates = 0
+        self.validator_calls = [0] * len(FIELDS)
+
+
+def enable(stats_collector: StatsCollector):
+    """Report the statistics of the evaluations of every cronee to a collector."""
+    global collector
+    collector = stats_collector
+
+
+def disable():
+    """Stop reporting the statistics of the evaluations."""
+    global collector
+    collector = None
+
+
+@contextmanager
+def collecting(stats_collector: StatsCollector) -> Iterator[StatsCollector]:
+    """
+    Report the statistics of the evaluations to a collector within a block, restoring the previous collector after it.
+
+    :param stats_collector: the collector
+    :return: a context manager yielding the collector
+    """
+    global collector
+    previous, collector = collector, stats_collector
+    try:
+        yield stats_collector
+    finally:
+        collector = previous
+
+
+def is_measuring() -> bool:
+    """True if an evaluation is being measured on the current thread."""
+    return getattr(_state, 'measure', None) is not None
+
+
+def measure(cronee: 'SimpleCronee', operation: str, function: Callable, *args):
+    """
+    Run an evaluation and report its statistics to the collector. The evaluations nested in a measured evaluation are
+    accounted to it.
+
+    :param cronee: the evaluated cronee
+    :param operation: name of the evaluation
+    :param function: function running the evaluation
+    :param args: arguments of the function
+    :return: the result of the function
+    """
+    stats_collector = collector
+    if stats_collector is None or is_measuring():
+        return function(*args)
+    current = _state.measure = _Measure()
+    start = perf_counter()
+    try:
+        return function(*args)
+    finally:
+        duration = perf_counter() - start
+        _state.measure = None
+        stats_collector.record(cronee, EvaluationStatistics(operation, current.candidates,
+                                                            tuple(current.validator_calls), duration))
+
+
+def count_candidates(count: int):
+    """Account candidates examined by a search to the evaluation being measured, if any."""
+    current = getattr(_state, 'measure', None)
+    if current is not None:
+        current.candidates += count
+
+
+def count_validator_call(index: int):
+    """Account a dynamic validator call of a field to the evaluation being measured, if any."""
+    current = getattr(_state, 'measure', None)
+    if current is not None:
+        current.validator_calls[index] += 1
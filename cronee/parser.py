@@ -1,11 +1,13 @@
-import shlex
-from datetime import timedelta
-from functools import partial
+import re
+from datetime import timedelta, tzinfo, MINYEAR, MAXYEAR
 from typing import Callable, Optional
 
-from .exceptions import CroneeOutOfBoundError, CroneeAliasError, CroneeValueError, CroneeRangeOrderError, \
-    CroneeSyntaxError, CroneeEmptyValuesError
-from .cronee import IndexValidator, Validator, dow_index_validator, Cronee, SimpleCronee
+from .exceptions import CroneeValueError, CroneeSyntaxError, CroneeParseError
+from .cronee import IndexValidator, Validator, dow_index_validator, Cronee, BoundIndexValidator, build_cronee
+from .compiler import FieldSpec, Field, Element, Token, tokenize, parse_field_tree, compile_tree, compile_field, \
+    resolve_value, resolve_single, TOKEN_NUMBER, TOKEN_NAME, TOKEN_OPERATOR, OPERATOR_JOKER, OPERATOR_STEP
+from .date_sets import DateSet
+from .timezones import NONEXISTENT_SHIFT, AMBIGUOUS_EARLIEST
 
 Aliases = dict[str, set[int]]
 ElementParser = Callable[[str, set[int], Aliases], tuple[Optional[Validator], set[int]]]
@@ -21,11 +23,13 @@ KEYWORD_INDEX = '#'
 
 MODIFIERS_RANGE = set(range(0, 366))
 
+SECOND_RANGE = set(range(0, 60))
 MINUTE_RANGE = set(range(0, 60))
 HOUR_RANGE = set(range(0, 24))
 DOM_RANGE = set(range(1, 32))
 MONTH_RANGE = set(range(1, 13))
 DOW_RANGE = set(range(1, 8))
+YEAR_RANGE = set(range(MINYEAR, MAXYEAR + 1))
 
 MONTH_ALIASES = {
     'JAN': {1},
@@ -53,6 +57,50 @@ DOW_ALIASES = {
 }
 DOW_INDEX_RANGE = set(range(1, 6))
 
+FIELD_SPECS = (
+    FieldSpec('minute', frozenset(MINUTE_RANGE), {}, frozenset(MODIFIERS_RANGE)),
+    FieldSpec('hour', frozenset(HOUR_RANGE), {}, frozenset(MODIFIERS_RANGE)),
+    FieldSpec('day of month', frozenset(DOM_RANGE), {}, frozenset(MODIFIERS_RANGE)),
+    FieldSpec('month', frozenset(MONTH_RANGE), MONTH_ALIASES, frozenset(MODIFIERS_RANGE)),
+    FieldSpec('day of week', frozenset(DOW_RANGE), DOW_ALIASES, frozenset(MODIFIERS_RANGE), frozenset(DOW_INDEX_RANGE),
+              dow_index_validator, allow_empty=True),
+)
+SECOND_SPEC = FieldSpec('second', frozenset(SECOND_RANGE), {}, frozenset(MODIFIERS_RANGE))
+YEAR_SPEC = FieldSpec('year', frozenset(YEAR_RANGE), {}, frozenset({0}))
+EXPRESSION_SPECS = {
+    len(FIELD_SPECS): FIELD_SPECS,
+    len(FIELD_SPECS) + 1: (SECOND_SPEC,) + FIELD_SPECS,
+    len(FIELD_SPECS) + 2: (SECOND_SPEC,) + FIELD_SPECS + (YEAR_SPEC,),
+}
+"""Fields of the expressions by number of fields: the seconds come first and the years last, when present"""
+FIELD_PATTERN = re.compile(r'\S+')
+LEGACY_FIELD = 'expression'
+"""Name of the fields compiled by the parse_* functions, which take their valid range and aliases as arguments"""
+
+
+def _legacy_spec(valid_range: set[int],
+                 aliases: Optional[Aliases],
+                 index_range: Optional[set[int]] = None,
+                 index_validator: Optional[IndexValidator] = None,
+                 allow_empty: bool = True) -> FieldSpec:
+    """ Spec of a field compiled by the parse_* functions """
+    return FieldSpec(LEGACY_FIELD, frozenset(valid_range), aliases or {}, frozenset(MODIFIERS_RANGE),
+                     None if index_range is None else frozenset(index_range), index_validator, allow_empty)
+
+
+def _parse_element(expression: str, spec: FieldSpec) -> Element:
+    """ Syntax tree of an expression made of a single element, without inversion nor modifier """
+    tree = parse_field_tree(expression, spec)
+    if tree.inversion or tree.modifier is not None or len(tree.elements) != 1:
+        raise CroneeSyntaxError(f"Syntax error for the element '{expression}'")
+    return tree.elements[0]
+
+
+def _compile_single_element(expression: str, spec: FieldSpec) -> tuple[Optional[Validator], set[int]]:
+    """ Validator and values of an expression made of a single element """
+    compiled = compile_tree(Field(False, (_parse_element(expression, spec),), None), spec)
+    return (compiled.validators[0] if compiled.validators else None), set(compiled.values)
+
 
 def parse_value(value: str,
                 valid_range: set,
@@ -66,16 +114,14 @@ def parse_value(value: str,
     :return: a set of integers representing the parsed value.
     :raises: CroneeValueError, if the `value` argument is invalid.
     """
-    if value == TOKEN_JOKER:
-        return parse_joker(valid_range)
-
-    if value.isnumeric():
-        return parse_numeric(value, valid_range)
-
-    if value[0].isalpha():
-        return parse_alias(value, aliases)
-
-    raise CroneeValueError(f"Invalid value '{value}'")
+    try:
+        tokens = tokenize(value)
+    except CroneeSyntaxError:
+        raise CroneeValueError(f"Invalid value '{value}'") from None
+    token = tokens[0]
+    if len(tokens) != 2 or (token.kind == TOKEN_OPERATOR and token.text != OPERATOR_JOKER):
+        raise CroneeValueError(f"Invalid value '{value}'")
+    return set(resolve_value(token, frozenset(valid_range), aliases or {}))
 
 
 def parse_joker(valid_range: set) -> set[int]:
@@ -86,7 +132,7 @@ def parse_joker(valid_range: set) -> set[int]:
     :return: a copy of the valid_range set.
     :raises: CroneeSyntaxError, if the `inversion` is True
     """
-    return valid_range.copy()
+    return set(resolve_value(Token(TOKEN_OPERATOR, OPERATOR_JOKER, 0), frozenset(valid_range), {}))
 
 
 def parse_numeric(value: str, valid_range: set[int]) -> set[int]:
@@ -98,10 +144,7 @@ def parse_numeric(value: str, valid_range: set[int]) -> set[int]:
     :return: a set of integers representing the parsed value
     :raises: CroneeOutOfBoundError, if the `value` argument is out of the valid range
     """
-    new_value = int(value)
-    if new_value not in valid_range:
-        raise CroneeOutOfBoundError(f"Value {value} is out of the valid range {valid_range}")
-    return {new_value}
+    return set(resolve_value(Token(TOKEN_NUMBER, value, 0), frozenset(valid_range), {}))
 
 
 def parse_alias(value: str, aliases: Aliases) -> set[int]:
@@ -113,10 +156,7 @@ def parse_alias(value: str, aliases: Aliases) -> set[int]:
     :return: a set of integers representing the parsed value
     :raises: CroneeAliasError, if the `value` argument is invalid alias.
     """
-    new_values = aliases.get(value)
-    if new_values is None:
-        raise CroneeAliasError(f"Invalid alias {value}")
-    return new_values
+    return set(resolve_value(Token(TOKEN_NAME, value, 0), frozenset(), aliases))
 
 
 def parse_range(expression: str, valid_range: set[int], aliases: Aliases) -> set[int]:
@@ -130,20 +170,11 @@ def parse_range(expression: str, valid_range: set[int], aliases: Aliases) -> set
     :raises: CroneeValueError, if the `start` or `stop` value of the range is not valid
     :raises: CroneeRangeOrderError, if the `start` value is greater than the `stop` value.
     """
-    elements = expression.split(KEYWORD_RANGE)
-    if len(elements) != 2:
+    spec = _legacy_spec(valid_range, aliases)
+    element = _parse_element(expression, spec)
+    if element.stop is None or element.step is not None:
         raise CroneeSyntaxError(f"Syntax error for the range '{expression}'")
-    start_str, stop_str = expression.split(KEYWORD_RANGE)
-    start_set = parse_value(start_str, valid_range, aliases)
-    stop_set = parse_value(stop_str, valid_range, aliases)
-    if len(start_set) != 1 or len(stop_set) != 1:
-        raise CroneeValueError(f"Invalid start or stop value for the range '{expression}'")
-    start = next(iter(start_set))
-    stop = next(iter(stop_set))
-    if start >= stop:
-        raise CroneeRangeOrderError(
-            f"The first value of a range must be less than than the second one. Invalid range '{expression}'")
-    return {v for v in valid_range if start <= v <= stop}
+    return _compile_single_element(expression, spec)[1]
 
 
 def parse_step(expression: str, valid_range: set[int], aliases: Aliases) -> tuple[int, str]:
@@ -157,17 +188,12 @@ def parse_step(expression: str, valid_range: set[int], aliases: Aliases) -> tupl
     :raises: CroneeSyntaxError, if the syntax of the `expression` argument is invalid
     :raises: CroneeValueError, if the step value is not valid
     """
-    original_expression = str(expression)
-    elements = expression.split(KEYWORD_STEP)
-    if len(elements) != 2:
-        raise CroneeSyntaxError(f"Syntax error for the step expression '{original_expression}'")
-    expression, step_str = elements
-    step_set = parse_value(step_str, valid_range, aliases)
-    if len(step_set) != 1:
-        raise CroneeValueError(f"Invalid step value for the expression '{original_expression}'")
-    step = next(iter(step_set))
-    mini = min(valid_range)
-    return step, expression
+    spec = _legacy_spec(valid_range, aliases)
+    element = _parse_element(expression, spec)
+    if element.step is None:
+        raise CroneeSyntaxError(f"Syntax error for the step expression '{expression}'")
+    step = resolve_single(element.step, spec.valid_range, spec.aliases, 'step')
+    return step, expression[:element.step.position - len(OPERATOR_STEP)]
 
 
 def parse_inversion(expression: str) -> tuple[bool, str]:
@@ -197,21 +223,17 @@ def parse_index(expression: str,
     :param index_range: A set of integers representing the valid range of indices.
     :param index_aliases: A dictionary of string keys and set of integers values, representing possible aliases for the index argument.
     :param validator:  A function that takes an index and values as input and returns a bool indicating whether the current index is in the parsed values or not.
-    :return: A function that takes no input and returns a bool indicating whether the current index is in the parsed values or not.
+    :return: A validator that takes a datetime and returns a bool indicating whether the current index is in the parsed values or not.
     :raises: CroneeSyntaxError, if the syntax of the `expression` argument is invalid.
     :raises: CroneeValueError, if the index or value  is not valid.
     """
-    original_expression = str(expression)
-    elements = expression.split(KEYWORD_INDEX)
-    if len(elements) != 2:
-        raise CroneeSyntaxError(f"Syntax error for the index expression '{original_expression}'")
-    expression, index = elements
-    index = parse_value(index, index_range, index_aliases)
-    if len(index) != 1:
-        raise CroneeValueError(f"Invalid index value for the expression '{original_expression}'")
-    values = parse_value(expression, value_range, value_aliases)
-    index = next(iter(index))
-    return partial(validator, index=index, values=values)
+    spec = _legacy_spec(value_range, value_aliases, index_range, validator)
+    element = _parse_element(expression, spec)
+    if element.index is None:
+        raise CroneeSyntaxError(f"Syntax error for the index expression '{expression}'")
+    index = resolve_single(element.index, spec.index_range, index_aliases or {}, 'index')
+    values = resolve_value(element.start, spec.valid_range, spec.aliases)
+    return BoundIndexValidator(validator, index, values)
 
 
 def parse_modifier(expression, coef: int, keyword: str, aliases: Aliases) -> tuple[int, str]:
@@ -226,18 +248,17 @@ def parse_modifier(expression, coef: int, keyword: str, aliases: Aliases) -> tup
     :raises: CroneeSyntaxError, if the syntax of the `expression` argument is invalid
     :raises: CroneeValueError, if the modifier value is not valid
     """
-    original_expression = expression
-    elements = expression.split(keyword)
-    if len(elements) == 1:
+    tokens = tokenize(expression)
+    signs = [position for position, token in enumerate(tokens)
+             if token.kind == TOKEN_OPERATOR and token.text == keyword]
+    if not signs:
         return 0, expression
-    if len(elements) != 2:
-        raise CroneeSyntaxError(f"Invalid modifier syntax '{original_expression}'")
-    expression, modifier_str = elements
-    modifier_set = parse_value(modifier_str, MODIFIERS_RANGE, aliases)
-    if len(modifier_set) != 1:
-        raise CroneeValueError(f"Invalid modifier value '{original_expression}'")
-    modifier = next(iter(modifier_set))
-    return coef * modifier, expression
+    sign = signs[0]
+    value = tokens[sign + 1]
+    if len(signs) != 1 or len(tokens) != sign + 3 or (value.kind == TOKEN_OPERATOR and value.text != OPERATOR_JOKER):
+        raise CroneeSyntaxError(f"Invalid modifier syntax '{expression}'")
+    modifier = resolve_single(value, frozenset(MODIFIERS_RANGE), aliases or {}, 'modifier')
+    return coef * modifier, expression[:tokens[sign].position]
 
 
 def parse_modifiers(expression: str, aliases: Aliases) -> tuple[int, str]:
@@ -273,18 +294,7 @@ def parse_generic_element(expression: str,
     :raises: CroneeRangeOrderError, if the `start` value is greater than the `stop` value
     :raises: CroneeAliasError, if the `value` argument is not in the provided aliases
     """
-    step = 1
-    if KEYWORD_STEP in expression:
-        step, expression = parse_step(expression, valid_range, aliases)
-
-    if KEYWORD_RANGE in expression:
-        values = parse_range(expression, valid_range, aliases)
-    else:
-        values = parse_value(expression, valid_range, aliases)
-
-    mini = min(values)
-    values = set(filter(lambda v: v % step == mini % step, values))
-    return None, values
+    return _compile_single_element(expression, _legacy_spec(valid_range, aliases))
 
 
 def parse_dow_element(expression: str,
@@ -303,21 +313,7 @@ def parse_dow_element(expression: str,
     :raises: CroneeRangeOrderError, if the `start` value is greater than the `stop` value
     :raises: CroneeAliasError, if the `value` argument is not in the provided aliases
     """
-    validator = None
-    step = 1
-    if KEYWORD_STEP in expression:
-        step, expression = parse_step(expression, valid_range, aliases)
-
-    if KEYWORD_RANGE in expression:
-        values = parse_range(expression, valid_range, aliases)
-    elif KEYWORD_INDEX in expression:
-        return parse_index(expression, valid_range, aliases, DOW_INDEX_RANGE, {}, dow_index_validator), set()
-    else:
-        values = parse_value(expression, valid_range, aliases)
-
-    mini = min(values)
-    values = set(filter(lambda v: v % step == mini % step, values))
-    return validator, values
+    return _compile_single_element(expression, _legacy_spec(valid_range, aliases, DOW_INDEX_RANGE, dow_index_validator))
 
 
 def parse_field(expression: str,
@@ -333,62 +329,92 @@ def parse_field(expression: str,
         :param valid_range: A set of integers representing the valid range of values.
         :param value_aliases: A dictionary of string keys and set of integers values, representing possible aliases for the `value` argument.
         :param step_aliases: A dictionary of string keys and set of integers values, representing possible aliases for the `step` argument.
-        :param element_parser: A callable that takes a string `expression`, a `valid_range` and `value_aliases` as arguments and returns a set of integers
+        :param element_parser: parse_dow_element to allow the indexes of the days of week in the elements, parse_generic_element otherwise
         :return: a tuple of the parsed values ( an int indicating the sum of the coefficients of the positive and negative modifier multiplied by their respective modifier values) and a set of integers representing the parsed value.
         :raises: CroneeEmptyValuesError, if the parsed values set is empty.
         :raises: CroneeSyntaxError, if the syntax of the `expression` argument is invalid or if there is more than one modifier in the same field
         :raises: CroneeValueError, if the step or value or start or stop or modifier values are not valid.
         """
     modifier, expression = parse_modifiers(expression, step_aliases)
-    inversion, expression = parse_inversion(expression)
-
-    validators = []
-    values = set()
-    elements = expression.split(KEYWORD_LIST)
-    for element in elements:
-        element_validator, element_values = element_parser(element, valid_range, value_aliases)
-        values = values.union(element_values)
-        if element_validator is not None:
-            validators.append(element_validator)
-
-    if inversion:
-        values = valid_range.difference(values)
-
-    if len(values) == 0 and not allow_empty:
-        raise CroneeEmptyValuesError(f"No valid values for the expression '{expression}'")
-
-    return modifier, validators, values
+    if element_parser is parse_dow_element:
+        spec = _legacy_spec(valid_range, value_aliases, DOW_INDEX_RANGE, dow_index_validator, allow_empty)
+    else:
+        spec = _legacy_spec(valid_range, value_aliases, allow_empty=allow_empty)
+    _, validators, values = compile_tree(parse_field_tree(expression, spec), spec)
+    return modifier, list(validators), set(values)
 
 
-def parse_expression(expression: str) -> Cronee:
+def parse_expression(expression: str,
+                     timezone: tzinfo = None,
+                     nonexistent: str = NONEXISTENT_SHIFT,
+                     ambiguous: str = AMBIGUOUS_EARLIEST,
+                     excluded_dates: DateSet = None,
+                     included_dates: DateSet = None) -> Cronee:
     """
     Parse a cron-like expression and returns an instance of Cronee.
 
+    The expression has 5 fields (minute, hour, day of month, month, day of week), 6 fields with a leading second field,
+    or 7 fields with a leading second field and a trailing year field.
+
     :param expression: A string representing the cron-like expression to be parsed.
+    :param timezone: (optional) the timezone, for instance a zoneinfo.ZoneInfo, whose wall time the expression matches. If not provided, the cronee works on naive datetimes.
+    :param nonexistent: (optional) policy for the wall times skipped by a daylight saving transition: 'shift' (default) fires at the end of the gap, 'skip' drops them.
+    :param ambiguous: (optional) policy for the wall times repeated by a daylight saving transition: 'earliest' (default), 'latest' or 'both'.
+    :param excluded_dates: (optional) dates, such as holidays, on which the cronee never fires. See cronee.date_sets.
+    :param included_dates: (optional) dates to which the occurrences of the cronee are restricted. See cronee.date_sets.
     :return: An instance of Cronee representing the parsed expression.
-    :raises: CroneeSyntaxError, if the number of fields in the expression is different from 5.
+    :raises: CroneeSyntaxError, if the expression does not have 5, 6 or 7 fields, or if a field does not follow the grammar.
+    :raises: CroneeParseError, carrying the position of the error in the expression, if a field is invalid.
+    :raises: CroneeValueError, if a policy is invalid.
     """
-    fields = shlex.split(expression)
-    if len(fields) != 5:
-        raise CroneeSyntaxError(f'Invalid number of field. A cronee must have 5 fields.')
-
-    min_modifier, min_validators, min_values = parse_field(fields[0], MINUTE_RANGE, {}, {}, parse_generic_element)
-    hou_modifier, hou_validators, hou_values = parse_field(fields[1], HOUR_RANGE, {}, {}, parse_generic_element)
-    dom_modifier, dom_validators, dom_values = parse_field(fields[2], DOM_RANGE, {}, {}, parse_generic_element)
-    mon_modifier, mon_validators, mon_values = parse_field(fields[3], MONTH_RANGE, MONTH_ALIASES, {},
-                                                           parse_generic_element)
-    dow_modifier, dow_validators, dow_values = parse_field(fields[4], DOW_RANGE, DOW_ALIASES, {}, parse_dow_element,
-                                                           True)
-
-    modifier = timedelta(days=dom_modifier + dow_modifier, hours=hou_modifier, minutes=min_modifier)
+    fields = []
+    try:
+        matches = list(FIELD_PATTERN.finditer(expression))
+        specs = EXPRESSION_SPECS.get(len(matches))
+        if specs is None:
+            position = matches[max(EXPRESSION_SPECS)].start() if len(matches) > max(EXPRESSION_SPECS) \
+                else len(expression)
+            raise CroneeSyntaxError('Invalid number of field. A cronee must have 5, 6 or 7 fields.', position)
+        for match, spec in zip(matches, specs):
+            try:
+                fields.append(compile_field(match.group(), spec))
+            except CroneeParseError as error:
+                error.position += match.start()
+                raise
+    except CroneeParseError as error:
+        error.expression = expression
+        raise
+
+    sec_modifier, sec_values = 0, None
+    if specs[0] is SECOND_SPEC:
+        sec_modifier, _, sec_values = fields.pop(0)
+    year_values = None
+    if specs[-1] is YEAR_SPEC:
+        year_values = fields.pop().values
+        if year_values == YEAR_SPEC.valid_range:
+            year_values = None
+
+    (min_modifier, min_validators, min_values), (hou_modifier, hou_validators, hou_values), \
+        (dom_modifier, dom_validators, dom_values), (mon_modifier, mon_validators, mon_values), \
+        (dow_modifier, dow_validators, dow_values) = fields
+
+    modifier = timedelta(days=dom_modifier + dow_modifier, hours=hou_modifier, minutes=min_modifier,
+                         seconds=sec_modifier)
     validators = [min_validators, hou_validators, dom_validators, mon_validators, dow_validators]
 
-    return SimpleCronee(
+    return build_cronee(
         minutes=min_values,
         hours=hou_values,
         doms=dom_values,
         months=mon_values,
         dows=dow_values,
         offset=modifier,
-        other_validators=validators
+        other_validators=validators,
+        timezone=timezone,
+        nonexistent=nonexistent,
+        ambiguous=ambiguous,
+        excluded_dates=excluded_dates,
+        included_dates=included_dates,
+        seconds=sec_values,
+        years=year_values
     )
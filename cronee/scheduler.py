@@ -0,0 +1,206 @@
+import heapq
+from datetime import datetime
+from itertools import count
+from threading import Condition
+from typing import Callable, Hashable, Optional
+
+from .cronee import Cronee, resolution_of
+from .exceptions import CroneeSearchBudgetError
+from .helpers import ceil_resolution, utc_instant
+
+Clock = Callable[[], datetime]
+Callback = Callable[[Hashable, datetime], None]
+
+
+class _Entry:
+    """
+    Heap entry of a scheduled cronee. Removed entries are flagged and dropped lazily when they reach the top. Entries
+    are ordered by the UTC instant of their fire time, so naive and zoned cronees can be scheduled together.
+    """
+    __slots__ = ('fire_time', 'instant', 'sequence', 'key', 'cronee', 'removed')
+
+    def __init__(self, fire_time: datetime, sequence: int, key: Hashable, cronee: Cronee):
+        self.fire_time = fire_time
+        self.instant = utc_instant(fire_time)
+        self.sequence = sequence
+        self.key = key
+        self.cronee = cronee
+        self.removed = False
+
+    def __lt__(self, other: '_Entry') -> bool:
+        return (self.instant, self.sequence) < (other.instant, other.sequence)
+
+
+def default_start(cronee: Cronee, now: datetime) -> datetime:
+    """
+    Return the datetime from which the occurrences of a cronee are computed by default: the next minute, or the next
+    second for a cronee with a seconds field. A naive current datetime is a local time, converted to the timezone of a
+    zoned cronee.
+    """
+    zone = getattr(cronee, 'timezone', None)
+    if zone is not None and now.tzinfo is None:
+        now = now.astimezone(zone)
+    return ceil_resolution(now, resolution_of(cronee))
+
+
+class CroneeScheduler:
+    """
+    Scheduler merging the occurrences of many cronees with a priority queue.
+
+    Each cronee is armed with its next occurrence. Adding, removing and updating a cronee cost O(log N), and the
+    scheduler only wakes up when the earliest occurrence is due. The scheduler is thread-safe: cronees can be added
+    or removed while another thread is running it.
+    """
+
+    def __init__(self, clock: Clock = datetime.now):
+        """
+        :param clock: function returning the current datetime. Defaults to datetime.now. A naive datetime is a local
+            time: fire times are compared as UTC instants, so naive and zoned cronees can be mixed.
+        """
+        self._clock = clock
+        self._heap: list[_Entry] = []
+        self._entries: dict[Hashable, _Entry] = {}
+        self._sequence = count()
+        self._condition = Condition()
+        self._stopped = False
+
+    def add(self, key: Hashable, cronee: Cronee, start: datetime = None):
+        """
+        Schedule a cronee, replacing the cronee already scheduled under the same key.
+
+        :param key: hashable identifier of the cronee, passed to the callback when it fires
+        :param cronee: the cronee to schedule
+        :param start: (optional) datetime from which the occurrences are computed. Defaults to the next minute, or to
+            the next second for a cronee with a seconds field.
+        """
+        if start is None:
+            start = default_start(cronee, self._clock())
+        fire_time = cronee.next_occurrence(start)
+        with self._condition:
+            self._discard(key)
+            entry = _Entry(fire_time, next(self._sequence), key, cronee)
+            self._entries[key] = entry
+            heapq.heappush(self._heap, entry)
+            self._condition.notify_all()
+
+    def update(self, key: Hashable, cronee: Cronee, start: datetime = None):
+        """
+        Replace the cronee scheduled under the key.
+
+        :raises: KeyError, if no cronee is scheduled under the key
+        """
+        if key not in self:
+            raise KeyError(key)
+        self.add(key, cronee, start)
+
+    def remove(self, key: Hashable):
+        """
+        Unschedule the cronee registered under the key.
+
+        :raises: KeyError, if no cronee is scheduled under the key
+        """
+        with self._condition:
+            if not self._discard(key):
+                raise KeyError(key)
+            self._condition.notify_all()
+
+    def next_fire_time(self) -> Optional[datetime]:
+        """Return the datetime of the earliest occurrence, or None if nothing is scheduled."""
+        with self._condition:
+            entry = self._peek()
+            return None if entry is None else entry.fire_time
+
+    def pop_due(self, now: datetime = None) -> list[tuple[Hashable, datetime]]:
+        """
+        Pop the occurrences due at the given datetime and re-arm their cronees with their following occurrence. The
+        cronees without a following occurrence, or whose search exhausts its budget, are unscheduled.
+
+        :param now: (optional) the current datetime. Defaults to the clock of the scheduler.
+        :return: the keys and the fire times of the due occurrences, ordered by fire time
+        """
+        return [(key, fire_time) for key, fire_time, _ in self.pop_due_entries(now)]
+
+    def pop_due_entries(self, now: datetime = None) -> list[tuple[Hashable, datetime, Cronee]]:
+        """
+        Same as pop_due, with the cronee of each occurrence, so callers can tell apart the occurrences of a cronee
+        replaced while they were popped.
+
+        :param now: (optional) the current datetime. Defaults to the clock of the scheduler.
+        :return: the keys, the fire times and the cronees of the due occurrences, ordered by fire time
+        """
+        now = utc_instant(self._clock() if now is None else now)
+        due = []
+        with self._condition:
+            while True:
+                entry = self._peek()
+                if entry is None or entry.instant > now:
+                    return due
+                due.append((entry.key, entry.fire_time, entry.cronee))
+                try:
+                    fire_time = next(entry.cronee.iter_occurrences(entry.fire_time + resolution_of(entry.cronee)),
+                                     None)
+                except CroneeSearchBudgetError:
+                    # The search of the following occurrence gave up: the cronee is unscheduled without blocking the
+                    # other due cronees.
+                    fire_time = None
+                if fire_time is None:
+                    # A cronee restricted to some years or dates has no more occurrences: it is unscheduled.
+                    heapq.heappop(self._heap)
+                    del self._entries[entry.key]
+                    continue
+                entry.fire_time = fire_time
+                entry.instant = utc_instant(fire_time)
+                entry.sequence = next(self._sequence)
+                heapq.heapreplace(self._heap, entry)
+
+    def run(self, callback: Callback):
+        """
+        Call the callback for each occurrence when it is due, sleeping until the earliest occurrence in between.
+        Returns when stop is called, once the occurrences already due are dispatched, or when nothing is scheduled.
+
+        :param callback: function called with the key of the cronee and the fire time of the occurrence
+        """
+        with self._condition:
+            self._stopped = False
+        while True:
+            with self._condition:
+                if self._stopped:
+                    return
+                fire_time = self.next_fire_time()
+                if fire_time is None:
+                    return
+                delay = (utc_instant(fire_time) - utc_instant(self._clock())).total_seconds()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+            for key, fire_time in self.pop_due():
+                callback(key, fire_time)
+
+    def stop(self):
+        """Make run return as soon as possible."""
+        with self._condition:
+            self._stopped = True
+            self._condition.notify_all()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    def _peek(self) -> Optional[_Entry]:
+        heap = self._heap
+        while heap and heap[0].removed:
+            heapq.heappop(heap)
+        return heap[0] if heap else None
+
+    def _discard(self, key: Hashable) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        entry.removed = True
+        if len(self._heap) > 2 * len(self._entries) + 64:
+            self._heap = [entry for entry in self._heap if not entry.removed]
+            heapq.heapify(self._heap)
+        return True
+
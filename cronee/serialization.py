@@ -0,0 +1,350 @@
+"""
+Serialization of compiled cronees.
+
+A worker loading many cronees spends most of its start in the parser. The cronees are serialized in their compiled
+form instead: the bitmasks of their fields, their offset in seconds, the parameters of their `#` index validators,
+their ranges of years, their timezone, policies and date sets. Loading them builds the cronees directly from the masks,
+without parsing any expression.
+
+Both formats store each distinct cronee once, then the position of the cronee of each entry: a list of 200k cronees
+sharing a few thousand schedules loads a few thousand cronees, which the entries share. The timezones and the date sets
+are stored once too, in tables referenced by the cronees.
+
+Layout of the binary format, little-endian:
+
+- header: magic, version, number of timezones, of date sets, of cronees and of entries
+- timezones: length and UTF-8 name of each timezone, the key of a zoneinfo timezone or the offset in seconds of a
+  fixed one
+- date sets: number of dates and proleptic gregorian ordinals, as uint32, of each set
+- cronees: a fixed size record per cronee, followed by its index validators and its ranges of years
+- entries: position of the cronee of each entry, as uint32
+"""
+import json
+import struct
+from datetime import timedelta, timezone, tzinfo
+from typing import Iterable, NamedTuple, Optional
+from zoneinfo import ZoneInfo
+
+from .cronee import SimpleCronee, BoundIndexValidator, restore_cronee
+from .date_sets import DateSet
+from .exceptions import CroneeValueError
+from .helpers import values_to_mask, mask_to_values
+from .parser import FIELD_SPECS, SECOND_SPEC, YEAR_SPEC
+from .timezones import NONEXISTENT_SHIFT, NONEXISTENT_SKIP, AMBIGUOUS_EARLIEST, AMBIGUOUS_LATEST, AMBIGUOUS_BOTH
+
+MAGIC = b'CRONEEBN'
+VERSION = 1
+HEADER = struct.Struct('<8sIIIII')
+RECORD = struct.Struct('<QIIHBQqBBBHHHBH')
+VALIDATOR = struct.Struct('<BBQ')
+YEAR_RANGE = struct.Struct('<HH')
+LENGTH = struct.Struct('<I')
+ORDINAL_SIZE = 4
+ENTRY_SIZE = 4
+FLAG_SECONDS = 1
+FLAG_YEARS = 2
+NONEXISTENT_CODES = (NONEXISTENT_SHIFT, NONEXISTENT_SKIP)
+AMBIGUOUS_CODES = (AMBIGUOUS_EARLIEST, AMBIGUOUS_LATEST, AMBIGUOUS_BOTH)
+JSON_FORMAT = 'cronee'
+FIELD_MASKS = tuple(values_to_mask(spec.valid_range) for spec in FIELD_SPECS)
+SECOND_MASK = values_to_mask(SECOND_SPEC.valid_range)
+FIRST_YEAR, LAST_YEAR = min(YEAR_SPEC.valid_range), max(YEAR_SPEC.valid_range)
+
+
+class CompiledRecord(NamedTuple):
+    """Compiled form of a cronee, with its timezone and date sets as positions in the tables of the document"""
+
+    masks: tuple[int, int, int, int, int]
+    """Bitmasks of the minutes, hours, days of month, months and days of week"""
+    second_mask: Optional[int]
+    offset: int
+    """Offset, in seconds"""
+    validators: tuple[tuple[int, int, int], ...]
+    """Field, index and bitmask of the values of each `#` index validator, in order"""
+    years: Optional[tuple[tuple[int, int], ...]]
+    """Ranges of years, first and last years included"""
+    timezone: Optional[int]
+    nonexistent: str
+    ambiguous: str
+    excluded_dates: Optional[int]
+    included_dates: Optional[int]
+
+
+class _Tables:
+    """ Timezones and date sets shared by the cronees of a document """
+
+    def __init__(self):
+        self.timezones: dict[str, int] = {}
+        self.date_sets: dict[DateSet, int] = {}
+
+    def timezone(self, tz: Optional[tzinfo]) -> Optional[int]:
+        return None if tz is None else self.timezones.setdefault(_timezone_name(tz), len(self.timezones))
+
+    def date_set(self, dates: Optional[DateSet]) -> Optional[int]:
+        return None if dates is None else self.date_sets.setdefault(dates, len(self.date_sets))
+
+
+def to_bytes(cronees: Iterable[SimpleCronee]) -> bytes:
+    """
+    Serialize cronees to the binary format.
+
+    :param cronees: the cronees. Equal cronees are stored once.
+    :return: the serialized cronees
+    :raises: CroneeValueError, if a cronee has dynamic validators other than the `#` index ones, a timezone other than
+        a zoneinfo or a fixed one, or an offset which is not a whole number of seconds.
+    """
+    tables, records, entries = _compile(cronees)
+    data = bytearray(HEADER.pack(MAGIC, VERSION, len(tables.timezones), len(tables.date_sets), len(records),
+                                 len(entries)))
+    for name in tables.timezones:
+        encoded = name.encode()
+        data += LENGTH.pack(len(encoded)) + encoded
+    for dates in tables.date_sets:
+        data += LENGTH.pack(len(dates)) + struct.pack(f'<{len(dates)}I', *dates.ordinals)
+    for record in records:
+        flags = (FLAG_SECONDS if record.second_mask is not None else 0) \
+            | (FLAG_YEARS if record.years is not None else 0)
+        data += RECORD.pack(*record.masks, record.second_mask or 0, record.offset, flags,
+                            NONEXISTENT_CODES.index(record.nonexistent), AMBIGUOUS_CODES.index(record.ambiguous),
+                            _reference(record.timezone), _reference(record.excluded_dates),
+                            _reference(record.included_dates), len(record.validators), len(record.years or ()))
+        for validator in record.validators:
+            data += VALIDATOR.pack(*validator)
+        for years in record.years or ():
+            data += YEAR_RANGE.pack(*years)
+    data += struct.pack(f'<{len(entries)}I', *entries)
+    return bytes(data)
+
+
+def from_bytes(data: bytes) -> list[SimpleCronee]:
+    """
+    Load cronees from the binary format, without parsing any expression.
+
+    :param data: the serialized cronees
+    :return: the cronees, in the order they were serialized. Equal cronees are the same instance.
+    :raises: CroneeValueError, if the data is not a valid serialization of a supported version.
+    """
+    try:
+        magic, version, timezone_count, date_set_count, record_count, entry_count = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise CroneeValueError(f"The data is not a serialization of cronees of version {VERSION}")
+        position = HEADER.size
+        timezones = []
+        for _ in range(timezone_count):
+            length, = LENGTH.unpack_from(data, position)
+            position += LENGTH.size
+            timezones.append(_timezone(bytes(data[position:position + length]).decode()))
+            position += length
+        date_sets = []
+        for _ in range(date_set_count):
+            length, = LENGTH.unpack_from(data, position)
+            position += LENGTH.size
+            date_sets.append(DateSet(struct.unpack_from(f'<{length}I', data, position)))
+            position += length * ORDINAL_SIZE
+        cronees = []
+        for _ in range(record_count):
+            *masks, second_mask, offset, flags, nonexistent, ambiguous, tz, excluded_dates, included_dates, \
+                validator_count, year_count = RECORD.unpack_from(data, position)
+            position += RECORD.size
+            validators = tuple(VALIDATOR.unpack_from(data, position + index * VALIDATOR.size)
+                               for index in range(validator_count))
+            position += validator_count * VALIDATOR.size
+            years = tuple(YEAR_RANGE.unpack_from(data, position + index * YEAR_RANGE.size)
+                          for index in range(year_count))
+            position += year_count * YEAR_RANGE.size
+            record = CompiledRecord(tuple(masks), second_mask if flags & FLAG_SECONDS else None, offset, validators,
+                                    years if flags & FLAG_YEARS else None, _dereference(tz),
+                                    NONEXISTENT_CODES[nonexistent], AMBIGUOUS_CODES[ambiguous],
+                                    _dereference(excluded_dates), _dereference(included_dates))
+            cronees.append(_build(record, timezones, date_sets))
+        entries = struct.unpack_from(f'<{entry_count}I', data, position)
+        if position + entry_count * ENTRY_SIZE != len(data):
+            raise CroneeValueError("Unexpected data after the entries")
+        return [_item(cronees, entry) for entry in entries]
+    except (struct.error, IndexError, KeyError, ValueError) as error:
+        raise CroneeValueError(f"Invalid serialization of cronees: {error}") from None
+
+
+def to_json(cronees: Iterable[SimpleCronee]) -> str:
+    """
+    Serialize cronees to JSON.
+
+    :param cronees: the cronees. Equal cronees are stored once.
+    :return: the JSON document
+    :raises: CroneeValueError, if a cronee has dynamic validators other than the `#` index ones, a timezone other than
+        a zoneinfo or a fixed one, or an offset which is not a whole number of seconds.
+    """
+    tables, records, entries = _compile(cronees)
+    return json.dumps({
+        'format': JSON_FORMAT,
+        'version': VERSION,
+        'timezones': list(tables.timezones),
+        'date_sets': [list(dates.ordinals) for dates in tables.date_sets],
+        'cronees': [{
+            'minutes': record.masks[0],
+            'hours': record.masks[1],
+            'doms': record.masks[2],
+            'months': record.masks[3],
+            'dows': record.masks[4],
+            'seconds': record.second_mask,
+            'offset': record.offset,
+            'index_validators': [list(validator) for validator in record.validators],
+            'years': None if record.years is None else [list(years) for years in record.years],
+            'timezone': record.timezone,
+            'nonexistent': record.nonexistent,
+            'ambiguous': record.ambiguous,
+            'excluded_dates': record.excluded_dates,
+            'included_dates': record.included_dates,
+        } for record in records],
+        'entries': entries,
+    }, separators=(',', ':'))
+
+
+def from_json(text: str) -> list[SimpleCronee]:
+    """
+    Load cronees from JSON, without parsing any expression.
+
+    :param text: the JSON document
+    :return: the cronees, in the order they were serialized. Equal cronees are the same instance.
+    :raises: CroneeValueError, if the document is not a valid serialization of a supported version.
+    """
+    try:
+        document = json.loads(text)
+        if document.get('format') != JSON_FORMAT or document.get('version') != VERSION:
+            raise CroneeValueError(f"The document is not a serialization of cronees of version {VERSION}")
+        timezones = [_timezone(name) for name in document['timezones']]
+        date_sets = [DateSet(tuple(ordinals)) for ordinals in document['date_sets']]
+        cronees = [_build(CompiledRecord(
+            (item['minutes'], item['hours'], item['doms'], item['months'], item['dows']),
+            item['seconds'],
+            item['offset'],
+            tuple(tuple(validator) for validator in item['index_validators']),
+            None if item['years'] is None else tuple(tuple(years) for years in item['years']),
+            item['timezone'],
+            item['nonexistent'],
+            item['ambiguous'],
+            item['excluded_dates'],
+            item['included_dates'],
+        ), timezones, date_sets) for item in document['cronees']]
+        return [_item(cronees, entry) for entry in document['entries']]
+    except (AttributeError, IndexError, KeyError, TypeError, ValueError) as error:
+        raise CroneeValueError(f"Invalid serialization of cronees: {error!r}") from None
+
+
+def _compile(cronees: Iterable[SimpleCronee]) -> tuple[_Tables, list[CompiledRecord], list[int]]:
+    """ Tables, records of the distinct cronees, and position of the record of each cronee """
+    tables = _Tables()
+    positions: dict[SimpleCronee, int] = {}
+    records = []
+    entries = []
+    for cronee in cronees:
+        if not isinstance(cronee, SimpleCronee):
+            raise CroneeValueError(f"Only SimpleCronee instances can be serialized, got {type(cronee).__name__}")
+        position = positions.get(cronee)
+        if position is None:
+            position = positions[cronee] = len(records)
+            records.append(_record(cronee, tables))
+        entries.append(position)
+    return tables, records, entries
+
+
+def _record(cronee: SimpleCronee, tables: _Tables) -> CompiledRecord:
+    offset = cronee.offset // timedelta(seconds=1)
+    if offset * timedelta(seconds=1) != cronee.offset:
+        raise CroneeValueError(f"The offset {cronee.offset} is not a whole number of seconds")
+    validators = []
+    for field, (spec, field_validators) in enumerate(zip(FIELD_SPECS, cronee.other_validators)):
+        for validator in field_validators:
+            if not isinstance(validator, BoundIndexValidator) or validator.function is not spec.index_validator:
+                raise CroneeValueError(f"The validator {validator!r} of the {spec.name} field cannot be serialized")
+            validators.append((field, validator.index, values_to_mask(validator.values)))
+    return CompiledRecord(
+        (cronee.minute_mask, cronee.hour_mask, cronee.dom_mask, cronee.month_mask, cronee.dow_mask),
+        None if cronee.seconds is None else cronee.second_mask,
+        offset,
+        tuple(validators),
+        None if cronee.years is None else _year_ranges(cronee.years),
+        tables.timezone(cronee.timezone),
+        cronee.nonexistent,
+        cronee.ambiguous,
+        tables.date_set(cronee.excluded_dates),
+        tables.date_set(cronee.included_dates),
+    )
+
+
+def _build(record: CompiledRecord, timezones: list[tzinfo], date_sets: list[DateSet]) -> SimpleCronee:
+    """
+    Cronee of a record, restored from its masks without compiling its fields nor analyzing it. Equal cronees are
+    interned into the same instance.
+    """
+    for mask, valid_mask, spec in zip(record.masks, FIELD_MASKS, FIELD_SPECS):
+        if mask & ~valid_mask:
+            raise CroneeValueError(f"Invalid values in the mask {mask:#x} of the {spec.name} field")
+    if record.second_mask is not None and record.second_mask & ~SECOND_MASK:
+        raise CroneeValueError(f"Invalid values in the mask {record.second_mask:#x} of the second field")
+    validators = [[] for _ in FIELD_SPECS]
+    for field, index, mask in record.validators:
+        spec = FIELD_SPECS[field]
+        if spec.index_validator is None or index not in spec.index_range or mask & ~FIELD_MASKS[field]:
+            raise CroneeValueError(f"Invalid index validator {index} of the {spec.name} field")
+        validators[field].append(BoundIndexValidator(spec.index_validator, index, mask_to_values(mask)))
+    years = None
+    if record.years is not None:
+        if not all(FIRST_YEAR <= first <= last <= LAST_YEAR for first, last in record.years):
+            raise CroneeValueError(f"Invalid ranges of years {record.years}")
+        years = frozenset(year for first, last in record.years for year in range(first, last + 1))
+    return restore_cronee(
+        *record.masks,
+        offset=timedelta(seconds=record.offset),
+        other_validators=validators,
+        timezone=None if record.timezone is None else _item(timezones, record.timezone),
+        nonexistent=record.nonexistent,
+        ambiguous=record.ambiguous,
+        excluded_dates=None if record.excluded_dates is None else _item(date_sets, record.excluded_dates),
+        included_dates=None if record.included_dates is None else _item(date_sets, record.included_dates),
+        second_mask=record.second_mask,
+        years=years
+    )
+
+
+def _year_ranges(years: frozenset[int]) -> tuple[tuple[int, int], ...]:
+    """ Runs of consecutive years, first and last years included """
+    ranges = []
+    for year in sorted(years):
+        if ranges and ranges[-1][1] == year - 1:
+            ranges[-1][1] = year
+        else:
+            ranges.append([year, year])
+    return tuple((first, last) for first, last in ranges)
+
+
+def _timezone_name(tz: tzinfo) -> str:
+    """ Key of a zoneinfo timezone, or offset in seconds of a fixed timezone """
+    key = getattr(tz, 'key', None)
+    if key is not None:
+        return key
+    if isinstance(tz, timezone):
+        return str(tz.utcoffset(None) // timedelta(seconds=1))
+    raise CroneeValueError(f"The timezone {tz!r} cannot be serialized")
+
+
+def _timezone(name: str) -> tzinfo:
+    if name.lstrip('+-').isdigit():
+        return timezone(timedelta(seconds=int(name)))
+    return ZoneInfo(name)
+
+
+def _item(items: list, position: int):
+    """ Item of a table at a position read from the data, which must not be negative """
+    if not isinstance(position, int) or not 0 <= position < len(items):
+        raise CroneeValueError(f"Invalid reference {position!r} to a table of {len(items)} items")
+    return items[position]
+
+
+def _reference(position: Optional[int]) -> int:
+    """ Position in a table as stored in a binary record, 0 standing for None """
+    return 0 if position is None else position + 1
+
+
+def _dereference(reference: int) -> Optional[int]:
+    return None if reference == 0 else reference - 1
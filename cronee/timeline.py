@@ -0,0 +1,206 @@
+"""
+Materialized occurrence timelines.
+
+A timeline file holds the occurrences of many expressions over a time window, as int64 epoch seconds, so that workers
+can share precomputed firing timelines through a memory map instead of each recomputing them.
+
+Layout of the file, little-endian:
+
+- header: magic, version, number of expressions, start and end of the window (epoch seconds)
+- index: one entry per expression, sorted by key: the 16 bytes key of the expression, then the position (in
+  occurrences from the start of the data) and the number of its occurrences. The key is the content hash of the cronee
+  parsed from the expression, so a timeline written with a parser, for instance in a timezone, is only read back with
+  a parser giving the same schedules.
+- data: the occurrences of every expression, as int64, 8 bytes aligned
+"""
+import contextlib
+import mmap
+import os
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from datetime import datetime, timezone, timedelta
+from typing import Callable, Iterable, Iterator, Optional, Union, TYPE_CHECKING
+
+from .cronee import Cronee
+from .parser import parse_expression
+
+if TYPE_CHECKING:
+    import numpy
+
+MAGIC = b'CRONEETL'
+VERSION = 2
+HEADER = struct.Struct('<8sIIqq')
+INDEX_ENTRY = struct.Struct('<16sQQ')
+KEY_SIZE = 16
+OCCURRENCE_SIZE = 8
+
+EPOCH = datetime(1970, 1, 1)
+UTC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+Instant = Union[datetime, int]
+
+
+Parser = Callable[[str], Cronee]
+
+
+def expression_key(expression: str, parser: Parser = parse_expression) -> bytes:
+    """
+    Compute the key of an expression in a timeline file: the content hash of the cronee parsed from it. Equivalent
+    spellings of an expression share the same key, and the same expression parsed with different semantics, such as
+    another timezone, does not.
+
+    :param expression: A string representing the cron-like expression.
+    :param parser: (optional) function used to parse the expression
+    :return: the 16 bytes key of the expression
+    :raises: CroneeValueError, if the cronee has no canonical form, see cronee.canonical.
+    """
+    return bytes.fromhex(parser(expression).content_hash)
+
+
+def to_epoch(instant: Instant) -> int:
+    """Convert a datetime to epoch seconds. A naive datetime is read as a UTC wall time, as in `iter_ts`."""
+    if isinstance(instant, int):
+        return instant
+    epoch = EPOCH if instant.tzinfo is None else UTC_EPOCH
+    return (instant - epoch) // timedelta(seconds=1)
+
+
+def write_timeline(path: Union[str, os.PathLike], expressions: Iterable[str], start: Instant, end: Instant,
+                   parser: Parser = parse_expression) -> int:
+    """
+    Expand expressions over a time window and persist their occurrences to a timeline file.
+
+    The file is written next to its destination then renamed, so readers never see a partially written timeline. The
+    temporary file is removed if the writing fails.
+
+    :param path: path of the timeline file
+    :param expressions: the expressions to expand. Duplicated expressions are stored once.
+    :param start: start of the window, included, as a datetime or epoch seconds
+    :param end: end of the window, excluded, as a datetime or epoch seconds
+    :param parser: function used to parse the expressions, for instance to parse them in a timezone. The timeline is
+        read with the same parser.
+    :return: the number of expressions stored
+    :raises: CroneeValueError, if the cronee of an expression has no canonical form, see cronee.canonical.
+    """
+    start, end = to_epoch(start), to_epoch(end)
+    timelines = {}
+    for expression in expressions:
+        cronee = parser(expression)
+        key = bytes.fromhex(cronee.content_hash)
+        if key not in timelines:
+            timelines[key] = array('q', cronee.iter_ts(start, end))
+
+    keys = sorted(timelines)
+    index = bytearray()
+    position = 0
+    for key in keys:
+        index += INDEX_ENTRY.pack(key, position, len(timelines[key]))
+        position += len(timelines[key])
+    padding = -(HEADER.size + len(index)) % OCCURRENCE_SIZE
+
+    temporary = f'{os.fspath(path)}.{os.getpid()}.tmp'
+    try:
+        with open(temporary, 'wb') as file:
+            file.write(HEADER.pack(MAGIC, VERSION, len(keys), start, end))
+            file.write(index)
+            file.write(bytes(padding))
+            for key in keys:
+                occurrences = timelines[key]
+                if sys.byteorder != 'little':
+                    occurrences.byteswap()
+                file.write(occurrences.tobytes())
+        os.replace(temporary, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.remove(temporary)
+        raise
+    return len(keys)
+
+
+class Timeline:
+    """Read-only, memory-mapped view of a timeline file. The occurrences are returned without being copied."""
+
+    def __init__(self, path: Union[str, os.PathLike], parser: Parser = parse_expression):
+        """
+        :param path: path of the timeline file
+        :param parser: (optional) function used to parse the expressions looked up, the one the timeline was written
+            with
+        :raises: ValueError, if the file is not a timeline file of a supported version.
+        """
+        self._parser = parser
+        self._expression_keys: dict[str, bytes] = {}
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, count, self.start, self.end = HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != VERSION:
+            self._map.close()
+            raise ValueError(f"{os.fspath(path)} is not a timeline file of version {VERSION}")
+        if sys.byteorder != 'little':
+            self._map.close()
+            raise ValueError("Timeline files can only be mapped on little-endian platforms")
+        index_end = HEADER.size + count * INDEX_ENTRY.size
+        self._keys = [self._map[position:position + KEY_SIZE]
+                      for position in range(HEADER.size, index_end, INDEX_ENTRY.size)]
+        self._data_start = index_end + -index_end % OCCURRENCE_SIZE
+
+    def occurrences(self, expression: str) -> memoryview:
+        """
+        Get the occurrences of an expression within the window of the timeline.
+
+        :param expression: A string representing the cron-like expression.
+        :return: a read-only view of the occurrences, as int64 epoch seconds
+        :raises: KeyError, if the expression is not stored in the timeline.
+        :raises: CroneeParseError, if the expression is invalid.
+        """
+        position = self._position(expression)
+        if position is None:
+            raise KeyError(expression)
+        _, first, length = INDEX_ENTRY.unpack_from(self._map, HEADER.size + position * INDEX_ENTRY.size)
+        start = self._data_start + first * OCCURRENCE_SIZE
+        return memoryview(self._map)[start:start + length * OCCURRENCE_SIZE].cast('q')
+
+    def array(self, expression: str) -> 'numpy.ndarray':
+        """
+        Get the occurrences of an expression as a read-only numpy array sharing the memory map. Requires numpy.
+
+        :param expression: A string representing the cron-like expression.
+        :return: an int64 numpy array of epoch seconds
+        :raises: KeyError, if the expression is not stored in the timeline.
+        """
+        import numpy as np
+        return np.frombuffer(self.occurrences(expression), dtype='<i8')
+
+    def close(self):
+        """
+        Release the memory map.
+
+        :raises: BufferError, if views returned by `occurrences` or `array` are still alive.
+        """
+        self._map.close()
+
+    def _position(self, expression: str) -> Optional[int]:
+        """ Binary search of the key of the expression in the index """
+        key = self._expression_keys.get(expression)
+        if key is None:
+            key = self._expression_keys[expression] = expression_key(expression, self._parser)
+        position = bisect_left(self._keys, key)
+        if position == len(self._keys) or self._keys[position] != key:
+            return None
+        return position
+
+    def __contains__(self, expression: str) -> bool:
+        return self._position(expression) is not None
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __iter__(self) -> Iterator[bytes]:
+        return iter(self._keys)
+
+    def __enter__(self) -> 'Timeline':
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,305 @@
+"""
+Timezone-aware evaluation of cronees.
+
+A zoned cronee matches its fields against the wall time of its timezone. The occurrences are searched in wall time
+with the field-skipping search, then mapped to instants. The wall times around the daylight saving transitions are
+detected with per-year transition tables, so the search never falls back to minute stepping:
+
+- a wall time skipped by a transition (nonexistent) is either dropped or shifted to the first instant after the gap.
+- a wall time repeated by a transition (ambiguous) fires at its first instance, its second one or both.
+"""
+from collections import deque
+from datetime import datetime, timedelta, timezone, tzinfo
+from functools import lru_cache
+from typing import Iterator, NamedTuple, Optional, TYPE_CHECKING
+
+from .helpers import DEFAULT_MAX_CANDIDATES, sub_resolution
+
+if TYPE_CHECKING:
+    from .cronee import SimpleCronee
+
+NONEXISTENT_SKIP = 'skip'
+NONEXISTENT_SHIFT = 'shift'
+NONEXISTENT_POLICIES = (NONEXISTENT_SKIP, NONEXISTENT_SHIFT)
+
+AMBIGUOUS_EARLIEST = 'earliest'
+AMBIGUOUS_LATEST = 'latest'
+AMBIGUOUS_BOTH = 'both'
+AMBIGUOUS_POLICIES = (AMBIGUOUS_EARLIEST, AMBIGUOUS_LATEST, AMBIGUOUS_BOTH)
+
+ONE_DAY = timedelta(days=1)
+ONE_MINUTE = timedelta(minutes=1)
+
+
+class Transition(NamedTuple):
+    """Change of the UTC offset of a timezone."""
+
+    instant: datetime
+    """Aware UTC datetime of the transition"""
+    before: timedelta
+    """UTC offset before the transition"""
+    after: timedelta
+    """UTC offset after the transition"""
+
+    @property
+    def is_gap(self) -> bool:
+        """True if the wall clock jumps forward, skipping wall times."""
+        return self.after > self.before
+
+    @property
+    def wall_start(self) -> datetime:
+        """First wall time, naive, skipped or repeated by the transition."""
+        return self.instant.replace(tzinfo=None) + min(self.before, self.after)
+
+    @property
+    def wall_end(self) -> datetime:
+        """First wall time, naive, after the wall times skipped or repeated by the transition."""
+        return self.instant.replace(tzinfo=None) + max(self.before, self.after)
+
+    @property
+    def instant_end(self) -> datetime:
+        """End of the period during which the wall time is repeated. Equal to the instant for a gap."""
+        return self.instant + max(self.before - self.after, timedelta())
+
+
+def _utcoffset(tz: tzinfo, instant: datetime) -> timedelta:
+    return instant.astimezone(tz).utcoffset()
+
+
+@lru_cache(maxsize=1024)
+def transitions(tz: tzinfo, year: int) -> tuple[Transition, ...]:
+    """
+    Compute the transitions of a timezone happening during a year (in UTC), to the minute.
+
+    :param tz: the timezone
+    :param year: the year
+    :return: the transitions ordered by instant
+    """
+    instant = datetime(year, 1, 1, tzinfo=timezone.utc)
+    end = datetime(year + 1, 1, 1, tzinfo=timezone.utc)
+    offset = _utcoffset(tz, instant)
+    result = []
+    while instant < end:
+        following = min(instant + ONE_DAY, end)
+        following_offset = _utcoffset(tz, following)
+        if following_offset != offset:
+            low, high = instant, following
+            while high - low > ONE_MINUTE:
+                middle = low + (high - low) // 2
+                middle = middle.replace(second=0, microsecond=0)
+                if middle <= low:
+                    break
+                if _utcoffset(tz, middle) == offset:
+                    low = middle
+                else:
+                    high = middle
+            result.append(Transition(high, offset, following_offset))
+        instant, offset = following, following_offset
+    return tuple(result)
+
+
+def transition_at(tz: tzinfo, wall: datetime) -> Optional[Transition]:
+    """
+    Find the transition skipping or repeating the naive wall time, if any.
+
+    :param tz: the timezone
+    :param wall: the naive wall time
+    :return: the transition whose wall time window contains the wall time, or None
+    """
+    years = (wall.year - 1, wall.year, wall.year + 1) if wall.month in (1, 12) else (wall.year,)
+    for year in years:
+        for transition in transitions(tz, year):
+            if transition.wall_start <= wall < transition.wall_end:
+                return transition
+    return None
+
+
+def _gap_ending_at(tz: tzinfo, wall: datetime) -> Optional[Transition]:
+    for transition in transitions(tz, wall.year):
+        if transition.is_gap and transition.wall_end == wall.replace(second=0, microsecond=0):
+            return transition
+    return None
+
+
+def to_instant(tz: tzinfo, dtime: datetime) -> datetime:
+    """Interpret a naive datetime as a wall time of the timezone, or convert an aware datetime to the timezone."""
+    if dtime.tzinfo is None:
+        return dtime.replace(tzinfo=tz)
+    return dtime.astimezone(tz)
+
+
+def validate_zoned(cronee: 'SimpleCronee', dtime: datetime) -> bool:
+    """
+    Check if an instant validates a zoned cronee.
+
+    :param cronee: the zoned cronee
+    :param dtime: an aware datetime, or a naive datetime interpreted as a wall time of the timezone of the cronee
+    :return: True if the datetime validates the cronee
+    """
+    tz = cronee.timezone
+    local = _utc(to_instant(tz, dtime)).astimezone(tz)
+    wall = local.replace(tzinfo=None)
+    transition = transition_at(tz, wall)
+    if transition is not None and not transition.is_gap:
+        if local.fold == 0 and cronee.ambiguous == AMBIGUOUS_LATEST:
+            return False
+        if local.fold == 1 and cronee.ambiguous == AMBIGUOUS_EARLIEST:
+            return False
+    if cronee.wall_cronee.validate(wall):
+        return True
+    if cronee.nonexistent == NONEXISTENT_SHIFT:
+        gap = _gap_ending_at(tz, wall)
+        if gap is not None and wall.second == 0 and wall.microsecond == 0:
+            return next(cronee.wall_cronee.iter_occurrences(gap.wall_start, gap.wall_end), None) is not None
+    return False
+
+
+def _to_instant(cronee: 'SimpleCronee', wall: datetime, fold: int) -> Optional[datetime]:
+    """ Map a valid wall time to the instant at which it fires, or None if it is skipped """
+    tz = cronee.timezone
+    transition = transition_at(tz, wall)
+    if transition is None:
+        return wall.replace(tzinfo=tz)
+    if not transition.is_gap:
+        return wall.replace(tzinfo=tz, fold=fold)
+    if cronee.nonexistent == NONEXISTENT_SKIP:
+        return None
+    return transition.instant.astimezone(tz)
+
+
+def _fold_transitions(tz: tzinfo, year: int) -> list[Transition]:
+    return [transition for transition in transitions(tz, year) if not transition.is_gap]
+
+
+def _utc(instant: datetime) -> datetime:
+    """ Aware datetimes sharing a tzinfo are compared by wall time, so instants are compared in UTC """
+    return instant.astimezone(timezone.utc)
+
+
+def iter_zoned_occurrences(cronee: 'SimpleCronee', start: datetime, end: datetime = None,
+                           max_candidates: int = DEFAULT_MAX_CANDIDATES) -> Iterator[datetime]:
+    """
+    Lazily iterate over the instants validating a zoned cronee, from start included to end excluded.
+
+    The wall times are searched with the field-skipping search of the wall cronee. Their first instances are mapped to
+    instants in order; when the second instances of the ambiguous wall times fire too, they are searched within the
+    repeated windows of the transitions and merged in.
+
+    :param cronee: the zoned cronee
+    :param start: datetime from which the search starts. A naive datetime is a wall time of the timezone.
+    :param end: (optional) datetime at which the iteration stops
+    :param max_candidates: maximum number of candidates examined by the search of each wall time
+    :return: an iterator over the aware datetimes, in the timezone of the cronee
+    """
+    tz = cronee.timezone
+    start = to_instant(tz, start)
+    start_utc = _utc(start)
+    end_utc = None if end is None else _utc(to_instant(tz, end))
+    wall = start.replace(tzinfo=None)
+    remainder = sub_resolution(wall, cronee.resolution)
+    fold = 1 if cronee.ambiguous == AMBIGUOUS_LATEST else 0
+    transition = transition_at(tz, wall)
+    if transition is not None and not transition.is_gap and start.fold == 0 and fold == 1:
+        wall = transition.wall_start + remainder
+
+    pending = deque()
+    year = start.year - 1
+    previous = None
+    wall_end = None if end_utc is None else end_utc.astimezone(tz).replace(tzinfo=None) + ONE_DAY
+    for candidate in cronee.wall_cronee.iter_occurrences(wall, wall_end, max_candidates):
+        instant = _to_instant(cronee, candidate, fold)
+        if instant is None:
+            continue
+        instant_utc = _utc(instant)
+        if instant_utc < start_utc:
+            continue
+        if cronee.ambiguous == AMBIGUOUS_BOTH:
+            while year <= instant.year:
+                for transition in _fold_transitions(tz, year):
+                    for repeated in cronee.wall_cronee.iter_occurrences(transition.wall_start + remainder,
+                                                                        transition.wall_end):
+                        repeated = repeated.replace(tzinfo=tz, fold=1)
+                        if _utc(repeated) >= start_utc:
+                            pending.append((_utc(repeated), repeated))
+                year += 1
+            while pending and pending[0][0] <= instant_utc:
+                repeated_utc, repeated = pending.popleft()
+                if end_utc is not None and repeated_utc >= end_utc:
+                    return
+                if repeated_utc != previous:
+                    previous = repeated_utc
+                    yield repeated
+        if end_utc is not None and instant_utc >= end_utc:
+            return
+        if instant_utc != previous:
+            previous = instant_utc
+            yield instant
+    for repeated_utc, repeated in pending:
+        if end_utc is not None and repeated_utc >= end_utc:
+            return
+        if repeated_utc != previous:
+            previous = repeated_utc
+            yield repeated
+
+
+def iter_previous_zoned_occurrences(cronee: 'SimpleCronee', start: datetime, end: datetime = None,
+                                    max_candidates: int = DEFAULT_MAX_CANDIDATES) -> Iterator[datetime]:
+    """
+    Lazily iterate backwards over the instants validating a zoned cronee, from start included to end excluded.
+
+    :param cronee: the zoned cronee
+    :param start: datetime from which the search starts. A naive datetime is a wall time of the timezone.
+    :param end: (optional) datetime, before start, at which the iteration stops
+    :param max_candidates: maximum number of candidates examined by the search of each wall time
+    :return: an iterator over the aware datetimes, latest first, in the timezone of the cronee
+    """
+    tz = cronee.timezone
+    start = to_instant(tz, start)
+    start_utc = _utc(start)
+    end_utc = None if end is None else _utc(to_instant(tz, end))
+    wall = start.replace(tzinfo=None)
+    remainder = sub_resolution(wall, cronee.resolution)
+    fold = 1 if cronee.ambiguous == AMBIGUOUS_LATEST else 0
+    transition = transition_at(tz, wall)
+    if transition is not None and not transition.is_gap and start.fold == 1 and fold == 0:
+        wall = transition.wall_end - cronee.resolution + remainder
+
+    pending = deque()
+    year = start.year + 1
+    previous = None
+    wall_end = None if end_utc is None else end_utc.astimezone(tz).replace(tzinfo=None) - ONE_DAY
+    for candidate in cronee.wall_cronee.iter_previous_occurrences(wall, wall_end, max_candidates):
+        instant = _to_instant(cronee, candidate, fold)
+        if instant is None:
+            continue
+        instant_utc = _utc(instant)
+        if instant_utc > start_utc:
+            continue
+        if cronee.ambiguous == AMBIGUOUS_BOTH:
+            while year >= instant.year:
+                for transition in reversed(_fold_transitions(tz, year)):
+                    for repeated in cronee.wall_cronee.iter_previous_occurrences(
+                            transition.wall_end - cronee.resolution + remainder,
+                            transition.wall_start - cronee.resolution):
+                        repeated = repeated.replace(tzinfo=tz, fold=1)
+                        if _utc(repeated) <= start_utc:
+                            pending.append((_utc(repeated), repeated))
+                year -= 1
+            while pending and pending[0][0] >= instant_utc:
+                repeated_utc, repeated = pending.popleft()
+                if end_utc is not None and repeated_utc <= end_utc:
+                    return
+                if repeated_utc != previous:
+                    previous = repeated_utc
+                    yield repeated
+        if end_utc is not None and instant_utc <= end_utc:
+            return
+        if instant_utc != previous:
+            previous = instant_utc
+            yield instant
+    for repeated_utc, repeated in pending:
+        if end_utc is not None and repeated_utc <= end_utc:
+            return
+        if repeated_utc != previous:
+            previous = repeated_utc
+            yield repeated
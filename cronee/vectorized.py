@@ -0,0 +1,218 @@
+"""
+Vectorized evaluation of cronees over numpy arrays of timestamps.
+
+This module requires numpy, which is an optional dependency of cronee.
+"""
+from datetime import datetime, timedelta, timezone
+from bisect import bisect_right
+from itertools import repeat
+
+import numpy as np
+
+from .cronee import Cronee, SimpleCronee, Validator, BoundIndexValidator, dow_index_validator, MINUTE_VALIDATORS, \
+    HOUR_VALIDATORS, DOM_VALIDATORS, MONTH_VALIDATORS, DOW_VALIDATORS, EPOCH_ORDINAL, resolution_of
+from .date_sets import DateSet
+from .exceptions import CroneeSearchBudgetError
+from .timezones import transitions, AMBIGUOUS_EARLIEST, AMBIGUOUS_LATEST, NONEXISTENT_SHIFT
+
+UNIX_EPOCH_ISOWEEKDAY = 4  # 1970-01-01 was a thursday
+UNIX_EPOCH_YEAR = 1970
+UNIT_SECONDS = {'s': 1, 'm': 60}
+ONE_MINUTE = timedelta(minutes=1)
+MAX_SKIPPED_OCCURRENCES = 4  # beyond, an occurrence stream restarts at the next start instead of walking to it
+
+
+def to_minutes(timestamps) -> np.ndarray:
+    """
+    Convert an array of timestamps to an array of datetime64 truncated to the minute.
+
+    :param timestamps: array of numpy.datetime64 or array of epoch seconds
+    :return: an array of numpy.datetime64[m]
+    """
+    return to_units(timestamps, 'm')
+
+
+def to_units(timestamps, unit: str) -> np.ndarray:
+    """
+    Convert an array of timestamps to an array of datetime64 truncated to a unit, the second or the minute.
+
+    :param timestamps: array of numpy.datetime64 or array of epoch seconds
+    :param unit: 's' or 'm'
+    :return: an array of numpy.datetime64 of the unit
+    """
+    timestamps = np.asarray(timestamps)
+    if np.issubdtype(timestamps.dtype, np.datetime64):
+        return timestamps.astype(f'datetime64[{unit}]')
+    if np.issubdtype(timestamps.dtype, np.number):
+        return (np.floor_divide(timestamps, UNIT_SECONDS[unit])).astype('int64').astype(f'datetime64[{unit}]')
+    raise TypeError(f"Expected an array of datetime64 or epoch seconds, got an array of {timestamps.dtype}")
+
+
+def _unit(cronee: Cronee) -> str:
+    """ numpy unit of the resolution of a cronee """
+    return 's' if resolution_of(cronee) < ONE_MINUTE else 'm'
+
+
+def decompose(minutes: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Decompose an array of datetime64[m] into its civil fields.
+
+    :param minutes: array of numpy.datetime64[m]
+    :return: a tuple of arrays (minute, hour, day, month, isoweekday)
+    """
+    epoch_minutes = minutes.astype('int64')
+    days = minutes.astype('datetime64[D]')
+    months = minutes.astype('datetime64[M]')
+    minute = epoch_minutes % 60
+    hour = epoch_minutes // 60 % 24
+    day = (days - months.astype('datetime64[D]')).astype('int64') + 1
+    month = months.astype('int64') % 12 + 1
+    isoweekday = (days.astype('int64') + UNIX_EPOCH_ISOWEEKDAY - 1) % 7 + 1
+    return minute, hour, day, month, isoweekday
+
+
+def mask_lookup(mask: int, size: int) -> np.ndarray:
+    """ Build a boolean lookup table from a field bitmask """
+    return np.array([bool(mask >> value & 1) for value in range(size)])
+
+
+def validate_many(cronee: SimpleCronee, timestamps) -> np.ndarray:
+    """
+    Validate an array of timestamps against a cronee.
+
+    :param cronee: the cronee to check the timestamps against
+    :param timestamps: array of numpy.datetime64 or array of epoch seconds. They are UTC instants for a zoned cronee.
+    :return: a boolean array, True where the timestamp validates the cronee
+    """
+    unit = _unit(cronee)
+    if cronee.wall_cronee is not None:
+        return _validate_many_zoned(cronee, to_units(timestamps, unit))
+    shifted = to_units(timestamps, unit) + np.timedelta64(cronee.offset // timedelta(seconds=UNIT_SECONDS[unit]), unit)
+    minutes = shifted.astype('datetime64[m]')
+    fields = decompose(minutes)
+    masks = (cronee.minute_mask, cronee.hour_mask, cronee.dom_mask, cronee.month_mask, cronee.dow_mask)
+    sizes = (60, 24, 32, 13, 8)
+    result = np.ones(minutes.shape, dtype=bool)
+    for index in (MINUTE_VALIDATORS, HOUR_VALIDATORS, DOM_VALIDATORS, MONTH_VALIDATORS, DOW_VALIDATORS):
+        field_is_valid = mask_lookup(masks[index], sizes[index])[fields[index]]
+        for validator in cronee.other_validators[index]:
+            field_is_valid |= _dynamic_validation(validator, minutes, fields)
+        result &= field_is_valid
+    if cronee.seconds is not None:
+        result &= mask_lookup(cronee.second_mask, 60)[shifted.astype('int64') % 60]
+    if cronee.years is not None:
+        years = minutes.astype('datetime64[Y]').astype('int64') + UNIX_EPOCH_YEAR
+        result &= np.isin(years, np.array(sorted(cronee.years), dtype='int64'))
+    if cronee.excluded_dates is not None or cronee.included_dates is not None:
+        ordinals = minutes.astype('datetime64[D]').astype('int64') + EPOCH_ORDINAL
+        if cronee.excluded_dates is not None:
+            result &= ~_date_membership(cronee.excluded_dates, ordinals)
+        if cronee.included_dates is not None:
+            result &= _date_membership(cronee.included_dates, ordinals)
+    return result
+
+
+def _date_membership(dates: DateSet, ordinals: np.ndarray) -> np.ndarray:
+    """ Check which ordinals belong to a set of dates, with a vectorized binary search """
+    if not dates:
+        return np.zeros(ordinals.shape, dtype=bool)
+    sorted_ordinals = np.array(dates.ordinals, dtype='int64')
+    positions = np.minimum(np.searchsorted(sorted_ordinals, ordinals), len(sorted_ordinals) - 1)
+    return sorted_ordinals[positions] == ordinals
+
+
+def next_occurrence_many(cronee: Cronee, starts) -> np.ndarray:
+    """
+    Compute the next occurrence of a cronee for each start of an array.
+
+    The starts are sorted, then merged with a single stream of occurrences: every start up to an occurrence is answered
+    by it at once with a binary search. When the next start lies many occurrences ahead, the stream restarts at that
+    start instead of walking through the occurrences in between, so distant starts cost one field-skipping search each.
+
+    :param cronee: the cronee
+    :param starts: array of numpy.datetime64 or array of epoch seconds. They are UTC instants for a zoned cronee.
+    :return: an array of the same kind as starts, with the next occurrence of each start, start included, keeping
+        its part below the resolution of the cronee: its seconds within the minute, or its fraction of second
+    :raises: CroneeSearchBudgetError, if a start has no next occurrence, like the ones after the last year of a
+        cronee with a years field.
+    """
+    starts = np.asarray(starts)
+    unit = _unit(cronee)
+    step = UNIT_SECONDS[unit]
+    truncated = to_units(starts, unit)
+    epoch_units = truncated.astype('int64').ravel()
+    order = np.argsort(epoch_units, kind='stable')
+    sorted_units = epoch_units[order].tolist()
+    count = len(sorted_units)
+    occurrences = [0] * count
+    index, gap = 0, None
+    while index < count:
+        stream = cronee.iter_ts(sorted_units[index] * step)
+        occurrence = _next_unit(stream, step, sorted_units[index])
+        while True:
+            stop = bisect_right(sorted_units, occurrence, index)
+            occurrences[index:stop] = repeat(occurrence, stop - index)
+            index = stop
+            if index == count:
+                break
+            if gap is not None and sorted_units[index] - occurrence > MAX_SKIPPED_OCCURRENCES * gap:
+                break
+            previous, occurrence = occurrence, _next_unit(stream, step, sorted_units[index])
+            gap = occurrence - previous
+    result = np.empty(count, dtype='int64')
+    result[order] = occurrences
+    result = result.reshape(starts.shape)
+    if np.issubdtype(starts.dtype, np.datetime64):
+        return result.astype(f'datetime64[{unit}]') + (starts - truncated)
+    return result * step + (starts - truncated.astype('int64') * step)
+
+
+def _next_unit(stream, step: int, start: int) -> int:
+    """ Next occurrence of a stream, in units of the step. The stream of a finite cronee ends after its last one """
+    occurrence = next(stream, None)
+    if occurrence is None:
+        raise CroneeSearchBudgetError(f"No occurrence after {start * step} seconds")
+    return occurrence // step
+
+
+def _dynamic_validation(validator: Validator, minutes: np.ndarray, fields: tuple[np.ndarray, ...]) -> np.ndarray:
+    if isinstance(validator, BoundIndexValidator) and validator.function is dow_index_validator:
+        _, _, day, _, isoweekday = fields
+        return np.isin(isoweekday, list(validator.values)) & ((day + 6) // 7 == validator.index)
+    return np.fromiter((validator(dtime) for dtime in minutes.astype(object).flat), dtype=bool,
+                       count=minutes.size).reshape(minutes.shape)
+
+
+def _validate_many_zoned(cronee: SimpleCronee, instants: np.ndarray) -> np.ndarray:
+    """ Convert the UTC instants to wall times with the transition tables, then apply the DST policies """
+    if instants.size == 0:
+        return np.zeros(instants.shape, dtype=bool)
+    tz = cronee.timezone
+    first_year = int(instants.min().astype('datetime64[Y]').astype('int64')) + 1970
+    last_year = int(instants.max().astype('datetime64[Y]').astype('int64')) + 1970
+    changes = [transition for year in range(first_year, last_year + 1) for transition in transitions(tz, year)]
+    initial_offset = datetime(first_year, 1, 1, tzinfo=timezone.utc).astimezone(tz).utcoffset()
+
+    change_instants = np.array([_to_datetime64(transition.instant) for transition in changes], dtype='datetime64[m]')
+    offsets = np.array([initial_offset // timedelta(minutes=1)]
+                       + [transition.after // timedelta(minutes=1) for transition in changes], dtype='int64')
+    offset = offsets[np.searchsorted(change_instants, instants, side='right')]
+    result = validate_many(cronee.wall_cronee, instants + offset.astype('timedelta64[m]'))
+
+    for transition in changes:
+        instant = _to_datetime64(transition.instant)
+        if transition.is_gap:
+            wall_times = cronee.wall_cronee.iter_occurrences(transition.wall_start, transition.wall_end)
+            if cronee.nonexistent == NONEXISTENT_SHIFT and next(wall_times, None) is not None:
+                result |= instants == instant
+            continue
+        repeated = np.timedelta64((transition.before - transition.after) // timedelta(minutes=1), 'm')
+        if cronee.ambiguous == AMBIGUOUS_EARLIEST:
+            result &= ~((instant <= instants) & (instants < instant + repeated))
+        elif cronee.ambiguous == AMBIGUOUS_LATEST:
+            result &= ~((instant - repeated <= instants) & (instants < instant))
+    return result
+
+
+def _to_datetime64(instant: datetime) -> np.datetime64:
+    return np.datetime64(instant.astimezone(timezone.utc).replace(tzinfo=None), 'm')
@@ -0,0 +1,41 @@
+import io
+import os
+import tempfile
+import unittest
+
+from benchmarks.suite import BENCHMARKS, Comparison, compare, save, load, report
+
+
+class TestBenchmarks(unittest.TestCase):
+    def test_benchmarks_run(self):
+        for name, build in BENCHMARKS.items():
+            with self.subTest(name=name):
+                try:
+                    function = build()
+                except ImportError:
+                    continue
+                function()
+
+    def test_compare(self):
+        comparisons = compare({'a': 1.0, 'b': 2.0, 'c': 1.0}, {'a': 1.1, 'b': 3.0, 'd': 1.0})
+        self.assertEqual([Comparison('a', 1.0, 1.1), Comparison('b', 2.0, 3.0)], comparisons)
+        self.assertFalse(comparisons[0].is_regression(0.2))
+        self.assertTrue(comparisons[1].is_regression(0.2))
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'baseline.json')
+            save(path, {'a': 1.5})
+            self.assertEqual({'a': 1.5}, load(path))
+
+    def test_report_flags_regressions(self):
+        output = io.StringIO()
+        results = {'a': 1.1, 'b': 3.0}
+        report(results, compare({'a': 1.0, 'b': 2.0}, results), 0.2, output)
+        lines = output.getvalue().splitlines()
+        self.assertNotIn('REGRESSION', lines[0])
+        self.assertIn('REGRESSION', lines[1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+from datetime import datetime, timedelta
+
+from cronee import parse_expression
+from cronee.calendar_tables import year_table
+from cronee.cronee import SimpleCronee, DOM_VALIDATORS, MONTH_VALIDATORS, DOW_VALIDATORS
+from cronee.helpers import dom_delta
+
+
+def table_of(cronee: SimpleCronee, year: int):
+    return year_table(cronee.dom_mask, cronee.month_mask, cronee.dow_mask, cronee.other_validators[DOM_VALIDATORS],
+                      cronee.other_validators[MONTH_VALIDATORS], cronee.other_validators[DOW_VALIDATORS], year)
+
+
+def is_even(dtime: datetime) -> bool:
+    return dtime.day % 2 == 0
+
+
+class TestCalendarTables(unittest.TestCase):
+    EXPRESSIONS = [
+        '0 0 * * *',
+        '0 0 31 * *',
+        '0 0 29 FEB *',
+        '0 0 * * FRI#3',
+        '0 0 * * 4,FRI#3,SUN#5',
+        '0 0 13 * FRI',
+        '0 0 !15,1 !JAN,MAR,JUN,OCT *',
+    ]
+
+    def assert_table_matches(self, cronee: SimpleCronee, year: int):
+        table = table_of(cronee, year)
+        day = datetime(year, 1, 1)
+        index = 0
+        while day.year == year:
+            self.assertEqual(cronee.validate(day), bool(table.days >> index & 1), day)
+            day += timedelta(days=1)
+            index += 1
+
+    def test_valid_days(self):
+        for expression in self.EXPRESSIONS:
+            c = parse_expression(expression)
+            for year in (2023, 2024, 2100):
+                with self.subTest(expression=expression, year=year):
+                    self.assert_table_matches(c, year)
+
+    def test_dynamic_validators(self):
+        base = parse_expression('0 0 * * *')
+        c = SimpleCronee(base.minutes, base.hours, frozenset(), base.months, base.dows, timedelta(),
+                         ((), (), (is_even,), (), ()))
+        self.assert_table_matches(c, 2024)
+
+    def test_first_and_last_valid_day(self):
+        table = table_of(parse_expression('0 0 * * FRI#3'), 2023)
+        self.assertEqual(17, table.first_valid_day(11, 1))
+        self.assertIsNone(table.first_valid_day(11, 18))
+        self.assertEqual(17, table.last_valid_day(11, 31))
+        self.assertIsNone(table.last_valid_day(11, 16))
+
+    def test_tables_are_shared(self):
+        self.assertIs(table_of(parse_expression('0 8 * * FRI#3'), 2023),
+                      table_of(parse_expression('*/5 * * * FRI#3'), 2023))
+
+
+class TestDomDelta(unittest.TestCase):
+    def test_same_month(self):
+        self.assertEqual(0, dom_delta({3}, datetime(2023, 2, 3)))
+        self.assertEqual(5, dom_delta({8, 20}, datetime(2023, 2, 3)))
+
+    def test_following_months(self):
+        self.assertEqual(26, dom_delta({1}, datetime(2023, 2, 3)))
+        self.assertEqual(56, dom_delta({31}, datetime(2023, 2, 3)))
+
+    def test_no_valid_day(self):
+        with self.assertRaises(ValueError):
+            dom_delta(set(), datetime(2023, 2, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
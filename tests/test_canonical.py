@@ -0,0 +1,100 @@
+import random
+import unittest
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from cronee import parse_expression, canonical_expression, canonical_form, content_hash, DateSet, CroneeValueError
+from cronee.cronee import SimpleCronee
+
+
+class TestCanonicalExpression(unittest.TestCase):
+    def test_equivalent_spellings(self):
+        spellings = ('*/15 * * * *', '0,15,30,45 * * * *', '0..45/15 * * * *', '0..59/15 0..23 * * MON..SUN',
+                     '45,0,30,15 * 1..31 JAN..DEC *')
+        self.assertEqual({'*/15 * * * *'}, {parse_expression(spelling).canonical_expression for spelling in spellings})
+
+    def test_rendering(self):
+        cases = {
+            '0 8 * * MON..FRI': '0 8 * * 1..5',
+            '0 8 * * !SUN': '0 8 * * !7',
+            '1,2,5,8,11 * * * *': '1,2..11/3 * * * *',
+            '0 */2 * * *': '0 */2 * * *',
+            '0 0 */2 * *': '0 0 */2 * *',
+            '0 0 2..31/2 * *': '0 0 !*/2 * *',
+            '0 8 * * FRI#3,MON#1': '0 8 * * 1#1,5#3',
+            '0 8 * * MON,MON#2,*#5': '0 8 * * 1,*#5',
+            '0 0 * * !*,SAT#1': '0 0 * * 6#1',
+            '0 0 * * !*': '0 0 * * !*',
+            '*/10+5 0 8 * * *': '*/10+5 0 8 * * *',
+            '0 0 8 1 JAN * 2024..2030/2': '0 0 8 1 1 * 2024..2030/2',
+            '0 0 8 1 JAN * *': '0 0 8 1 1 *',
+        }
+        for expression, expected in cases.items():
+            with self.subTest(expression=expression):
+                self.assertEqual(expected, canonical_expression(parse_expression(expression)))
+
+    def test_offset(self):
+        self.assertEqual('0-30 8-1 * * *', parse_expression('0-90 8 * * *').canonical_expression)
+        self.assertEqual('0-30 8 * * *', parse_expression('0+30 8-1 * * *').canonical_expression)
+        self.assertEqual('0 0 1+1 * *', parse_expression('0 0 1 * *+1').canonical_expression)
+        self.assertEqual('0 0 1-365 * *-35', parse_expression('0 0 1-200 * *-200').canonical_expression)
+
+    def test_round_trip(self):
+        generator = random.Random(42)
+        ranges = ((0, 59), (0, 23), (1, 31), (1, 12), (1, 7))
+        for _ in range(500):
+            fields = []
+            for low, high in ranges:
+                values = generator.sample(range(low, high + 1), generator.randint(1, high - low + 1))
+                fields.append(','.join(map(str, values)))
+            cronee = parse_expression(' '.join(fields))
+            with self.subTest(expression=' '.join(fields)):
+                canonical = cronee.canonical_expression
+                self.assertEqual(cronee, parse_expression(canonical))
+                self.assertEqual(canonical, parse_expression(canonical).canonical_expression)
+                self.assertLessEqual(len(canonical), len(' '.join(fields)))
+
+    def test_unrepresentable(self):
+        cronee = SimpleCronee({0}, {8}, set(range(1, 32)), set(range(1, 13)), set(range(1, 8)), timedelta(),
+                              [[lambda dtime: True], [], [], [], []])
+        with self.assertRaises(CroneeValueError):
+            canonical_expression(cronee)
+        cronee = SimpleCronee({0}, {8}, set(range(1, 32)), set(range(1, 13)), set(range(1, 8)), timedelta(seconds=5),
+                              [[], [], [], [], []])
+        with self.assertRaises(CroneeValueError):
+            canonical_expression(cronee)
+
+
+class TestCanonicalForm(unittest.TestCase):
+    def test_attributes(self):
+        paris = ZoneInfo('Europe/Paris')
+        self.assertEqual('0 8 * * *', canonical_form(parse_expression('0 8 * * *')))
+        self.assertEqual('0 8 * * *; timezone=Europe/Paris; nonexistent=skip',
+                         canonical_form(parse_expression('0 8 * * *', timezone=paris, nonexistent='skip')))
+        holidays = DateSet.from_dates([date(2023, 5, 1)])
+        form = canonical_form(parse_expression('0 8 * * *', excluded_dates=holidays))
+        self.assertTrue(form.startswith('0 8 * * *; excluded_dates='))
+
+    def test_content_hash(self):
+        self.assertEqual('23dcfc40bed57e0721496204c60099a7', content_hash(parse_expression('0,15,30,45 * * * *')))
+        self.assertEqual(parse_expression('*/15 * * * *').content_hash,
+                         parse_expression('0..45/15 * * * *').content_hash)
+        self.assertNotEqual(parse_expression('*/15 * * * *').content_hash,
+                            parse_expression('*/15 * * * *', timezone=ZoneInfo('UTC')).content_hash)
+        holidays = DateSet.from_dates([date(2023, 5, 1)])
+        self.assertNotEqual(parse_expression('0 8 * * *', excluded_dates=holidays).content_hash,
+                            parse_expression('0 8 * * *', included_dates=holidays).content_hash)
+
+    def test_content_hash_is_coarser_than_equality(self):
+        plain = parse_expression('0 8 * * MON')
+        redundant = parse_expression('0 8 * * MON,MON#2')
+        self.assertEqual(plain.content_hash, redundant.content_hash)
+        self.assertNotEqual(plain, redundant)
+        start = datetime(2023, 1, 1)
+        self.assertEqual(list(plain.between(start, datetime(2023, 3, 1))),
+                         list(redundant.between(start, datetime(2023, 3, 1))))
+
+    def test_deduplication(self):
+        expressions = [f'{minute * 15 % 60},{(minute + 1) * 15 % 60},{(minute + 2) * 15 % 60},{(minute + 3) * 15 % 60}'
+                       f' 8 * * MON..FRI' for minute in range(4)] + ['*/15 8 * * 1..5', '0..45/15 8 * * !6,7']
+        self.assertEqual(1, len({parse_expression(expression).content_hash for expression in expressions}))
@@ -0,0 +1,108 @@
+import unittest
+
+from cronee import parse_expression, CroneeParseError, CroneeSyntaxError, CroneeValueError, CroneeAliasError, \
+    CroneeOutOfBoundError, CroneeRangeOrderError, CroneeEmptyValuesError
+from cronee.compiler import tokenize, parse_field_tree, compile_field, Token, Element, Modifier, TOKEN_NUMBER, \
+    TOKEN_NAME, TOKEN_OPERATOR, TOKEN_END
+from cronee.parser import FIELD_SPECS
+
+MINUTE, HOUR, DOM, MONTH, DOW = FIELD_SPECS
+
+
+class TestTokenize(unittest.TestCase):
+    def test_tokens(self):
+        self.assertEqual([
+            Token(TOKEN_OPERATOR, '!', 0),
+            Token(TOKEN_NUMBER, '10', 1),
+            Token(TOKEN_OPERATOR, '..', 3),
+            Token(TOKEN_NAME, 'DEC', 5),
+            Token(TOKEN_OPERATOR, '/', 8),
+            Token(TOKEN_NUMBER, '2', 9),
+            Token(TOKEN_OPERATOR, '-', 10),
+            Token(TOKEN_NUMBER, '3', 11),
+            Token(TOKEN_END, '', 12),
+        ], tokenize('!10..DEC/2-3'))
+
+    def test_unexpected_character(self):
+        with self.assertRaises(CroneeSyntaxError) as context:
+            tokenize('1,2;3')
+        self.assertEqual(3, context.exception.position)
+
+
+class TestParseFieldTree(unittest.TestCase):
+    def test_tree(self):
+        tree = parse_field_tree('!1..5/2,FRI#3+1', DOW)
+        self.assertTrue(tree.inversion)
+        self.assertEqual(2, len(tree.elements))
+        self.assertEqual(Element(Token(TOKEN_NUMBER, '1', 1), Token(TOKEN_NUMBER, '5', 4), Token(TOKEN_NUMBER, '2', 6)),
+                         tree.elements[0])
+        self.assertEqual(Token(TOKEN_NUMBER, '3', 12), tree.elements[1].index)
+        self.assertEqual(Modifier('+', Token(TOKEN_NUMBER, '1', 14)), tree.modifier)
+
+    def test_syntax_errors(self):
+        cases = {
+            '1,,2': 2,
+            '1..': 3,
+            '1..2..3': 4,
+            '5+1,6': 3,
+            '*//3': 2,
+            'FRI#3/2': 5,
+            '!': 1,
+        }
+        for text, position in cases.items():
+            with self.subTest(text=text):
+                with self.assertRaises(CroneeSyntaxError) as context:
+                    parse_field_tree(text, DOW)
+                self.assertEqual(position, context.exception.position)
+
+    def test_index_only_in_dow(self):
+        with self.assertRaises(CroneeSyntaxError) as context:
+            parse_field_tree('FEB#2', MONTH)
+        self.assertEqual(3, context.exception.position)
+
+
+class TestCompileField(unittest.TestCase):
+    def test_values(self):
+        self.assertEqual(frozenset({0, 15, 30, 45}), compile_field('*/15', MINUTE).values)
+        self.assertEqual(frozenset({1, 3, 5, 7, 9, 11}), compile_field('!2..10/2,DEC-3', MONTH).values)
+        self.assertEqual(3, compile_field('!2..10/2,DEC-3', MONTH).modifier)
+        self.assertEqual(-5, compile_field('3+5', HOUR).modifier)
+
+    def test_index(self):
+        compiled = compile_field('3,FRI#3,4', DOW)
+        self.assertEqual(frozenset({3, 4}), compiled.values)
+        self.assertEqual(1, len(compiled.validators))
+        self.assertEqual(3, compiled.validators[0].index)
+
+    def test_cached(self):
+        self.assertIs(compile_field('0..5', HOUR), compile_field('0..5', HOUR))
+
+
+class TestErrorPositions(unittest.TestCase):
+    def assertError(self, error: type, position: int, expression: str):
+        with self.assertRaises(error) as context:
+            parse_expression(expression)
+        self.assertIsInstance(context.exception, CroneeParseError)
+        self.assertEqual(position, context.exception.position)
+        self.assertEqual(expression, context.exception.expression)
+
+    def test_positions(self):
+        self.assertError(CroneeOutOfBoundError, 2, '* 25 * * *')
+        self.assertError(CroneeOutOfBoundError, 8, '*  *  * 13 *')
+        self.assertError(CroneeAliasError, 10, '0 0 1 JAN XYZ')
+        self.assertError(CroneeRangeOrderError, 2, '0 5..1 * * *')
+        self.assertError(CroneeValueError, 4, '0 0 *..5 * *')
+        self.assertError(CroneeValueError, 2, '*/0 * * * *')
+        self.assertError(CroneeValueError, 10, '* * * * *+*')
+        self.assertError(CroneeEmptyValuesError, 4, '0 0 !* * *')
+        self.assertError(CroneeSyntaxError, 11, '* * * * MON&')
+        self.assertError(CroneeSyntaxError, 14, '* * * * * * * *')
+        self.assertError(CroneeSyntaxError, 7, '* * * *')
+        self.assertError(CroneeSyntaxError, 0, '')
+
+    def test_message(self):
+        with self.assertRaises(CroneeOutOfBoundError) as context:
+            parse_expression('* 25 * * *')
+        self.assertEqual("Value 25 is out of the valid range 0..23 (at position 2 of '* 25 * * *')",
+                         str(context.exception))
+        self.assertEqual("Invalid alias XYZ", str(CroneeAliasError("Invalid alias XYZ")))
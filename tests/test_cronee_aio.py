@@ -0,0 +1,119 @@
+import asyncio
+import time
+import unittest
+from concurrent.futures import Executor, Future
+from datetime import datetime, timedelta
+
+from cronee import parse_expression, AsyncCroneeRunner
+from cronee.aio import is_expensive, next_occurrence
+
+
+class FakeClock:
+    """ Clock starting at a given datetime and following the real time """
+
+    def __init__(self, start: datetime):
+        self.start = start
+        self.origin = time.monotonic()
+
+    def __call__(self) -> datetime:
+        return self.start + timedelta(seconds=time.monotonic() - self.origin)
+
+
+class HeldExecutor(Executor):
+    """ Executor holding the submitted calls until they are released """
+
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        self.calls.append((future, fn, args, kwargs))
+        return future
+
+
+class TestAsyncCronee(unittest.IsolatedAsyncioTestCase):
+    async def test_sleep_until_next(self):
+        clock = FakeClock(datetime(2023, 1, 1, 8, 59, 59, 950000))
+        c = parse_expression('0 9 * * *')
+        self.assertEqual(datetime(2023, 1, 1, 9, 0), await c.sleep_until_next(clock))
+        self.assertGreaterEqual(clock(), datetime(2023, 1, 1, 9, 0))
+
+    async def test_aiter_occurrences(self):
+        clock = FakeClock(datetime(2023, 1, 1, 8, 59, 59, 950000))
+        c = parse_expression('* * * * *')
+        occurrences = []
+        async for fire_time in c.aiter_occurrences(datetime(2023, 1, 1, 8, 58), clock):
+            occurrences.append(fire_time)
+            if len(occurrences) == 3:
+                break
+        self.assertEqual([datetime(2023, 1, 1, 8, 58), datetime(2023, 1, 1, 8, 59), datetime(2023, 1, 1, 9, 0)],
+                         occurrences)
+
+    async def test_offloaded_next_occurrence(self):
+        c = parse_expression('0 8 * * FRI#3')
+        self.assertTrue(is_expensive(c))
+        self.assertFalse(is_expensive(parse_expression('0 8 * * FRI')))
+        self.assertEqual(datetime(2023, 1, 20, 8, 0), await next_occurrence(c, datetime(2023, 1, 1)))
+
+    async def test_runner(self):
+        clock = FakeClock(datetime(2023, 1, 1, 8, 59, 59, 950000))
+        runner = AsyncCroneeRunner(clock)
+        fired = []
+
+        async def job(fire_time):
+            fired.append(fire_time)
+            runner.stop()
+
+        runner.add('nine', parse_expression('0 9 * * FRI#3,SUN'), job)
+        runner.add('ten', parse_expression('0 10 * * *'), job)
+        self.assertEqual(2, len(runner))
+        await asyncio.wait_for(runner.run(), 5)
+        await asyncio.sleep(0)
+        self.assertEqual([datetime(2023, 1, 1, 9, 0)], fired)
+
+    async def test_runner_wakes_up_on_add(self):
+        clock = FakeClock(datetime(2023, 1, 1, 8, 59, 59, 950000))
+        runner = AsyncCroneeRunner(clock)
+        fired = []
+
+        async def job(fire_time):
+            fired.append(fire_time)
+            runner.stop()
+
+        task = asyncio.create_task(runner.run())
+        await asyncio.sleep(0)
+        runner.add('nine', parse_expression('0 9 * * *'), job)
+        await asyncio.wait_for(task, 5)
+        await asyncio.sleep(0)
+        self.assertEqual([datetime(2023, 1, 1, 9, 0)], fired)
+
+    async def _pop_in_flight(self, change) -> list[datetime]:
+        """ Fire times dispatched when the scheduled job is changed after its occurrence is popped """
+        clock = FakeClock(datetime(2023, 1, 1, 8, 59, 59, 950000))
+        executor = HeldExecutor()
+        runner = AsyncCroneeRunner(clock, executor)
+        fired = []
+
+        async def job(fire_time):
+            fired.append(fire_time)
+
+        runner.add('nine', parse_expression('0 9 * * FRI#3,SUN'), job)
+        task = asyncio.create_task(runner.run())
+        while not executor.calls:
+            await asyncio.sleep(0.01)
+        future, fn, args, kwargs = executor.calls.pop()
+        due = fn(*args, **kwargs)
+        change(runner, job)
+        future.set_result(due)
+        await asyncio.sleep(0.05)
+        runner.stop()
+        await asyncio.wait_for(task, 5)
+        return fired
+
+    async def test_runner_job_removed_during_pop(self):
+        fired = await self._pop_in_flight(lambda runner, job: runner.remove('nine'))
+        self.assertEqual([], fired)
+
+    async def test_runner_job_replaced_during_pop(self):
+        fired = await self._pop_in_flight(lambda runner, job: runner.add('nine', parse_expression('0 10 * * *'), job))
+        self.assertEqual([], fired)
@@ -0,0 +1,122 @@
+import unittest
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from cronee import parse_expression, CompositeCronee, union, intersection, difference, CroneeSearchBudgetError
+from cronee.cronee import SimpleCronee
+
+START = datetime(2023, 1, 1, 0, 0, 30)
+END = datetime(2023, 3, 1)
+
+
+def brute_force(predicate, start: datetime, end: datetime) -> list[datetime]:
+    occurrences = []
+    dtime = start
+    while dtime < end:
+        if predicate(dtime):
+            occurrences.append(dtime)
+        dtime += timedelta(minutes=1)
+    return occurrences
+
+
+class TestCompiledAlgebra(unittest.TestCase):
+    def test_union_of_one_field(self):
+        c = parse_expression('0 8 * * MON..FRI') | parse_expression('0 8 * * SAT')
+        self.assertIsInstance(c, SimpleCronee)
+        self.assertEqual(frozenset(range(1, 7)), c.dows)
+        self.assertIs(c, parse_expression('0 8 * * MON..SAT'))
+
+    def test_union_of_subset(self):
+        a = parse_expression('0 8 * * *')
+        self.assertIs(a, a | parse_expression('0 8 1 * MON'))
+
+    def test_intersection(self):
+        c = parse_expression('0 8 * * *') & parse_expression('*/30 * * * MON')
+        self.assertEqual(parse_expression('0 8 * * MON'), c)
+
+    def test_intersection_with_validators(self):
+        c = parse_expression('0 0 * * FRI#2') & parse_expression('0 0 * JAN *')
+        self.assertIsInstance(c, SimpleCronee)
+        self.assertEqual(datetime(2023, 1, 13), c.next_occurrence(datetime(2023, 1, 1)))
+        self.assertEqual(datetime(2024, 1, 12), c.next_occurrence(datetime(2023, 1, 14)))
+
+    def test_difference(self):
+        c = parse_expression('0 8 * * *') - parse_expression('0 8 * * SUN')
+        self.assertEqual(parse_expression('0 8 * * MON..SAT'), c)
+        a = parse_expression('0 8 * * *')
+        self.assertIs(a, a - parse_expression('0 9 * * *'))
+        self.assertIs(False, (a - parse_expression('* * * * *')).satisfiability.satisfiable)
+
+    def test_composite(self):
+        self.assertIsInstance(parse_expression('0 8 * * *') | parse_expression('30 9 * * *'), CompositeCronee)
+        self.assertIsInstance(parse_expression('0 8 * * *') - parse_expression('* * 1 * MON'), CompositeCronee)
+        shifted = parse_expression('0 8+1 * * *')
+        self.assertIsInstance(parse_expression('0 8 * * *') & shifted, CompositeCronee)
+
+    def test_flattening(self):
+        a, b, c = parse_expression('0 8 * * *'), parse_expression('30 9 * * *'), parse_expression('15 10 * * *')
+        self.assertEqual(CompositeCronee('union', (a, b, c)), (a | b) | c)
+        self.assertEqual(union(a, b, c), a | (b | c))
+        self.assertIs(a, union(a, parse_expression('0 0 31 FEB *')))
+
+    def test_not_a_cronee(self):
+        with self.assertRaises(TypeError):
+            parse_expression('0 8 * * *') | 3
+
+
+class TestCompositeAlgebra(unittest.TestCase):
+    def assertOccurrences(self, cronee, predicate):
+        expected = brute_force(predicate, START, END)
+        self.assertEqual(expected, list(cronee.iter_occurrences(START, END)))
+        self.assertEqual(expected[::-1], list(cronee.iter_previous_occurrences(END - timedelta(seconds=30), START)))
+        self.assertEqual([int((dtime - datetime(1970, 1, 1)).total_seconds()) for dtime in expected],
+                         list(cronee.iter_ts(int((START - datetime(1970, 1, 1)).total_seconds()),
+                                             int((END - datetime(1970, 1, 1)).total_seconds()))))
+        for dtime in expected[:5]:
+            self.assertTrue(cronee.validate(dtime))
+
+    def test_union(self):
+        a, b = parse_expression('0 8 * * MON'), parse_expression('*/20 9 1 * *')
+        self.assertOccurrences(a | b, lambda dtime: a.validate(dtime) or b.validate(dtime))
+
+    def test_intersection(self):
+        a = parse_expression('*/15 8..10 * * *')
+        b = parse_expression('*/10+5 * * * *')
+        self.assertOccurrences(a & b, lambda dtime: a.validate(dtime) and b.validate(dtime))
+
+    def test_difference(self):
+        a, b = parse_expression('0 8 * * *'), parse_expression('* * 1 * MON')
+        c = a - b
+        self.assertOccurrences(c, lambda dtime: a.validate(dtime) and not b.validate(dtime))
+        self.assertFalse(c.validate(datetime(2023, 5, 1, 8)))
+        self.assertTrue(c.validate(datetime(2023, 5, 2, 8)))
+
+    def test_nested(self):
+        a, b = parse_expression('0 8 * * *'), parse_expression('* * 1 * MON')
+        c = parse_expression('30 12 * * FRI#2')
+        self.assertOccurrences((a - b) | c,
+                               lambda dtime: (a.validate(dtime) and not b.validate(dtime)) or c.validate(dtime))
+
+    def test_zoned_union(self):
+        paris, tokyo = ZoneInfo('Europe/Paris'), ZoneInfo('Asia/Tokyo')
+        c = parse_expression('0 9 * * *', timezone=paris) | parse_expression('0 9 * * *', timezone=tokyo)
+        start = datetime(2023, 1, 1, tzinfo=paris)
+        occurrences = c.next_occurrences(start, 4)
+        self.assertEqual([datetime(2023, 1, 1, 0), datetime(2023, 1, 1, 8), datetime(2023, 1, 2, 0),
+                          datetime(2023, 1, 2, 8)],
+                         [occurrence.astimezone(ZoneInfo('UTC')).replace(tzinfo=None) for occurrence in occurrences])
+
+    def test_empty_intersection(self):
+        c = parse_expression('0 8 * * *') & parse_expression('0+30 8 * * *')
+        self.assertEqual([], list(c.iter_occurrences(START, END)))
+        with self.assertRaises(CroneeSearchBudgetError):
+            c.next_occurrence(START, max_candidates=100)
+        with self.assertRaises(CroneeSearchBudgetError):
+            c.next_occurrence(START, horizon=timedelta(days=30))
+
+    def test_functions(self):
+        a, b = parse_expression('0 8 * * *'), parse_expression('30 9 * * *')
+        self.assertEqual(a | b, union(a, b))
+        self.assertEqual(a & b, intersection(a, b))
+        self.assertEqual(a - b, difference(a, b))
+        self.assertEqual(1, len({a | b, union(a, b)}))
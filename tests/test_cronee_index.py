@@ -0,0 +1,50 @@
+import unittest
+from datetime import datetime, timedelta
+
+from cronee import parse_expression, CroneeIndex
+
+
+class TestCroneeIndex(unittest.TestCase):
+    EXPRESSIONS = [
+        '* * * * *',
+        '35 10 * * *',
+        '*/7 */5 * * *',
+        '0 0 1 * *',
+        '0 8 * * FRI#3',
+        '0..5 8 * * FRI#3,SUN#4',
+        '* * 15-1 * *',
+        '!0..30/5,45 5,15..23/3 15,1-1 !JAN,MAR,JUN,OCT *',
+        '*/15 8..18 * * MON..FRI',
+        '0 0 * * SUN',
+    ]
+
+    def setUp(self):
+        self.index = CroneeIndex()
+        for key, expression in enumerate(self.EXPRESSIONS):
+            self.index.add(key, parse_expression(expression))
+
+    def test_same_results_as_validate(self):
+        cronees = {key: parse_expression(expression) for key, expression in enumerate(self.EXPRESSIONS)}
+        dtime = datetime(2023, 1, 1)
+        for _ in range(3000):
+            expected = {key for key, cronee in cronees.items() if cronee.validate(dtime)}
+            self.assertEqual(expected, set(self.index.match(dtime)), dtime)
+            dtime += timedelta(minutes=53)
+
+    def test_remove(self):
+        self.index.remove(0)
+        self.assertNotIn(0, self.index)
+        self.assertEqual(len(self.EXPRESSIONS) - 1, len(self.index))
+        self.assertNotIn(0, self.index.match(datetime(2023, 1, 1, 3, 1)))
+        self.index.remove(4)
+        self.assertNotIn(4, self.index)
+        with self.assertRaises(KeyError):
+            self.index.remove(0)
+
+    def test_replace_and_reuse_slot(self):
+        self.index.remove(1)
+        self.index.add('new', parse_expression('59 23 * * *'))
+        self.index.add(2, parse_expression('58 23 * * *'))
+        self.assertEqual({0, 'new'}, set(self.index.match(datetime(2023, 1, 2, 23, 59))))
+        self.assertEqual({0, 2}, set(self.index.match(datetime(2023, 1, 2, 23, 58))))
+        self.assertEqual(parse_expression('59 23 * * *'), self.index.get('new'))
@@ -0,0 +1,138 @@
+import os
+import time
+import unittest
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from cronee import parse_expression, CroneeScheduler, CroneeSearchBudgetError, CroneeUnsatisfiableError
+
+
+class GivingUpCronee:
+    """ Cronee firing at its start, whose search of the following occurrences fails """
+
+    def __init__(self, error: type[CroneeSearchBudgetError]):
+        self.error = error
+
+    def next_occurrence(self, dtime: datetime) -> datetime:
+        return dtime
+
+    def iter_occurrences(self, start: datetime, end: datetime = None):
+        raise self.error(f"No occurrence after {start}")
+        yield
+
+
+class TestCroneeScheduler(unittest.TestCase):
+    def setUp(self):
+        self.now = datetime(2023, 1, 1, 0, 0)
+        self.scheduler = CroneeScheduler(clock=lambda: self.now)
+
+    def test_next_fire_time(self):
+        self.assertIsNone(self.scheduler.next_fire_time())
+        self.now = datetime(2023, 1, 1, 0, 1)
+        self.scheduler.add('hourly', parse_expression('0 * * * *'))
+        self.scheduler.add('quarter', parse_expression('*/15 * * * *'))
+        self.assertEqual(datetime(2023, 1, 1, 0, 15), self.scheduler.next_fire_time())
+
+    def test_start_is_rounded_to_the_next_minute(self):
+        self.now = datetime(2023, 1, 1, 0, 0, 30)
+        self.scheduler.add('minutely', parse_expression('* * * * *'))
+        self.assertEqual(datetime(2023, 1, 1, 0, 1), self.scheduler.next_fire_time())
+
+    def test_pop_due_rearms(self):
+        self.scheduler.add('hourly', parse_expression('0 * * * *'), start=self.now)
+        self.scheduler.add('quarter', parse_expression('*/15 * * * *'), start=self.now)
+        due = self.scheduler.pop_due(datetime(2023, 1, 1, 0, 30))
+        self.assertEqual([('hourly', datetime(2023, 1, 1, 0, 0)),
+                          ('quarter', datetime(2023, 1, 1, 0, 0)),
+                          ('quarter', datetime(2023, 1, 1, 0, 15)),
+                          ('quarter', datetime(2023, 1, 1, 0, 30))], due)
+        self.assertEqual(datetime(2023, 1, 1, 0, 45), self.scheduler.next_fire_time())
+        self.assertEqual([], self.scheduler.pop_due(datetime(2023, 1, 1, 0, 44)))
+
+    def test_same_order_as_merged_occurrences(self):
+        expressions = {'a': '*/7 */5 * * *', 'b': '0 8 * * FRI#3', 'c': '35 10 * * *', 'd': '0..5 8 * * MON'}
+        for key, expression in expressions.items():
+            self.scheduler.add(key, parse_expression(expression), start=self.now)
+        end = datetime(2023, 3, 1)
+        expected = sorted(((fire_time, key)
+                           for key, expression in expressions.items()
+                           for fire_time in parse_expression(expression).between(self.now, end)))
+        due = [(fire_time, key) for key, fire_time in self.scheduler.pop_due(end - timedelta(minutes=1))]
+        self.assertEqual(expected, sorted(due))
+        self.assertEqual(sorted(fire_time for fire_time, _ in due), [fire_time for fire_time, _ in due])
+
+    def test_single_shot_is_unscheduled(self):
+        self.now = datetime(2023, 12, 31, 23, 30)
+        self.scheduler.add('once', parse_expression('0 0 0 1 1 * 2024'))
+        self.scheduler.add('hourly', parse_expression('0 * * * *'))
+        due = self.scheduler.pop_due(datetime(2024, 1, 1, 0, 0))
+        self.assertIn(('once', datetime(2024, 1, 1, 0, 0)), due)
+        self.assertNotIn('once', self.scheduler)
+        self.assertEqual([('hourly', datetime(2024, 1, 1, 1, 0))], self.scheduler.pop_due(datetime(2024, 1, 1, 1, 0)))
+        self.assertEqual(1, len(self.scheduler))
+
+    def test_giving_up_search_is_unscheduled(self):
+        for error in (CroneeSearchBudgetError, CroneeUnsatisfiableError):
+            with self.subTest(error=error):
+                scheduler = CroneeScheduler(clock=lambda: self.now)
+                scheduler.add('giving up', GivingUpCronee(error), start=self.now)
+                scheduler.add('hourly', parse_expression('0 * * * *'), start=self.now)
+                due = scheduler.pop_due(datetime(2023, 1, 1, 1, 0))
+                self.assertEqual([('giving up', self.now), ('hourly', self.now),
+                                  ('hourly', datetime(2023, 1, 1, 1, 0))], due)
+                self.assertNotIn('giving up', scheduler)
+                self.assertEqual(datetime(2023, 1, 1, 2, 0), scheduler.next_fire_time())
+
+    def test_naive_and_zoned_cronees(self):
+        local_zone = os.environ.get('TZ')
+        os.environ['TZ'] = 'UTC'
+        time.tzset()
+        try:
+            paris = ZoneInfo('Europe/Paris')
+            self.scheduler.add('local', parse_expression('0 8 * * *'))
+            self.scheduler.add('paris', parse_expression('0 8 * * *', timezone=paris))
+            self.assertEqual(datetime(2023, 1, 1, 8, tzinfo=paris), self.scheduler.next_fire_time())
+            self.assertEqual([('paris', datetime(2023, 1, 1, 8, tzinfo=paris))],
+                             self.scheduler.pop_due(datetime(2023, 1, 1, 7, 30)))
+            self.assertEqual([('local', datetime(2023, 1, 1, 8))], self.scheduler.pop_due(datetime(2023, 1, 1, 8)))
+            self.assertEqual(datetime(2023, 1, 2, 8, tzinfo=paris), self.scheduler.next_fire_time())
+        finally:
+            if local_zone is None:
+                del os.environ['TZ']
+            else:
+                os.environ['TZ'] = local_zone
+            time.tzset()
+
+    def test_remove_and_update(self):
+        self.scheduler.add('a', parse_expression('0 * * * *'))
+        self.scheduler.add('b', parse_expression('30 * * * *'))
+        self.scheduler.remove('a')
+        self.assertNotIn('a', self.scheduler)
+        self.assertEqual(datetime(2023, 1, 1, 0, 30), self.scheduler.next_fire_time())
+        self.scheduler.update('b', parse_expression('10 * * * *'))
+        self.assertEqual(datetime(2023, 1, 1, 0, 10), self.scheduler.next_fire_time())
+        self.assertEqual(1, len(self.scheduler))
+        with self.assertRaises(KeyError):
+            self.scheduler.remove('a')
+        with self.assertRaises(KeyError):
+            self.scheduler.update('a', parse_expression('10 * * * *'))
+
+    def test_many_removals(self):
+        for key in range(1000):
+            self.scheduler.add(key, parse_expression(f'{key % 60} * * * *'))
+        for key in range(999):
+            self.scheduler.remove(key)
+        self.assertEqual(datetime(2023, 1, 1, 0, 39), self.scheduler.next_fire_time())
+
+    def test_run(self):
+        fired = []
+
+        def callback(key, fire_time):
+            fired.append((key, fire_time))
+            self.scheduler.stop()
+
+        self.scheduler.add('minutely', parse_expression('* * * * *'), start=self.now)
+        self.now = datetime(2023, 1, 1, 0, 5)
+        self.scheduler.run(callback)
+        self.assertEqual([('minutely', datetime(2023, 1, 1, 0, minute)) for minute in range(6)], fired)
+        self.assertEqual(datetime(2023, 1, 1, 0, 6), self.scheduler.next_fire_time())
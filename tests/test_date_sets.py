@@ -0,0 +1,151 @@
+import io
+import unittest
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from cronee import parse_expression, DateSet, load_csv, load_ical, CroneeValueError, CroneeSearchBudgetError
+
+HOLIDAYS = DateSet.from_dates([date(2023, 1, 2), date(2023, 5, 1), date(2023, 12, 25)] +
+                              [date(2023, 7, 14) + timedelta(days=day) for day in range(30)])
+
+ICAL = """BEGIN:VCALENDAR
+VERSION:2.0
+BEGIN:VEVENT
+SUMMARY:New year
+DTSTART;VALUE=DATE:20230101
+END:VEVENT
+BEGIN:VEVENT
+SUMMARY:Summer closing
+DTSTART;VALUE=DATE:20230807
+DTEND;VALUE=DATE:20230812
+END:VEVENT
+END:VCALENDAR
+"""
+
+
+def brute_force(predicate, start: datetime, end: datetime) -> list[datetime]:
+    occurrences = []
+    dtime = start
+    while dtime < end:
+        if predicate(dtime):
+            occurrences.append(dtime)
+        dtime += timedelta(minutes=1)
+    return occurrences
+
+
+class TestDateSet(unittest.TestCase):
+    def test_membership(self):
+        self.assertIn(date(2023, 5, 1), HOLIDAYS)
+        self.assertIn(date(2023, 8, 12), HOLIDAYS)
+        self.assertNotIn(date(2023, 5, 2), HOLIDAYS)
+        self.assertEqual(33, len(HOLIDAYS))
+        self.assertEqual(date(2023, 1, 2), HOLIDAYS.first)
+        self.assertEqual(date(2023, 12, 25), HOLIDAYS.last)
+
+    def test_equality(self):
+        dates = [date(2024, 1, 1), date(2023, 1, 1), date(2024, 1, 1)]
+        self.assertEqual(DateSet.from_dates(dates), DateSet.from_dates(reversed(dates)))
+        self.assertEqual((date(2023, 1, 1).toordinal(), date(2024, 1, 1).toordinal()),
+                         DateSet.from_dates(dates).ordinals)
+        self.assertEqual(hash(DateSet.from_dates(dates)), hash(DateSet.from_dates(dates[:2])))
+
+    def test_year_mask(self):
+        mask = HOLIDAYS.year_mask(2023)
+        self.assertEqual(33, bin(mask).count('1'))
+        self.assertEqual(1 << 1, mask & 0b11)
+        self.assertEqual(0, HOLIDAYS.year_mask(2024))
+
+    def test_load_csv(self):
+        dates = load_csv(io.StringIO("date;name\n2023-01-01;New year\n\n2023-05-01;Labour day\n"), delimiter=';',
+                         header=True)
+        self.assertEqual([date(2023, 1, 1), date(2023, 5, 1)], list(dates))
+        dates = load_csv(io.StringIO("New year,01/01/2023\n"), column=1, date_format='%d/%m/%Y')
+        self.assertEqual([date(2023, 1, 1)], list(dates))
+
+    def test_load_csv_errors(self):
+        with self.assertRaises(CroneeValueError):
+            load_csv(io.StringIO("2023-01-01\n2023-02-30\n"))
+        with self.assertRaises(CroneeValueError):
+            load_csv(io.StringIO("2023-01-01\n"), column=1)
+
+    def test_load_ical(self):
+        dates = load_ical(io.StringIO(ICAL))
+        self.assertEqual([date(2023, 1, 1)] + [date(2023, 8, day) for day in range(7, 12)], list(dates))
+        with self.assertRaises(CroneeValueError):
+            load_ical(io.StringIO("BEGIN:VEVENT\nSUMMARY:No start\nEND:VEVENT\n"))
+
+
+class TestExcludedDates(unittest.TestCase):
+    def test_validate(self):
+        c = parse_expression('0 8 * * *', excluded_dates=HOLIDAYS)
+        self.assertFalse(c.validate(datetime(2023, 5, 1, 8)))
+        self.assertTrue(c.validate(datetime(2023, 5, 2, 8)))
+        self.assertFalse(c.validate_ts(int((datetime(2023, 5, 1, 8) - datetime(1970, 1, 1)).total_seconds())))
+        self.assertTrue(c.validate_ts(int((datetime(2023, 5, 2, 8) - datetime(1970, 1, 1)).total_seconds())))
+
+    def test_offset_applies(self):
+        c = parse_expression('0 0-1 * * *', excluded_dates=HOLIDAYS)
+        self.assertFalse(c.validate(datetime(2023, 4, 30, 23)))
+        self.assertTrue(c.validate(datetime(2023, 5, 1, 23)))
+
+    def test_skips_holiday_period(self):
+        c = parse_expression('0 8 * * MON..FRI', excluded_dates=HOLIDAYS)
+        self.assertEqual(datetime(2023, 8, 14, 8), c.next_occurrence(datetime(2023, 7, 13, 9)))
+        self.assertEqual(datetime(2023, 7, 13, 8), c.previous_occurrence(datetime(2023, 8, 13)))
+        self.assertEqual(datetime(2023, 1, 3, 8), c.next_occurrence(datetime(2023, 1, 1)))
+
+    def test_occurrences(self):
+        c = parse_expression('*/30 7..9 * * *', excluded_dates=HOLIDAYS)
+        plain = parse_expression('*/30 7..9 * * *')
+        start, end = datetime(2023, 4, 28, 0, 0, 15), datetime(2023, 5, 4)
+        expected = brute_force(lambda dtime: plain.validate(dtime) and dtime.date() not in HOLIDAYS, start, end)
+        self.assertEqual(expected, list(c.iter_occurrences(start, end)))
+        self.assertEqual(expected[::-1], list(c.iter_previous_occurrences(end - timedelta(seconds=45), start)))
+
+    def test_analysis(self):
+        c = parse_expression('0 8 * * *', excluded_dates=HOLIDAYS)
+        self.assertEqual((True, None), c.satisfiability)
+
+    def test_identity(self):
+        self.assertIs(parse_expression('0 8 * * *', excluded_dates=HOLIDAYS),
+                      parse_expression('0 8 * * *', excluded_dates=DateSet(HOLIDAYS.ordinals)))
+        self.assertNotEqual(parse_expression('0 8 * * *'), parse_expression('0 8 * * *', excluded_dates=HOLIDAYS))
+
+    def test_zoned(self):
+        paris = ZoneInfo('Europe/Paris')
+        c = parse_expression('0 8 * * *', timezone=paris, excluded_dates=HOLIDAYS)
+        self.assertEqual(datetime(2023, 5, 2, 8, tzinfo=paris), c.next_occurrence(datetime(2023, 5, 1, tzinfo=paris)))
+        self.assertFalse(c.validate(datetime(2023, 5, 1, 8, tzinfo=paris)))
+
+    def test_validate_many(self):
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest('numpy is not installed')
+        c = parse_expression('0 8 * * *', excluded_dates=HOLIDAYS)
+        timestamps = np.array(['2023-05-01T08:00', '2023-05-02T08:00', '2023-12-25T08:00'], dtype='datetime64[m]')
+        self.assertEqual([False, True, False], c.validate_many(timestamps).tolist())
+
+
+class TestIncludedDates(unittest.TestCase):
+    def test_restricted(self):
+        c = parse_expression('0 8 * * *', included_dates=HOLIDAYS)
+        self.assertTrue(c.validate(datetime(2023, 5, 1, 8)))
+        self.assertFalse(c.validate(datetime(2023, 5, 2, 8)))
+        self.assertEqual([datetime(2023, 1, 2, 8), datetime(2023, 5, 1, 8), datetime(2023, 7, 14, 8)],
+                         c.next_occurrences(datetime(2022, 6, 1), 3))
+
+    def test_finite(self):
+        c = parse_expression('0 8 * * *', included_dates=HOLIDAYS)
+        self.assertEqual(33, len(list(c.iter_occurrences(datetime(2000, 1, 1)))))
+        self.assertEqual(33, len(list(c.iter_previous_occurrences(datetime(2100, 1, 1)))))
+        with self.assertRaises(CroneeSearchBudgetError):
+            c.next_occurrence(datetime(2024, 1, 1))
+
+    def test_analysis(self):
+        self.assertEqual((True, None), parse_expression('0 8 * * MON', included_dates=HOLIDAYS).satisfiability)
+        self.assertIs(False, parse_expression('0 8 * * SAT', included_dates=DateSet.from_dates(
+            [date(2023, 5, 1)])).satisfiability.satisfiable)
+        self.assertIs(False, parse_expression('0 8 * * *', excluded_dates=HOLIDAYS,
+                                              included_dates=HOLIDAYS).satisfiability.satisfiable)
+        self.assertIs(False, parse_expression('0 8 * * *', included_dates=DateSet(())).satisfiability.satisfiable)
@@ -0,0 +1,90 @@
+import threading
+import unittest
+from datetime import datetime, timedelta
+
+from cronee import parse_expression
+from cronee import instrumentation
+from cronee.cronee import SimpleCronee
+from cronee.instrumentation import StatsAggregator, EvaluationStatistics, collecting
+
+
+class ListCollector:
+    def __init__(self):
+        self.records = []
+
+    def record(self, cronee, statistics: EvaluationStatistics):
+        self.records.append((cronee, statistics))
+
+
+def is_even(dtime: datetime) -> bool:
+    return dtime.hour % 2 == 0
+
+
+class TestInstrumentation(unittest.TestCase):
+    def test_disabled_by_default(self):
+        self.assertIsNone(instrumentation.collector)
+
+    def test_validate(self):
+        c = parse_expression('0 8 * * *')
+        with collecting(ListCollector()) as collector:
+            c.validate(datetime(2023, 1, 1, 8))
+        self.assertEqual(1, len(collector.records))
+        cronee, statistics = collector.records[0]
+        self.assertIs(c, cronee)
+        self.assertEqual('validate', statistics.operation)
+        self.assertTrue(statistics.fast_path)
+        self.assertGreaterEqual(statistics.duration, 0)
+        self.assertIsNone(instrumentation.collector)
+
+    def test_search_per_occurrence(self):
+        c = parse_expression('0 0 29 FEB *')
+        with collecting(ListCollector()) as collector:
+            occurrences = c.next_occurrences(datetime(2023, 1, 1), 2)
+            c.previous_occurrence(datetime(2023, 1, 1))
+            c.next_ts(0)
+        self.assertEqual([datetime(2024, 2, 29), datetime(2028, 2, 29)], occurrences)
+        self.assertEqual(['next', 'next', 'previous', 'next'], [s.operation for _, s in collector.records])
+        self.assertTrue(all(statistics.candidates > 1 for _, statistics in collector.records))
+        self.assertTrue(all(statistics.fast_path for _, statistics in collector.records))
+
+    def test_validator_calls(self):
+        base = parse_expression('0 0 * * *')
+        c = SimpleCronee(base.minutes, frozenset(), base.doms, base.months, base.dows, timedelta(),
+                         ((), (is_even,), (), (), ()))
+        with collecting(ListCollector()) as collector:
+            self.assertEqual(datetime(2023, 1, 1, 2), c.next_occurrence(datetime(2023, 1, 1, 1)))
+            self.assertTrue(c.validate(datetime(2023, 1, 1, 4)))
+        (_, search), (_, validation) = collector.records
+        self.assertFalse(search.fast_path)
+        self.assertEqual((0, 2, 0, 0, 0), search.validator_calls)
+        self.assertEqual((0, 1, 0, 0, 0), validation.validator_calls)
+
+    def test_nested_evaluations_are_accounted_once(self):
+        c = parse_expression('* * * * *')
+        with collecting(ListCollector()) as collector:
+            c.validate_ts(0)
+        self.assertEqual(['validate_ts'], [statistics.operation for _, statistics in collector.records])
+
+    def test_aggregator(self):
+        slow = parse_expression('0 0 29 FEB *')
+        fast = parse_expression('* * * * *')
+        aggregator = StatsAggregator()
+        with collecting(aggregator):
+            threads = [threading.Thread(target=lambda: slow.next_occurrences(datetime(2023, 1, 1), 5))
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            fast.validate(datetime(2023, 1, 1))
+        self.assertEqual(2, len(aggregator))
+        self.assertEqual(20, aggregator.statistics(slow).evaluations)
+        self.assertEqual(1, aggregator.statistics(fast).evaluations)
+        self.assertEqual(0, aggregator.statistics(fast).fallback_evaluations)
+        self.assertEqual(slow, aggregator.slowest(1)[0][0])
+        aggregator.clear()
+        self.assertEqual(0, aggregator.statistics(slow).evaluations)
+
+
+if __name__ == '__main__':
+    unittest.main()
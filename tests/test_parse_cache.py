@@ -0,0 +1,75 @@
+import unittest
+from dataclasses import FrozenInstanceError
+from threading import Thread
+
+from cronee import ParseCache, CroneeSyntaxError, parse_expression_cached
+
+
+class TestParseCache(unittest.TestCase):
+    def test_hit_returns_shared_instance(self):
+        cache = ParseCache()
+        c1 = cache.parse('*/15 * * * *')
+        c2 = cache.parse('  */15  *   * * *  ')
+        self.assertIs(c1, c2)
+        statistics = cache.statistics()
+        self.assertEqual(1, statistics.hits)
+        self.assertEqual(1, statistics.misses)
+        self.assertEqual(1, statistics.size)
+
+    def test_eviction(self):
+        cache = ParseCache(maxsize=2)
+        cache.parse('1 * * * *')
+        cache.parse('2 * * * *')
+        cache.parse('1 * * * *')
+        cache.parse('3 * * * *')
+        self.assertIn('1 * * * *', cache)
+        self.assertNotIn('2 * * * *', cache)
+        self.assertEqual(1, cache.statistics().evictions)
+        self.assertEqual(2, len(cache))
+
+    def test_errors_are_not_cached(self):
+        cache = ParseCache()
+        with self.assertRaises(CroneeSyntaxError):
+            cache.parse('* * *')
+        self.assertEqual(0, len(cache))
+        self.assertEqual(1, cache.statistics().misses)
+
+    def test_cached_cronee_is_immutable(self):
+        c = ParseCache().parse('* * * * *')
+        with self.assertRaises(FrozenInstanceError):
+            c.minutes = {1}  # NOQA
+        with self.assertRaises(AttributeError):
+            c.minutes.add(1)  # NOQA
+
+    def test_clear(self):
+        cache = ParseCache()
+        cache.parse('* * * * *')
+        cache.clear()
+        self.assertEqual(0, len(cache))
+        self.assertEqual(0, cache.statistics().misses)
+
+    def test_invalid_size(self):
+        with self.assertRaises(ValueError):
+            ParseCache(maxsize=0)
+
+    def test_thread_safety(self):
+        cache = ParseCache(maxsize=8)
+        expressions = [f'{i} * * * *' for i in range(16)]
+
+        def worker():
+            for _ in range(50):
+                for expression in expressions:
+                    cache.parse(expression)
+
+        threads = [Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        statistics = cache.statistics()
+        self.assertEqual(4 * 50 * 16, statistics.hits + statistics.misses)
+        self.assertEqual(8, statistics.size)
+        self.assertLessEqual(statistics.evictions, statistics.misses - statistics.size)
+
+    def test_default_cache(self):
+        self.assertIs(parse_expression_cached('0 0 * * *'), parse_expression_cached('0 0 * * *'))
@@ -13,7 +13,7 @@ class TestParseExpression(unittest.TestCase):
         self.assertEqual(set(range(1, 32)), c.doms)
         self.assertEqual(set(range(1, 13)), c.months)
         self.assertEqual(set(range(1, 8)), c.dows)
-        self.assertEqual([[], [], [], [], []], c.other_validators)
+        self.assertEqual(((), (), (), (), ()), c.other_validators)
         self.assertEqual(timedelta(), c.offset)
 
     def test_numerical_expression(self):
@@ -23,7 +23,7 @@ class TestParseExpression(unittest.TestCase):
         self.assertEqual({8}, c.doms)
         self.assertEqual({10}, c.months)
         self.assertEqual({2}, c.dows)
-        self.assertEqual([[], [], [], [], []], c.other_validators)
+        self.assertEqual(((), (), (), (), ()), c.other_validators)
         self.assertEqual(timedelta(), c.offset)
 
     def test_range_expression(self):
@@ -33,7 +33,7 @@ class TestParseExpression(unittest.TestCase):
         self.assertEqual(set(range(8, 11)), c.doms)
         self.assertEqual(set(range(3, 12)), c.months)
         self.assertEqual(set(range(2, 5)), c.dows)
-        self.assertEqual([[], [], [], [], []], c.other_validators)
+        self.assertEqual(((), (), (), (), ()), c.other_validators)
         self.assertEqual(timedelta(), c.offset)
 
     def test_modifiers(self):
@@ -43,3 +43,18 @@ class TestParseExpression(unittest.TestCase):
     def test_index(self):
         c: SimpleCronee = parse_expression('* * * * FRI#3')  # NOQA
         self.assertEqual(1, len(c.other_validators[4]))
+
+    def test_compiled_masks(self):
+        c: SimpleCronee = parse_expression('*/15 0..2 31 DEC SUN')  # NOQA
+        self.assertEqual(1 | 1 << 15 | 1 << 30 | 1 << 45, c.minute_mask)
+        self.assertEqual(0b111, c.hour_mask)
+        self.assertEqual(1 << 31, c.dom_mask)
+        self.assertEqual(1 << 12, c.month_mask)
+        self.assertEqual(1 << 7, c.dow_mask)
+
+    def test_compiled_next_value_tables(self):
+        c: SimpleCronee = parse_expression('*/15 * * * *')  # NOQA
+        self.assertEqual(0, c._next_minutes[0])
+        self.assertEqual(15, c._next_minutes[1])
+        self.assertEqual(45, c._next_minutes[45])
+        self.assertIsNone(c._next_minutes[46])
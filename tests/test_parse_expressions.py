@@ -0,0 +1,51 @@
+import pickle
+import unittest
+from functools import partial
+from zoneinfo import ZoneInfo
+
+from cronee import parse_expression, parse_expressions, CroneeOutOfBoundError, CroneeSyntaxError, CroneeParseError
+
+EXPRESSIONS = ['0 8 * * *', '*/15 * * * *', '0 8 * * *', '* 25 * * *', '0 0 29 FEB *', '* * * *', '* 25 * * *']
+
+
+class TestParseExpressions(unittest.TestCase):
+    def check(self, result):
+        self.assertFalse(result.succeeded)
+        self.assertEqual(len(EXPRESSIONS), len(result.cronees))
+        for expression, cronee in zip(EXPRESSIONS, result.cronees):
+            if cronee is not None:
+                self.assertIs(parse_expression(expression), cronee)
+        self.assertIs(result.cronees[0], result.cronees[2])
+        self.assertEqual([3, 5, 6], [failure.index for failure in result.failures])
+        self.assertIsInstance(result.failures[0].error, CroneeOutOfBoundError)
+        self.assertEqual(2, result.failures[0].error.position)
+        self.assertIsInstance(result.failures[1].error, CroneeSyntaxError)
+        self.assertEqual('* * * *', result.failures[1].expression)
+
+    def test_serial(self):
+        self.check(parse_expressions(EXPRESSIONS))
+
+    def test_process_pool(self):
+        self.check(parse_expressions(iter(EXPRESSIONS), processes=2, chunk_size=2))
+
+    def test_parser(self):
+        paris = ZoneInfo('Europe/Paris')
+        result = parse_expressions(['0 8 * * *'], parser=partial(parse_expression, timezone=paris))
+        self.assertTrue(result.succeeded)
+        self.assertEqual(paris, result.cronees[0].timezone)
+
+    def test_raise_for_failures(self):
+        parse_expressions(['0 8 * * *']).raise_for_failures()
+        with self.assertRaises(CroneeOutOfBoundError):
+            parse_expressions(EXPRESSIONS).raise_for_failures()
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            parse_expressions(EXPRESSIONS, processes=0)
+        with self.assertRaises(ValueError):
+            parse_expressions(EXPRESSIONS, chunk_size=0)
+
+    def test_pickled_error(self):
+        error = pickle.loads(pickle.dumps(CroneeSyntaxError("Unexpected ','", 3, '1,,2 * * * *')))
+        self.assertIsInstance(error, CroneeParseError)
+        self.assertEqual((3, '1,,2 * * * *'), (error.position, error.expression))
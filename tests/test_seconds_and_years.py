@@ -0,0 +1,156 @@
+import unittest
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from cronee import parse_expression, CroneeScheduler, CroneeSyntaxError, CroneeOutOfBoundError, \
+    CroneeSearchBudgetError
+
+EPOCH = datetime(1970, 1, 1)
+
+
+def brute_force(cronee, start: datetime, end: datetime) -> list[datetime]:
+    occurrences = []
+    dtime = start
+    while dtime < end:
+        if cronee.validate(dtime):
+            occurrences.append(dtime)
+        dtime += timedelta(seconds=1)
+    return occurrences
+
+
+def to_ts(dtime: datetime) -> int:
+    return int((dtime - EPOCH).total_seconds())
+
+
+class TestParseSecondsAndYears(unittest.TestCase):
+    def test_field_counts(self):
+        classic = parse_expression('0 8 * * *')
+        self.assertIsNone(classic.seconds)
+        self.assertIsNone(classic.years)
+        self.assertEqual(timedelta(minutes=1), classic.resolution)
+        c = parse_expression('*/15 0 8 * * *')
+        self.assertEqual(frozenset({0, 15, 30, 45}), c.seconds)
+        self.assertEqual(timedelta(seconds=1), c.resolution)
+        c = parse_expression('0 0 8 * * * 2024..2025')
+        self.assertEqual(frozenset({2024, 2025}), c.years)
+        self.assertIsNone(parse_expression('0 0 8 * * * *').years)
+
+    def test_errors(self):
+        for expression in ('* * * *', '* * * * * * * *'):
+            with self.subTest(expression=expression), self.assertRaises(CroneeSyntaxError):
+                parse_expression(expression)
+        for expression in ('60 * * * * *', '0 0 8 * * * 10000', '0 0 8 * * * 2023+1'):
+            with self.subTest(expression=expression), self.assertRaises(CroneeOutOfBoundError):
+                parse_expression(expression)
+
+    def test_second_modifier(self):
+        c = parse_expression('0+10 0 8 * * *')
+        self.assertTrue(c.validate(datetime(2023, 1, 1, 8, 0, 10)))
+        self.assertFalse(c.validate(datetime(2023, 1, 1, 8, 0, 0)))
+
+
+class TestSeconds(unittest.TestCase):
+    def test_validate(self):
+        c = parse_expression('*/20 30 8 * * *')
+        self.assertTrue(c.validate(datetime(2023, 1, 1, 8, 30, 40)))
+        self.assertTrue(c.validate(datetime(2023, 1, 1, 8, 30, 40, 500)))
+        self.assertFalse(c.validate(datetime(2023, 1, 1, 8, 30, 41)))
+        self.assertFalse(c.validate(datetime(2023, 1, 1, 8, 31, 40)))
+        self.assertTrue(c.validate_ts(to_ts(datetime(2023, 1, 1, 8, 30, 20))))
+        self.assertFalse(c.validate_ts(to_ts(datetime(2023, 1, 1, 8, 30, 21))))
+
+    def test_occurrences(self):
+        c = parse_expression('5,35..40 */7 23,0 * * *')
+        start, end = datetime(2023, 12, 31, 22, 58, 30), datetime(2024, 1, 1, 0, 15)
+        expected = brute_force(c, start, end)
+        self.assertEqual(expected, list(c.iter_occurrences(start, end)))
+        self.assertEqual(expected[::-1], list(c.iter_previous_occurrences(end - timedelta(seconds=1), start)))
+        self.assertEqual([to_ts(dtime) for dtime in expected], list(c.iter_ts(to_ts(start), to_ts(end))))
+
+    def test_microseconds_are_kept(self):
+        c = parse_expression('*/15 * * * * *')
+        self.assertEqual(datetime(2023, 1, 1, 0, 0, 15, 250), c.next_occurrence(datetime(2023, 1, 1, 0, 0, 1, 250)))
+        self.assertEqual(datetime(2023, 1, 1, 0, 0, 0, 250),
+                         c.previous_occurrence(datetime(2023, 1, 1, 0, 0, 14, 250)))
+
+    def test_classic_keeps_seconds(self):
+        c = parse_expression('*/15 * * * *')
+        self.assertEqual(datetime(2023, 1, 1, 0, 15, 42), c.next_occurrence(datetime(2023, 1, 1, 0, 1, 42)))
+
+    def test_period(self):
+        self.assertEqual(timedelta(seconds=15), parse_expression('*/15 * * * * *').satisfiability.period)
+        self.assertEqual(timedelta(minutes=1), parse_expression('0 * * * * *').satisfiability.period)
+        self.assertIs(False, parse_expression('0 0 8 30 FEB *').satisfiability.satisfiable)
+
+    def test_zoned(self):
+        paris = ZoneInfo('Europe/Paris')
+        c = parse_expression('30 * 2 * * *', timezone=paris)
+        start = datetime(2023, 3, 26, 1, 59, tzinfo=paris)
+        self.assertEqual(datetime(2023, 3, 26, 3, 0, tzinfo=paris), c.next_occurrence(start))
+        c = parse_expression('*/30 59 1 * * *', timezone=paris)
+        self.assertEqual([datetime(2023, 3, 26, 1, 59, second, tzinfo=paris) for second in (0, 30)],
+                         list(c.iter_occurrences(start, datetime(2023, 3, 26, 4, tzinfo=paris))))
+
+    def test_algebra(self):
+        c = parse_expression('*/20 * * * * *') & parse_expression('0 8 * * *')
+        self.assertEqual([datetime(2023, 1, 1, 8, 0, second) for second in (0, 20, 40)],
+                         c.next_occurrences(datetime(2023, 1, 1), 3))
+
+    def test_scheduler(self):
+        now = datetime(2023, 1, 1, 0, 0, 0, 300)
+        scheduler = CroneeScheduler(clock=lambda: now)
+        scheduler.add('fast', parse_expression('*/10 * * * * *'))
+        self.assertEqual(datetime(2023, 1, 1, 0, 0, 10), scheduler.next_fire_time())
+        self.assertEqual([('fast', datetime(2023, 1, 1, 0, 0, 10)), ('fast', datetime(2023, 1, 1, 0, 0, 20))],
+                         scheduler.pop_due(datetime(2023, 1, 1, 0, 0, 25)))
+        self.assertEqual(datetime(2023, 1, 1, 0, 0, 30), scheduler.next_fire_time())
+
+    def test_vectorized(self):
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest('numpy is not installed')
+        c = parse_expression('*/15 0 8 * * *')
+        timestamps = np.array(['2023-05-01T08:00:15', '2023-05-01T08:00:16', '2023-05-01T08:01:15'],
+                              dtype='datetime64[s]')
+        self.assertEqual([True, False, False], c.validate_many(timestamps).tolist())
+        self.assertEqual(np.array(['2023-05-01T08:00:15', '2023-05-01T08:00:30', '2023-05-02T08:00:00'],
+                                  dtype='datetime64[s]').tolist(), c.next_occurrence_many(timestamps).tolist())
+
+
+class TestYears(unittest.TestCase):
+    def test_validate(self):
+        c = parse_expression('0 0 8 1 JAN * 2024,2026')
+        self.assertTrue(c.validate(datetime(2024, 1, 1, 8)))
+        self.assertFalse(c.validate(datetime(2025, 1, 1, 8)))
+        self.assertFalse(c.validate_ts(to_ts(datetime(2025, 1, 1, 8))))
+        self.assertTrue(c.validate_ts(to_ts(datetime(2026, 1, 1, 8))))
+
+    def test_finite(self):
+        c = parse_expression('0 0 8 1 JAN * 2024,2026')
+        self.assertEqual([datetime(2024, 1, 1, 8), datetime(2026, 1, 1, 8)],
+                         list(c.iter_occurrences(datetime(2000, 1, 1))))
+        self.assertEqual([datetime(2026, 1, 1, 8), datetime(2024, 1, 1, 8)],
+                         list(c.iter_previous_occurrences(datetime(2100, 1, 1))))
+        with self.assertRaises(CroneeSearchBudgetError):
+            c.next_occurrence(datetime(2027, 1, 1))
+
+    def test_satisfiability(self):
+        self.assertIs(False, parse_expression('0 0 0 29 FEB * 2025..2027').satisfiability.satisfiable)
+        self.assertIs(True, parse_expression('0 0 0 29 FEB * 2025..2028').satisfiability.satisfiable)
+        self.assertIsNone(parse_expression('0 0 0 29 FEB * 2025..2028').satisfiability.period)
+
+    def test_vectorized(self):
+        try:
+            import numpy as np
+        except ImportError:
+            self.skipTest('numpy is not installed')
+        c = parse_expression('0 0 8 1 JAN * 2024')
+        timestamps = np.array(['2024-01-01T08:00', '2025-01-01T08:00'], dtype='datetime64[m]')
+        self.assertEqual([True, False], c.validate_many(timestamps).tolist())
+        self.assertEqual(np.array(['2024-01-01T08:00', '2024-01-01T08:00'], dtype='datetime64[m]').tolist(),
+                         c.next_occurrence_many(np.array(['2023-06-01T00:00', '2024-01-01T08:00'],
+                                                         dtype='datetime64[m]')).tolist())
+        for starts in (['2024-06-01T00:00'], ['2023-06-01T00:00', '2024-06-01T00:00']):
+            with self.subTest(starts=starts), self.assertRaises(CroneeSearchBudgetError):
+                c.next_occurrence_many(np.array(starts, dtype='datetime64[m]'))
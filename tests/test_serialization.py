@@ -0,0 +1,114 @@
+import json
+import pickle
+import unittest
+import weakref
+from unittest import mock
+from datetime import date, datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from cronee import parse_expression, to_bytes, from_bytes, to_json, from_json, DateSet, CroneeValueError
+from cronee.cronee import SimpleCronee
+
+HOLIDAYS = DateSet.from_dates([date(2023, 1, 2), date(2023, 5, 1), date(2023, 12, 25)])
+EXPRESSIONS = ['* * * * *', '*/15 8..18 * * MON..FRI', '0 0 29 FEB *', '0..5 8 * * FRI#3,SUN#4',
+               '!0..30/5,45 5,15..23/3 15,1-1 !JAN,MAR,JUN,OCT *', '5-1 3+5 2+3 * 2+3', '*/10+5 0 8 * * *',
+               '0 0 8 1 JAN * 2024..2026,2030']
+
+
+def sample_cronees() -> list[SimpleCronee]:
+    cronees = [parse_expression(expression) for expression in EXPRESSIONS]
+    cronees.append(parse_expression('0 8 * * *', timezone=ZoneInfo('Europe/Paris'), nonexistent='skip',
+                                    ambiguous='both', excluded_dates=HOLIDAYS))
+    cronees.append(parse_expression('0 8 * * *', timezone=timezone(timedelta(hours=-5)), included_dates=HOLIDAYS))
+    return cronees + cronees[:3]
+
+
+class TestSerialization(unittest.TestCase):
+    def test_binary_round_trip(self):
+        cronees = sample_cronees()
+        loaded = from_bytes(to_bytes(cronees))
+        self.assertEqual(cronees, loaded)
+        self.assertIs(loaded[0], loaded[-3])
+
+    def test_json_round_trip(self):
+        cronees = sample_cronees()
+        text = to_json(cronees)
+        self.assertEqual(cronees, from_json(text))
+        document = json.loads(text)
+        self.assertEqual(len(cronees) - 3, len(document['cronees']))
+        self.assertEqual(1, len(document['date_sets']))
+        self.assertEqual(['Europe/Paris', '-18000'], document['timezones'])
+
+    def test_behavior_is_kept(self):
+        start = datetime(2023, 5, 5, 18, 59)
+        for cronee, loaded in zip(sample_cronees(), from_bytes(to_bytes(sample_cronees()))):
+            if cronee.timezone is None:
+                with self.subTest(cronee=cronee):
+                    self.assertEqual(cronee.next_occurrences(start, 5), loaded.next_occurrences(start, 5))
+
+    def test_loading_does_not_parse(self):
+        cronees = sample_cronees()
+        data = to_bytes(cronees)
+        from cronee import parser
+        original, parser.compile_field = parser.compile_field, None
+        try:
+            self.assertEqual(cronees, from_bytes(data))
+        finally:
+            parser.compile_field = original
+
+    def test_loading_does_not_recompile(self):
+        expressions = ['1..4 7 * * FRI#3,SUN#4', '*/20 1 2 3 * * 2030..2032']
+        paris = ZoneInfo('Europe/Paris')
+        data = to_bytes([parse_expression(expression, timezone=paris) for expression in expressions])
+        with mock.patch.object(SimpleCronee, '__post_init__', side_effect=AssertionError('recompiled')), \
+                mock.patch('cronee.cronee.analyze', side_effect=AssertionError('analyzed')):
+            loaded = from_bytes(data)
+        self.assertEqual([parse_expression(expression, timezone=paris) for expression in expressions], loaded)
+
+    def test_unserializable(self):
+        cronee = SimpleCronee({0}, {8}, set(range(1, 32)), set(range(1, 13)), set(range(1, 8)), timedelta(),
+                              [[lambda dtime: True], [], [], [], []])
+        with self.assertRaises(CroneeValueError):
+            to_bytes([cronee])
+        with self.assertRaises(CroneeValueError):
+            to_json([parse_expression('0 8 * * *') | parse_expression('0 9 * * MON')])
+
+    def test_invalid_data(self):
+        data = to_bytes(sample_cronees())
+        for invalid in (b'', b'NOTCRONE' + data[8:], data[:-1], data + b'\0'):
+            with self.subTest(data=invalid[:8]), self.assertRaises(CroneeValueError):
+                from_bytes(invalid)
+        document = json.loads(to_json(sample_cronees()))
+        document['cronees'][0]['minutes'] = 1 << 60
+        with self.assertRaises(CroneeValueError):
+            from_json(json.dumps(document))
+        document = json.loads(to_json(sample_cronees()))
+        document['entries'][0] = -1
+        with self.assertRaises(CroneeValueError):
+            from_json(json.dumps(document))
+        with self.assertRaises(CroneeValueError):
+            from_json('[]')
+
+
+class TestPickle(unittest.TestCase):
+    def test_pickle_is_compact_and_interned(self):
+        cronee = parse_expression('0..5 8 * * FRI#3,SUN#4')
+        cronee.next_occurrence(datetime(2023, 1, 1))
+        data = pickle.dumps(cronee)
+        self.assertIs(cronee, pickle.loads(data))
+        self.assertLess(len(data), 512)
+
+    def test_unpickling_does_not_recompile(self):
+        cronee = parse_expression('0..5 9 * * FRI#3,SUN#4', timezone=ZoneInfo('Europe/Paris'))
+        self.assertIs(True, cronee.satisfiability.satisfiable)
+        data = pickle.dumps(cronee)
+        reference = weakref.ref(cronee)
+        del cronee
+        self.assertIsNone(reference())
+        with mock.patch.object(SimpleCronee, '__post_init__', side_effect=AssertionError('recompiled')), \
+                mock.patch('cronee.cronee.analyze', side_effect=AssertionError('analyzed')):
+            loaded = pickle.loads(data)
+            self.assertIs(True, loaded.satisfiability.satisfiable)
+        self.assertEqual(parse_expression('0..5 9 * * FRI#3,SUN#4', timezone=ZoneInfo('Europe/Paris')), loaded)
+        self.assertEqual(datetime(2023, 1, 20, 9, tzinfo=ZoneInfo('Europe/Paris')),
+                         loaded.next_occurrence(datetime(2023, 1, 1)))
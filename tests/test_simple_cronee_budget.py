@@ -0,0 +1,106 @@
+import unittest
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from cronee import parse_expression, analyze, CroneeSearchBudgetError, CroneeUnsatisfiableError
+from cronee.cronee import SimpleCronee
+
+ALL_DOWS = range(1, 8)
+
+
+def never(_: datetime) -> bool:
+    return False
+
+
+class TestSatisfiability(unittest.TestCase):
+    def test_satisfiable(self):
+        for expression in ['* * * * *', '0 0 29 FEB *', '0 0 * * FRI#5', '0 0 31 * *', '0 0 8..14 * MON#2']:
+            with self.subTest(expression=expression):
+                self.assertIs(parse_expression(expression).satisfiability.satisfiable, True)
+
+    def test_unsatisfiable(self):
+        for expression in ['0 0 31 FEB,APR *', '0 0 30 FEB *', '0 0 1..7 * MON#2', '0 0 8..14 * MON#1']:
+            with self.subTest(expression=expression):
+                self.assertIs(parse_expression(expression).satisfiability.satisfiable, False)
+
+    def test_opaque_validators(self):
+        c = SimpleCronee({0}, {0}, {31}, {2}, ALL_DOWS, timedelta(), ((), (), (never,), (), ()))
+        self.assertEqual(analyze(c), (None, None))
+        c = SimpleCronee({0}, {0}, {1}, {2}, ALL_DOWS, timedelta(), ((), (), (never,), (), ()))
+        self.assertEqual(analyze(c), (True, None))
+
+    def test_period(self):
+        cases = {
+            '* * * * *': timedelta(minutes=1),
+            '*/15 * * * *': timedelta(minutes=15),
+            '0 */6 * * *': timedelta(hours=6),
+            '30 8 * * *': timedelta(days=1),
+            '0 8 * * MON': timedelta(days=7),
+            '0 8 * * MON,THU': timedelta(days=7),
+            '0 0 29 FEB *': timedelta(days=146097),
+            '0 8 * * FRI#3': timedelta(days=146097),
+            '0 0 31 FEB *': None,
+        }
+        for expression, period in cases.items():
+            with self.subTest(expression=expression):
+                self.assertEqual(parse_expression(expression).satisfiability.period, period)
+
+
+class TestSearchBudget(unittest.TestCase):
+    def test_unsatisfiable_search(self):
+        c = parse_expression('0 0 31 FEB *')
+        with self.assertRaises(CroneeUnsatisfiableError):
+            c.next_occurrence(datetime(2023, 1, 1))
+        with self.assertRaises(CroneeUnsatisfiableError):
+            c.previous_occurrence(datetime(2023, 1, 1))
+        with self.assertRaises(CroneeUnsatisfiableError):
+            c.next_ts(0)
+
+    def test_unsatisfiable_window(self):
+        c = parse_expression('0 0 31 FEB *')
+        self.assertEqual(list(c.iter_occurrences(datetime(2020, 1, 1), datetime(2030, 1, 1))), [])
+        self.assertEqual(list(c.iter_previous_occurrences(datetime(2030, 1, 1), datetime(2020, 1, 1))), [])
+        self.assertEqual(list(c.iter_ts(0, 10 ** 9)), [])
+
+    def test_horizon(self):
+        c = parse_expression('0 0 29 FEB *')
+        start = datetime(2021, 3, 1, 0, 0, 30)
+        with self.assertRaises(CroneeSearchBudgetError):
+            c.next_occurrence(start, horizon=timedelta(days=365))
+        self.assertEqual(c.next_occurrence(start, horizon=timedelta(days=3 * 366)), datetime(2024, 2, 29, 0, 0, 30))
+        with self.assertRaises(CroneeSearchBudgetError):
+            c.previous_occurrence(start, horizon=timedelta(days=365))
+        self.assertEqual(c.previous_occurrence(start, horizon=timedelta(days=367)), datetime(2020, 2, 29, 0, 0, 30))
+        with self.assertRaises(CroneeSearchBudgetError):
+            c.next_ts(1614556800, horizon=365 * 86400)
+
+    def test_horizon_is_excluded(self):
+        c = parse_expression('0 8 * * *')
+        with self.assertRaises(CroneeSearchBudgetError):
+            c.next_occurrence(datetime(2023, 5, 5, 9), horizon=timedelta(hours=23))
+        self.assertEqual(c.next_occurrence(datetime(2023, 5, 5, 9), horizon=timedelta(hours=23, seconds=1)),
+                         datetime(2023, 5, 6, 8))
+
+    def test_window_stops_the_search(self):
+        c = parse_expression('0 0 29 FEB *')
+        self.assertEqual(list(c.iter_occurrences(datetime(2021, 1, 1), datetime(2024, 2, 29))), [])
+        self.assertEqual(list(c.iter_occurrences(datetime(2021, 1, 1), datetime(2024, 2, 29, 0, 1))),
+                         [datetime(2024, 2, 29)])
+        self.assertEqual(list(c.iter_previous_occurrences(datetime(2024, 2, 28), datetime(2020, 2, 29))), [])
+
+    def test_max_candidates(self):
+        c = SimpleCronee({0}, {0}, {1}, (), ALL_DOWS, timedelta(), ((), (), (), (never,), ()))
+        self.assertIsNone(c.satisfiability.satisfiable)
+        with self.assertRaises(CroneeSearchBudgetError) as context:
+            c.next_occurrence(datetime(2023, 1, 1), max_candidates=100)
+        self.assertNotIsInstance(context.exception, CroneeUnsatisfiableError)
+        with self.assertRaises(CroneeSearchBudgetError):
+            c.previous_occurrence(datetime(2023, 1, 1), max_candidates=100)
+        self.assertEqual(list(c.iter_occurrences(datetime(2023, 1, 1), datetime(2030, 1, 1))), [])
+
+    def test_zoned_window(self):
+        c = parse_expression('0 0 29 FEB *', timezone=ZoneInfo('Europe/Paris'))
+        start = datetime(2021, 1, 1, tzinfo=ZoneInfo('Europe/Paris'))
+        self.assertEqual(list(c.iter_occurrences(start, start + timedelta(days=365))), [])
+        with self.assertRaises(CroneeSearchBudgetError):
+            c.next_occurrence(start, horizon=timedelta(days=365))
@@ -0,0 +1,63 @@
+import random
+import unittest
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from cronee import parse_expression
+
+EPOCH = datetime(1970, 1, 1)
+UTC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def to_ts(dtime: datetime) -> int:
+    epoch = EPOCH if dtime.tzinfo is None else UTC_EPOCH
+    return (dtime - epoch) // timedelta(seconds=1)
+
+
+class TestEpochTimestamps(unittest.TestCase):
+    EXPRESSIONS = [
+        '* * * * *',
+        '35 10 * * *',
+        '*/7 */5 * * *',
+        '0 0 31 * *',
+        '0 0 29 FEB *',
+        '0 8 * * 4,FRI#3',
+        '!0..30/5,45 5,15..23/3 15,1-1 !JAN,MAR,JUN,OCT *',
+        '5-1 3+5 2+3 * 2+3',
+    ]
+
+    def setUp(self):
+        generator = random.Random(42)
+        self.timestamps = [generator.randrange(-10 ** 9, 4 * 10 ** 9) for _ in range(300)]
+
+    def test_validate_ts(self):
+        for expression in self.EXPRESSIONS:
+            c = parse_expression(expression)
+            with self.subTest(expression=expression):
+                for timestamp in self.timestamps:
+                    timestamp -= timestamp % 60
+                    for candidate in (c.next_ts(timestamp), timestamp):
+                        self.assertEqual(c.validate(EPOCH + timedelta(seconds=candidate)), c.validate_ts(candidate))
+
+    def test_next_ts(self):
+        for expression in self.EXPRESSIONS:
+            c = parse_expression(expression)
+            with self.subTest(expression=expression):
+                for timestamp in self.timestamps:
+                    expected = to_ts(c.next_occurrence(EPOCH + timedelta(seconds=timestamp)))
+                    self.assertEqual(expected, c.next_ts(timestamp))
+
+    def test_next_ts_keeps_seconds(self):
+        c = parse_expression('0 * * * *')
+        self.assertEqual(to_ts(datetime(2023, 1, 1, 13, 0, 42)), c.next_ts(to_ts(datetime(2023, 1, 1, 12, 1, 42))))
+
+    def test_zoned(self):
+        c = parse_expression('30 2 * * *', timezone=ZoneInfo('Europe/Paris'))
+        start = to_ts(datetime(2023, 3, 25, 12, tzinfo=timezone.utc))
+        self.assertEqual(to_ts(datetime(2023, 3, 26, 1, tzinfo=timezone.utc)), c.next_ts(start))
+        self.assertTrue(c.validate_ts(to_ts(datetime(2023, 7, 1, 0, 30, tzinfo=timezone.utc))))
+        self.assertFalse(c.validate_ts(to_ts(datetime(2023, 7, 1, 2, 30, tzinfo=timezone.utc))))
+
+
+if __name__ == '__main__':
+    unittest.main()
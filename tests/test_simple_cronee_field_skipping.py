@@ -0,0 +1,60 @@
+import unittest
+from datetime import datetime, timedelta
+
+from cronee import parse_expression
+from cronee.cronee import SimpleCronee
+
+
+def brute_force_next_occurrence(cronee: SimpleCronee, dtime: datetime) -> datetime:
+    delta = timedelta(minutes=1)
+    while not cronee.validate(dtime):
+        dtime += delta
+    return dtime
+
+
+class TestFieldSkippingNextOccurrence(unittest.TestCase):
+    EXPRESSIONS = [
+        '* * * * *',
+        '35 10 * * *',
+        '*/7 */5 * * *',
+        '0 0 1 * *',
+        '0 0 31 * *',
+        '30 12 * * MON',
+        '0 8 * * FRI#3',
+        '0 8 * * 4,FRI#3',
+        '0..5 8 * * FRI#3,SUN#4',
+        '* * 15-1 * *',
+        '* * 1-1 FEB,MAR *',
+        '!0..30/5,45 5,15..23/3 15,1-1 !JAN,MAR,JUN,OCT *',
+        '5-1 3+5 2+3 * 2+3',
+        '59+2 23+1 * DEC *',
+        '0 0 * * SUN',
+    ]
+    STARTS = [
+        datetime(2023, 1, 1, 0, 0),
+        datetime(2023, 2, 27, 23, 58, 30),
+        datetime(2023, 12, 31, 23, 59),
+        datetime(2024, 2, 28, 13, 17, 5, 42),
+    ]
+
+    def test_same_results_as_brute_force(self):
+        for expression in self.EXPRESSIONS:
+            c = parse_expression(expression)
+            for start in self.STARTS:
+                with self.subTest(expression=expression, start=start):
+                    self.assertEqual(brute_force_next_occurrence(c, start), c.next_occurrence(start))
+
+    def test_same_occurrences_as_brute_force(self):
+        for expression in self.EXPRESSIONS:
+            c = parse_expression(expression)
+            with self.subTest(expression=expression):
+                dtime = datetime(2023, 1, 1, 0, 0)
+                for _ in range(6):
+                    expected = brute_force_next_occurrence(c, dtime)
+                    self.assertEqual(expected, c.next_occurrence(dtime))
+                    dtime = expected + timedelta(minutes=1)
+
+    def test_leap_day_from_non_leap_year(self):
+        c = parse_expression('0 0 29 FEB *')
+        self.assertEqual(datetime(2024, 2, 29, 0, 0), c.next_occurrence(datetime(2021, 3, 1, 0, 0)))
+        self.assertEqual(datetime(2104, 2, 29, 0, 0), c.next_occurrence(datetime(2096, 3, 1, 0, 0)))
@@ -0,0 +1,73 @@
+import gc
+import pickle
+import unittest
+import weakref
+from unittest import mock
+from dataclasses import FrozenInstanceError
+from datetime import timedelta
+from zoneinfo import ZoneInfo
+
+from cronee import parse_expression
+from cronee.cronee import SimpleCronee, BoundIndexValidator, dow_index_validator, build_cronee, _intern, \
+    INTERNED_VALUES_SIZE
+
+
+class TestSimpleCroneeIdentity(unittest.TestCase):
+    def test_structural_equality(self):
+        c1 = parse_expression('*/15 * * * *')
+        c2 = parse_expression('0,15,30,45 * * * *')
+        c3 = parse_expression('0..45/15 * * * *')
+        self.assertEqual(c1, c2)
+        self.assertEqual(c1, c3)
+        self.assertEqual(hash(c1), hash(c2))
+        self.assertNotEqual(c1, parse_expression('*/20 * * * *'))
+
+    def test_identical_schedules_share_one_instance(self):
+        self.assertIs(parse_expression('*/15 * * * *'), parse_expression('0,15,30,45 * * * *'))
+        self.assertIs(parse_expression('0 8 * * FRI#3'), parse_expression('0 8 * * 5#3'))
+
+    def test_alive_schedule_is_not_rebuilt(self):
+        c = parse_expression('*/15 8..18 * * MON..FRI')
+        with mock.patch.object(SimpleCronee, '__post_init__', side_effect=AssertionError('rebuilt')):
+            self.assertIs(c, parse_expression('*/15 8..18 * * MON..FRI'))
+            self.assertIs(c, build_cronee(c.minutes, c.hours, c.doms, c.months, c.dows, c.offset, c.other_validators))
+
+    def test_analysis_is_lazy(self):
+        c = parse_expression('59 23 31 FEB *')
+        self.assertIsNone(c._satisfiability)
+        self.assertIs(False, c.satisfiability.satisfiable)
+        self.assertIs(c.satisfiability, c._satisfiability)
+
+    def test_index_validators_compare_by_value(self):
+        self.assertEqual(BoundIndexValidator(dow_index_validator, 3, frozenset({5})),
+                         BoundIndexValidator(dow_index_validator, 3, frozenset({5})))
+        self.assertNotEqual(parse_expression('0 8 * * FRI#3'), parse_expression('0 8 * * FRI#2'))
+
+    def test_offset_is_compared(self):
+        self.assertNotEqual(parse_expression('0 8 15 * *'), parse_expression('0 8 15-1 * *'))
+
+    def test_immutable_and_slotted(self):
+        c = parse_expression('* * * * *')
+        self.assertFalse(hasattr(c, '__dict__'))
+        with self.assertRaises(FrozenInstanceError):
+            c.offset = timedelta(minutes=1)  # NOQA
+
+    def test_field_values_are_shared(self):
+        c1 = SimpleCronee(set(range(60)), {1}, {2}, {3}, {4}, timedelta(), [[], [], [], [], []])
+        c2 = SimpleCronee(set(range(60)), {5}, {6}, {7}, {1}, timedelta(), [[], [], [], [], []])
+        self.assertIs(c1.minutes, c2.minutes)
+        self.assertIs(c1.other_validators, c2.other_validators)
+
+    def test_unused_cronees_are_released(self):
+        reference = weakref.ref(parse_expression('1..4 5 6 7 *', timezone=ZoneInfo('Europe/Paris')))
+        gc.collect()
+        self.assertIsNone(reference())
+
+    def test_interned_values_are_bounded(self):
+        for value in range(2 * INTERNED_VALUES_SIZE):
+            _intern(frozenset({-1, value}))
+        self.assertLessEqual(_intern.cache_info().currsize, INTERNED_VALUES_SIZE)
+
+    def test_pickle(self):
+        c = parse_expression('0..5 8 * * FRI#3,SUN#4')
+        self.assertEqual(c, pickle.loads(pickle.dumps(c)))
@@ -0,0 +1,36 @@
+import unittest
+from datetime import datetime
+from itertools import islice
+
+from cronee import parse_expression
+
+
+class TestIterOccurrences(unittest.TestCase):
+    def test_same_as_next_occurrences(self):
+        for expression in ['* * * * *', '*/7 */5 * * *', '0 8 * * 4,FRI#3', '5-1 3+5 2+3 * 2+3', '0 0 29 FEB *']:
+            c = parse_expression(expression)
+            with self.subTest(expression=expression):
+                start = datetime(2023, 1, 1, 12, 30, 15)
+                self.assertEqual(c.next_occurrences(start, 25), list(islice(c.iter_occurrences(start), 25)))
+
+    def test_end_is_excluded(self):
+        c = parse_expression('0 0 * * *')
+        occurrences = list(c.iter_occurrences(datetime(2023, 1, 1), datetime(2023, 1, 4)))
+        self.assertEqual([datetime(2023, 1, 1), datetime(2023, 1, 2), datetime(2023, 1, 3)], occurrences)
+
+    def test_no_occurrence(self):
+        c = parse_expression('0 0 29 FEB *')
+        self.assertEqual([], list(c.iter_occurrences(datetime(2023, 1, 1), datetime(2024, 1, 1))))
+
+    def test_between(self):
+        c = parse_expression('0 8 * * FRI#3')
+        occurrences = list(c.between(datetime(2023, 1, 1), datetime(2024, 1, 1)))
+        self.assertEqual(12, len(occurrences))
+        self.assertEqual(datetime(2023, 1, 20, 8, 0), occurrences[0])
+        self.assertEqual(datetime(2023, 12, 15, 8, 0), occurrences[-1])
+
+    def test_lazy(self):
+        c = parse_expression('*/15 * * * *')
+        iterator = c.iter_occurrences(datetime(2023, 1, 1))
+        self.assertEqual(datetime(2023, 1, 1, 0, 0), next(iterator))
+        self.assertEqual(datetime(2023, 1, 1, 0, 15), next(iterator))
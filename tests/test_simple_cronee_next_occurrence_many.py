@@ -0,0 +1,65 @@
+import random
+import unittest
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+from cronee import parse_expression
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+EPOCH = datetime(1970, 1, 1)
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestNextOccurrenceMany(unittest.TestCase):
+    EXPRESSIONS = [
+        '* * * * *',
+        '*/7 8..18 * * MON..FRI',
+        '0 8 * * 4,FRI#3',
+        '0 0 29 FEB *',
+        '5-1 3+5 2+3 * 2+3',
+    ]
+
+    def setUp(self):
+        generator = random.Random(7)
+        dense = [1_672_531_200 + generator.randrange(0, 3 * 86400) for _ in range(300)]
+        sparse = [generator.randrange(0, 2 * 10 ** 9) for _ in range(100)]
+        self.timestamps = dense + sparse
+        generator.shuffle(self.timestamps)
+
+    def test_epoch_seconds(self):
+        for expression in self.EXPRESSIONS:
+            c = parse_expression(expression)
+            with self.subTest(expression=expression):
+                expected = [c.next_ts(timestamp) for timestamp in self.timestamps]
+                self.assertEqual(expected, c.next_occurrence_many(numpy.array(self.timestamps)).tolist())
+
+    def test_datetime64(self):
+        c = parse_expression('*/7 8..18 * * MON..FRI')
+        starts = numpy.array(self.timestamps, dtype='datetime64[s]')
+        expected = [c.next_occurrence(EPOCH + timedelta(seconds=timestamp)) for timestamp in self.timestamps]
+        self.assertEqual(expected, c.next_occurrence_many(starts).tolist())
+
+    def test_sorted_starts(self):
+        c = parse_expression('0 8 * * 4,FRI#3')
+        starts = numpy.sort(numpy.array(self.timestamps))
+        self.assertEqual([c.next_ts(int(start)) for start in starts], c.next_occurrence_many(starts).tolist())
+
+    def test_zoned(self):
+        c = parse_expression('30 2 * * *', timezone=ZoneInfo('Europe/Paris'))
+        starts = [1_679_700_000 + 3600 * hours for hours in range(0, 72, 5)]
+        expected = [(c.next_occurrence(datetime.fromtimestamp(start, timezone.utc)).timestamp()) for start in starts]
+        self.assertEqual(expected, c.next_occurrence_many(numpy.array(starts)).tolist())
+
+    def test_shape(self):
+        c = parse_expression('0 * * * *')
+        self.assertEqual((0,), c.next_occurrence_many(numpy.array([], dtype='int64')).shape)
+        starts = numpy.array([[0, 60], [3600, 3601]])
+        self.assertEqual([[0, 3600], [3600, 3601]], c.next_occurrence_many(starts).tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
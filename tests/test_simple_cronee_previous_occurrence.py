@@ -0,0 +1,65 @@
+import unittest
+from datetime import datetime, timedelta
+
+from cronee import parse_expression
+from cronee.cronee import SimpleCronee
+
+
+def brute_force_previous_occurrence(cronee: SimpleCronee, dtime: datetime) -> datetime:
+    delta = timedelta(minutes=1)
+    while not cronee.validate(dtime):
+        dtime -= delta
+    return dtime
+
+
+class TestPreviousOccurrence(unittest.TestCase):
+    EXPRESSIONS = [
+        '* * * * *',
+        '35 10 * * *',
+        '*/7 */5 * * *',
+        '0 0 1 * *',
+        '0 0 31 * *',
+        '0 8 * * FRI#3',
+        '0..5 8 * * FRI#3,SUN#4',
+        '* * 15-1 * *',
+        '!0..30/5,45 5,15..23/3 15,1-1 !JAN,MAR,JUN,OCT *',
+        '5-1 3+5 2+3 * 2+3',
+    ]
+    STARTS = [
+        datetime(2023, 1, 1, 0, 0),
+        datetime(2023, 3, 1, 0, 1, 30),
+        datetime(2023, 12, 31, 23, 59),
+    ]
+
+    def test_same_results_as_brute_force(self):
+        for expression in self.EXPRESSIONS:
+            c = parse_expression(expression)
+            for start in self.STARTS:
+                with self.subTest(expression=expression, start=start):
+                    self.assertEqual(brute_force_previous_occurrence(c, start), c.previous_occurrence(start))
+
+    def test_reverse_of_forward_iteration(self):
+        start, end = datetime(2023, 2, 3, 7, 12), datetime(2023, 3, 18, 16, 47)
+        for expression in self.EXPRESSIONS:
+            c = parse_expression(expression)
+            with self.subTest(expression=expression):
+                forward = list(c.iter_occurrences(start + timedelta(minutes=1), end + timedelta(minutes=1)))
+                backward = list(c.iter_previous_occurrences(end, start))
+                self.assertEqual(forward[::-1], backward)
+
+    def test_leap_day(self):
+        c = parse_expression('0 0 29 FEB *')
+        self.assertEqual(datetime(2020, 2, 29), c.previous_occurrence(datetime(2024, 2, 28, 23, 59)))
+        self.assertEqual(datetime(2096, 2, 29), c.previous_occurrence(datetime(2104, 2, 28)))
+
+    def test_previous_occurrences(self):
+        c = parse_expression('0 8 * * FRI#3')
+        self.assertEqual(
+            [datetime(2023, 5, 19, 8, 0), datetime(2023, 4, 21, 8, 0), datetime(2023, 3, 17, 8, 0)],
+            c.previous_occurrences(datetime(2023, 6, 1), 3)
+        )
+
+    def test_end_is_excluded(self):
+        c = parse_expression('0 0 * * *')
+        occurrences = list(c.iter_previous_occurrences(datetime(2023, 1, 4), datetime(2023, 1, 1)))
+        self.assertEqual([datetime(2023, 1, 4), datetime(2023, 1, 3), datetime(2023, 1, 2)], occurrences)
@@ -0,0 +1,120 @@
+import unittest
+from datetime import datetime, timedelta, timezone
+from itertools import product
+from zoneinfo import ZoneInfo
+
+from cronee import parse_expression, CroneeValueError
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+PARIS = ZoneInfo('Europe/Paris')
+
+
+def utc(*args) -> datetime:
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def in_utc(instants) -> list[datetime]:
+    """ Aware datetimes sharing a tzinfo are compared by wall time, regardless of the fold """
+    return [instant.astimezone(timezone.utc) for instant in instants]
+
+
+def brute_force_occurrences(cronee, start: datetime, end: datetime) -> list[datetime]:
+    result = []
+    while start < end:
+        if cronee.validate(start):
+            result.append(start)
+        start += timedelta(minutes=1)
+    return result
+
+
+class TestTimezone(unittest.TestCase):
+    EXPRESSIONS = [
+        '* * * * *',
+        '30 2 * * *',
+        '*/20 1-3 * * *',
+        '0 2 * * SUN',
+        '15 * 26,29 * *',
+    ]
+    WINDOWS = [
+        (utc(2023, 3, 25, 22), utc(2023, 3, 26, 4)),
+        (utc(2023, 10, 28, 22), utc(2023, 10, 29, 4)),
+    ]
+    POLICIES = list(product(('shift', 'skip'), ('earliest', 'latest', 'both')))
+
+    def test_gap(self):
+        shift = parse_expression('30 2 * * *', timezone=PARIS, nonexistent='shift')
+        skip = parse_expression('30 2 * * *', timezone=PARIS, nonexistent='skip')
+        start = datetime(2023, 3, 25, 12)
+        self.assertEqual([utc(2023, 3, 26, 1)], in_utc([shift.next_occurrence(start)]))
+        self.assertEqual([utc(2023, 3, 27, 0, 30)], in_utc([skip.next_occurrence(start)]))
+        self.assertTrue(shift.validate(utc(2023, 3, 26, 1)))
+        self.assertFalse(skip.validate(utc(2023, 3, 26, 1)))
+
+    def test_fold(self):
+        start = datetime(2023, 10, 28, 12)
+        earliest = parse_expression('30 2 * * *', timezone=PARIS, ambiguous='earliest')
+        latest = parse_expression('30 2 * * *', timezone=PARIS, ambiguous='latest')
+        both = parse_expression('30 2 * * *', timezone=PARIS, ambiguous='both')
+        self.assertEqual([utc(2023, 10, 29, 0, 30), utc(2023, 10, 30, 1, 30)],
+                         in_utc(earliest.next_occurrences(start, 2)))
+        self.assertEqual([utc(2023, 10, 29, 1, 30), utc(2023, 10, 30, 1, 30)],
+                         in_utc(latest.next_occurrences(start, 2)))
+        self.assertEqual([utc(2023, 10, 29, 0, 30), utc(2023, 10, 29, 1, 30), utc(2023, 10, 30, 1, 30)],
+                         in_utc(both.next_occurrences(start, 3)))
+        self.assertFalse(earliest.validate(datetime(2023, 10, 29, 2, 30, fold=1, tzinfo=PARIS)))
+        self.assertTrue(latest.validate(datetime(2023, 10, 29, 2, 30, fold=1, tzinfo=PARIS)))
+
+    def test_fold_of_finite_cronee(self):
+        both = parse_expression('0 30 2 27 OCT * 2024', timezone=PARIS, ambiguous='both')
+        self.assertEqual([utc(2024, 10, 27, 0, 30), utc(2024, 10, 27, 1, 30)],
+                         in_utc(both.iter_occurrences(datetime(2024, 1, 1))))
+        self.assertEqual([utc(2024, 10, 27, 1, 30), utc(2024, 10, 27, 0, 30)],
+                         in_utc(both.iter_previous_occurrences(datetime(2025, 1, 1))))
+
+    def test_occurrences_are_in_timezone(self):
+        cronee = parse_expression('0 8 * * *', timezone=PARIS)
+        occurrence = cronee.next_occurrence(utc(2023, 7, 1))
+        self.assertIs(PARIS, occurrence.tzinfo)
+        self.assertEqual(datetime(2023, 7, 1, 8), occurrence.replace(tzinfo=None))
+
+    def test_iter_occurrences_matches_validate(self):
+        for expression, (nonexistent, ambiguous), (start, end) in product(self.EXPRESSIONS, self.POLICIES,
+                                                                          self.WINDOWS):
+            with self.subTest(expression=expression, nonexistent=nonexistent, ambiguous=ambiguous, start=start):
+                cronee = parse_expression(expression, timezone=PARIS, nonexistent=nonexistent, ambiguous=ambiguous)
+                expected = brute_force_occurrences(cronee, start, end)
+                self.assertEqual(expected, in_utc(cronee.iter_occurrences(start, end)))
+                self.assertEqual(expected[::-1],
+                                 in_utc(cronee.iter_previous_occurrences(end - timedelta(minutes=1),
+                                                                         start - timedelta(minutes=1))))
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_validate_many_matches_validate(self):
+        for expression, (nonexistent, ambiguous), (start, end) in product(self.EXPRESSIONS, self.POLICIES,
+                                                                          self.WINDOWS):
+            with self.subTest(expression=expression, nonexistent=nonexistent, ambiguous=ambiguous, start=start):
+                cronee = parse_expression(expression, timezone=PARIS, nonexistent=nonexistent, ambiguous=ambiguous)
+                minutes = int((end - start) / timedelta(minutes=1))
+                instants = [start + timedelta(minutes=i) for i in range(minutes)]
+                timestamps = numpy.array([int(instant.timestamp()) for instant in instants])
+                expected = [cronee.validate(instant) for instant in instants]
+                self.assertEqual(expected, cronee.validate_many(timestamps).tolist())
+
+    def test_zoned_cronees_are_distinct(self):
+        self.assertNotEqual(parse_expression('0 8 * * *'), parse_expression('0 8 * * *', timezone=PARIS))
+        self.assertNotEqual(parse_expression('0 8 * * *', timezone=PARIS, ambiguous='both'),
+                            parse_expression('0 8 * * *', timezone=PARIS))
+
+    def test_invalid_policy(self):
+        with self.assertRaises(CroneeValueError):
+            parse_expression('* * * * *', timezone=PARIS, nonexistent='never')
+        with self.assertRaises(CroneeValueError):
+            parse_expression('* * * * *', timezone=PARIS, ambiguous='never')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+from datetime import datetime, timedelta
+
+from cronee import parse_expression
+from cronee.cronee import SimpleCronee
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestValidateMany(unittest.TestCase):
+    EXPRESSIONS = [
+        '* * * * *',
+        '*/10 */5 */3 */5 *',
+        '0..5 8 * * FRI#3,SUN#4',
+        '0 8 * * 4,FRI#3',
+        '!0..30/5,45 5,15..23/3 15,1-1 !JAN,MAR,JUN,OCT *',
+        '5-1 3+5 2+3 * 2+3',
+        '* * 1-1 FEB,MAR *',
+    ]
+
+    def setUp(self):
+        start = datetime(2023, 1, 1)
+        self.datetimes = [start + timedelta(minutes=37 * i) for i in range(20000)]
+
+    def test_same_results_as_validate(self):
+        timestamps = numpy.array(self.datetimes, dtype='datetime64[m]')
+        for expression in self.EXPRESSIONS:
+            c = parse_expression(expression)
+            with self.subTest(expression=expression):
+                expected = [c.validate(dtime) for dtime in self.datetimes]
+                self.assertEqual(expected, c.validate_many(timestamps).tolist())
+
+    def test_epoch_seconds(self):
+        c = parse_expression('0..5 8 * * FRI#3')
+        timestamps = numpy.array([(dtime - datetime(1970, 1, 1)).total_seconds() for dtime in self.datetimes])
+        expected = [c.validate(dtime) for dtime in self.datetimes]
+        self.assertEqual(expected, c.validate_many(timestamps).tolist())
+
+    def test_custom_validator(self):
+        c = SimpleCronee(minutes={0}, hours={5}, doms=set(range(1, 32)), months=set(range(1, 13)),
+                         dows=set(range(1, 8)), offset=timedelta(),
+                         other_validators=[[], [lambda dtime: dtime.hour == 0], [], [], []])
+        timestamps = numpy.array(['2023-01-01T00:00', '2023-01-01T00:01', '2023-01-01T05:00', '2023-01-01T06:00'],
+                                 dtype='datetime64[m]')
+        self.assertEqual([True, False, True, False], c.validate_many(timestamps).tolist())
+
+    def test_invalid_dtype(self):
+        c = parse_expression('* * * * *')
+        with self.assertRaises(TypeError):
+            c.validate_many(numpy.array(['a', 'b']))
@@ -0,0 +1,94 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from functools import partial
+from unittest import mock
+from zoneinfo import ZoneInfo
+
+from cronee import parse_expression, Timeline, write_timeline
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+EPOCH = datetime(1970, 1, 1)
+
+
+class TestTimeline(unittest.TestCase):
+    EXPRESSIONS = ['*/15 * * * *', '0 8 * * FRI#3', '0 0 29 FEB *', '5-1 3+5 2+3 * 2+3']
+    START = datetime(2023, 1, 1)
+    END = datetime(2024, 1, 1)
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'timeline.bin')
+
+    def expected(self, expression: str) -> list[int]:
+        return [(occurrence - EPOCH) // timedelta(seconds=1)
+                for occurrence in parse_expression(expression).between(self.START, self.END)]
+
+    def test_round_trip(self):
+        self.assertEqual(4, write_timeline(self.path, self.EXPRESSIONS, self.START, self.END))
+        with Timeline(self.path) as timeline:
+            self.assertEqual(4, len(timeline))
+            self.assertEqual((self.START - EPOCH) // timedelta(seconds=1), timeline.start)
+            for expression in self.EXPRESSIONS:
+                with self.subTest(expression=expression):
+                    occurrences = timeline.occurrences(expression)
+                    self.assertEqual(self.expected(expression), occurrences.tolist())
+                    occurrences.release()
+
+    def test_duplicated_and_equivalent_spellings(self):
+        self.assertEqual(1, write_timeline(self.path, ['0 8 * * *', '0  8 * * *', ' 0 8 * * * '], self.START,
+                                           self.END))
+        with Timeline(self.path) as timeline:
+            self.assertIn('0 8  * * *', timeline)
+            self.assertNotIn('0 9 * * *', timeline)
+            with self.assertRaises(KeyError):
+                timeline.occurrences('0 9 * * *')
+
+    def test_empty_timeline(self):
+        write_timeline(self.path, ['0 0 29 FEB *'], self.START, self.END)
+        with Timeline(self.path) as timeline:
+            occurrences = timeline.occurrences('0 0 29 FEB *')
+            self.assertEqual([], occurrences.tolist())
+            occurrences.release()
+
+    def test_zoned_parser(self):
+        paris = ZoneInfo('Europe/Paris')
+        write_timeline(self.path, ['30 2 * * *'], datetime(2023, 3, 25), datetime(2023, 3, 28),
+                       parser=partial(parse_expression, timezone=paris))
+        with Timeline(self.path, parser=partial(parse_expression, timezone=paris)) as timeline:
+            occurrences = timeline.occurrences('30 2 * * *')
+            self.assertEqual([1679707800, 1679792400, 1679877000], occurrences.tolist())
+            occurrences.release()
+        with Timeline(self.path) as timeline:
+            self.assertNotIn('30 2 * * *', timeline)
+
+    def test_failed_write_removes_temporary_file(self):
+        with mock.patch('os.replace', side_effect=OSError('disk full')), self.assertRaises(OSError):
+            write_timeline(self.path, self.EXPRESSIONS, self.START, self.END)
+        self.assertEqual([], os.listdir(os.path.dirname(self.path)))
+
+    def test_not_a_timeline(self):
+        with open(self.path, 'wb') as file:
+            file.write(bytes(64))
+        with self.assertRaises(ValueError):
+            Timeline(self.path)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_array(self):
+        write_timeline(self.path, self.EXPRESSIONS, self.START, self.END)
+        timeline = Timeline(self.path)
+        array = timeline.array('0 8 * * FRI#3')
+        self.assertEqual(self.expected('0 8 * * FRI#3'), array.tolist())
+        self.assertFalse(array.flags.writeable)
+        del array
+        timeline.close()
+
+
+if __name__ == '__main__':
+    unittest.main()